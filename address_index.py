@@ -0,0 +1,149 @@
+import re
+import threading
+import time
+
+# Address formats per supported platform. Ethereum addresses are matched
+# case-insensitively (EIP-55 checksums only change letter case), Solana
+# addresses are base58 and case-sensitive.
+ADDRESS_PATTERNS = {
+    "ethereum": re.compile(r"^0x[0-9a-fA-F]{40}$"),
+    "solana": re.compile(r"^[1-9A-HJ-NP-Za-km-z]{32,44}$"),
+}
+
+# Addresses upstream confirmed as unlisted (404) are answered locally for
+# this long; new listings show up once it has passed. At most this many are kept.
+NOT_LISTED_TTL_SECONDS = 10 * 60
+NOT_LISTED_MAX_ENTRIES = 4096
+
+def normalize_address(platform: str, address: str) -> str:
+    address = address.strip()
+    return address.lower() if platform == "ethereum" else address
+
+def validate_address(platform: str, address: str) -> str | None:
+    """
+    Checks that an address is well-formed for its platform.
+
+    Args:
+        platform (str): The blockchain platform ("ethereum" or "solana").
+        address (str): The contract address as entered.
+
+    Returns:
+        str | None: An error message, or None if the address is valid.
+    """
+    pattern = ADDRESS_PATTERNS.get(platform)
+    if pattern is None:
+        return f"Unsupported platform `{platform}`. Only `ethereum` and `solana` are supported."
+    if not pattern.match(address.strip()):
+        if platform == "ethereum":
+            return "Invalid Ethereum address. Expected `0x` followed by 40 hexadecimal characters."
+        return "Invalid Solana address. Expected 32-44 base58 characters."
+    return None
+
+class AddressIndex:
+    """
+    Hash index from (platform, contract address) to CoinGecko coin id.
+
+    Built from `/coins/list?include_platform=true` and updated in place: each
+    refresh only touches coins whose platform addresses changed, so lookups
+    keep working while an update is applied. The coin list can be hours old,
+    so a miss only means "unknown"; addresses upstream confirmed as unlisted
+    are remembered separately, for `NOT_LISTED_TTL_SECONDS`.
+    """
+
+    def __init__(self, platforms: tuple[str, ...] = tuple(ADDRESS_PATTERNS)):
+        self.platforms = platforms
+        self.is_loaded = False
+        self._by_address: dict[tuple[str, str], str] = {}
+        self._coin_addresses: dict[str, frozenset[tuple[str, str]]] = {}
+        self._not_listed: dict[tuple[str, str], float] = {}  # key -> expiry, oldest first
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._by_address)
+
+    def _addresses_of(self, coin: dict) -> frozenset[tuple[str, str]]:
+        platforms = coin.get("platforms") or {}
+        return frozenset(
+            (platform, normalize_address(platform, address))
+            for platform, address in platforms.items()
+            if platform in self.platforms and address
+        )
+
+    def update_from_coin_list(self, coins: list[dict]) -> tuple[int, int]:
+        """
+        Applies a fresh coin list, touching only coins whose addresses changed.
+
+        Args:
+            coins (list[dict]): Coins with "id" and "platforms" keys.
+
+        Returns:
+            tuple[int, int]: The number of addresses added and removed.
+        """
+        latest = {coin["id"]: self._addresses_of(coin) for coin in coins if coin.get("id")}
+        added = removed = 0
+        with self._lock:
+            for coin_id in self._coin_addresses.keys() - latest.keys():
+                for key in self._coin_addresses.pop(coin_id):
+                    if self._by_address.get(key) == coin_id:
+                        del self._by_address[key]
+                        removed += 1
+            for coin_id, addresses in latest.items():
+                previous = self._coin_addresses.get(coin_id, frozenset())
+                if addresses == previous:
+                    continue
+                for key in previous - addresses:
+                    if self._by_address.get(key) == coin_id:
+                        del self._by_address[key]
+                        removed += 1
+                for key in addresses - previous:
+                    self._by_address[key] = coin_id
+                    added += 1
+                self._coin_addresses[coin_id] = addresses
+            self.is_loaded = True
+        return added, removed
+
+    def learn(self, platform: str, address: str, coin_id: str):
+        """
+        Records a mapping confirmed by an upstream contract lookup.
+        """
+        key = (platform, normalize_address(platform, address))
+        with self._lock:
+            self._by_address[key] = coin_id
+            self._not_listed.pop(key, None)
+
+    def mark_not_listed(self, platform: str, address: str):
+        """
+        Records an address upstream reported as not listed (404).
+        """
+        key = (platform, normalize_address(platform, address))
+        now = time.time()
+        with self._lock:
+            self._not_listed.pop(key, None)
+            self._not_listed[key] = now + NOT_LISTED_TTL_SECONDS
+            while self._not_listed:
+                oldest, expiry = next(iter(self._not_listed.items()))
+                if expiry > now and len(self._not_listed) <= NOT_LISTED_MAX_ENTRIES:
+                    break
+                del self._not_listed[oldest]
+
+    def is_not_listed(self, platform: str, address: str) -> bool:
+        """
+        Returns whether upstream recently reported the address as not listed.
+        """
+        expiry = self._not_listed.get((platform, normalize_address(platform, address)))
+        return expiry is not None and time.time() < expiry
+
+    def lookup(self, platform: str, address: str) -> str | None:
+        """
+        Returns the coin id for a contract address, or None if unknown.
+        """
+        return self._by_address.get((platform, normalize_address(platform, address)))
+
+_index = AddressIndex()
+
+def get_index() -> AddressIndex:
+    """
+    Returns the process-wide index (kept current by the search index loader,
+    which fetches the coin list with platform data).
+    """
+    return _index
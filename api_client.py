@@ -1,20 +1,130 @@
 import requests
 import urllib.parse
-from datetime import datetime
-from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from collections.abc import Iterator
+import json
+import math
 import os
-
-# Base URL for CoinGecko API
-COINGECKO_BASE_URL = "https://api.coingecko.com/api/v3"
+import time
+
+import numpy as np
+import pandas as pd
+
+import address_index
+import indicators
+import market_snapshot
+import metrics
+import profiling
+import search_index
+import series_cache
+import shared_cache
+import transport
+import worker_pool
+
+# Base URL for CoinGecko API (overridable, e.g. to point at a local mock)
+COINGECKO_BASE_URL = os.getenv("COINGECKO_BASE_URL", "https://api.coingecko.com/api/v3")
 # Base URL for DexScreener API
-DEXSCREENER_BASE_URL = "https://api.dexscreener.com"
+DEXSCREENER_BASE_URL = os.getenv("DEXSCREENER_BASE_URL", "https://api.dexscreener.com")
+# Largest page size accepted by CoinGecko's /coins/markets
+COIN_MARKETS_PER_PAGE = 250
+
+# Response cache lifetimes (seconds). Once an entry is older than its TTL it is
+# revalidated with a conditional request instead of being re-downloaded.
+SEARCH_TTL_SECONDS = 10 * 60
+PRICE_TTL_SECONDS = 30
+TRENDING_TTL_SECONDS = 60
+GLOBAL_TTL_SECONDS = 60
+# Treasury holdings change a few times a day at most.
+COMPANIES_TTL_SECONDS = 30 * 60
+CATEGORIES_TTL_SECONDS = 2 * 60
+DETAILS_CACHE_TTL_SECONDS = 5 * 60
+CHART_TTL_SECONDS = 60
+BOOSTS_TTL_SECONDS = 30
+ORDERS_TTL_SECONDS = 60
+PAIRS_TTL_SECONDS = 15
+RANGE_TTL_SECONDS = 5 * 60
+# Background loaders set their own cadence, so always revalidate for them.
+LOADER_TTL_SECONDS = 0
+
+# Concentration of company treasuries is reported as the share held by the
+# top k companies for each of these k.
+CONCENTRATION_TOP_K = (1, 5, 10)
+
+# Day counts served by CoinGecko's native /ohlc candles in one call, with their
+# candle size. Other horizons (up to the public API's history limit) are built
+# from /market_chart/range chunks: ranges up to 90 days come back hourly, so
+# longer ranges are split into equal chunks of at most that size and fetched in
+# parallel as subtasks on the shared worker pool.
+NATIVE_OHLC_CANDLES = {"1": "30min", "7": "4h", "14": "4h"}
+NATIVE_OHLC_DAYS = tuple(NATIVE_OHLC_CANDLES)
+OHLC_FIELDS = ("open", "high", "low", "close")
+MAX_HISTORY_DAYS = 365
+MAX_RANGE_CHUNK_DAYS = 90
+# Range ends are rounded down to this step so repeated requests share cached chunks.
+RANGE_ALIGN_SECONDS = 5 * 60
+
+# DexScreener's multi-token endpoints accept up to this many comma-separated
+# addresses per request.
+DEXSCREENER_MAX_ADDRESSES = 30
+
+_derived = {}  # name -> (upstream body, value derived from it)
+
+def _derive(name: str, body, build):
+    # The transport returns the very same body object while upstream is
+    # unchanged (fresh cache hit or 304), so derived views are rebuilt only
+    # when the body changes, and callers get an identical object otherwise.
+    cached = _derived.get(name)
+    if cached is not None and cached[0] is body:
+        return cached[1]
+    value = build(body)
+    _derived[name] = (body, value)
+    return value
 
 # --- CoinGecko API Functions ---
 
+def _resolve_coin(query: str, headers: dict | None = None) -> dict | None:
+    """
+    Resolves a coin name, symbol or id to a single coin.
+
+    Queries the local search index first and only falls back to the first
+    `/search` result when the index cannot answer on its own.
+
+    Args:
+        query (str): The coin name, symbol or id.
+        headers (dict | None): Headers for the `/search` request.
+
+    Returns:
+        dict | None: The coin ("id", "name", "symbol", "market_cap_rank"), or
+                     None if nothing matches. Raises `requests` exceptions on
+                     upstream failures.
+    """
+    with profiling.phase("resolve"), transport.step("resolve"):
+        coin = search_index.get_index().resolve(query)
+        if coin:
+            return coin
+
+        search_url = f"{COINGECKO_BASE_URL}/search?query={urllib.parse.quote(query)}"
+        search_data = transport.get_json(search_url, headers=headers, ttl=SEARCH_TTL_SECONDS, endpoint="/search")
+    coins_list = search_data.get("coins", [])
+    if not coins_list:
+        return None
+
+    first_coin = coins_list[0]
+    return {
+        "id": first_coin.get("id"),
+        "name": first_coin.get("name"),
+        "symbol": first_coin.get("symbol"),
+        "market_cap_rank": first_coin.get("market_cap_rank", "N/A"),
+    }
+
+@metrics.instrument_fetch
 def fetch_search_data(query: str) -> tuple[dict | None, str | None]:
     """
     Searches for a coin by query and fetches its price details.
 
+    Under a `transport.deadline`, a price that cannot be fetched in time is
+    served stale from cache, or left as "N/A" if none is cached.
+
     Args:
         query (str): The search query for the coin.
 
@@ -22,24 +132,32 @@ def fetch_search_data(query: str) -> tuple[dict | None, str | None]:
         tuple[dict | None, str | None]: A tuple containing the coin data (dict)
                                          or None, and an error message (str) or None.
     """
-    search_url = f"{COINGECKO_BASE_URL}/search?query={query}"
+    # Coins covered by the in-memory markets snapshot need no upstream call.
+    snapshot_data = market_snapshot.get_snapshot().lookup(query)
+    if snapshot_data:
+        return snapshot_data, None
+
     headers = {"accept": "application/json"}
     try:
-        search_response = requests.get(search_url, headers=headers)
-        search_response.raise_for_status()
-        search_data = search_response.json()
-
-        if search_data.get("coins"):
-            first_coin = search_data["coins"][0]
-            coin_id = first_coin["api_symbol"]
-            name = first_coin["name"]
-            market_cap_rank = first_coin.get("market_cap_rank", "N/A")
-            symbol = first_coin["symbol"]
+        coin = _resolve_coin(query, headers)
+        if coin:
+            coin_id = coin["id"]
+            name = coin["name"]
+            market_cap_rank = coin["market_cap_rank"]
+            symbol = coin["symbol"]
 
             price_url = f"{COINGECKO_BASE_URL}/simple/price?ids={coin_id}&vs_currencies=usd&include_market_cap=true&include_24hr_vol=true&include_24hr_change=true&precision=10"
-            price_response = requests.get(price_url, headers=headers)
-            price_response.raise_for_status()
-            price_data = price_response.json()
+            try:
+                with transport.step("price"):
+                    price_data = transport.get_json(price_url, headers=headers, ttl=PRICE_TTL_SECONDS, endpoint="/simple/price")
+            except requests.exceptions.Timeout:
+                # Out of time with no price cached at all: still show which
+                # coin matched, with the price details as "N/A".
+                budget = transport.current_deadline()
+                if budget is None:
+                    raise
+                budget.partial = True
+                price_data = {}
 
             price_info = price_data.get(coin_id, {})
             usd_price = price_info.get("usd", "N/A")
@@ -62,6 +180,76 @@ def fetch_search_data(query: str) -> tuple[dict | None, str | None]:
     except requests.exceptions.RequestException as e:
         return None, f"An error occurred while fetching data: {e}"
 
+@metrics.instrument_fetch
+def fetch_coin_markets(page: int = 1, per_page: int = COIN_MARKETS_PER_PAGE) -> tuple[list | None, str | None]:
+    """
+    Fetches one page of coins ordered by market cap, with price, volume and 24h change.
+
+    Args:
+        page (int): The 1-based page number.
+        per_page (int): The number of coins per page (max 250).
+
+    Returns:
+        tuple[list | None, str | None]: A tuple containing a list of coins (list of dicts)
+                                         or None, and an error message (str) or None.
+    """
+    url = f"{COINGECKO_BASE_URL}/coins/markets?vs_currency=usd&order=market_cap_desc&per_page={per_page}&page={page}"
+    headers = {"accept": "application/json"}
+    try:
+        return transport.get_json(url, headers=headers, ttl=LOADER_TTL_SECONDS, endpoint="/coins/markets"), None
+    except requests.exceptions.RequestException as e:
+        return None, f"An error occurred while fetching data: {e}"
+
+@metrics.instrument_fetch
+def fetch_coin_list(include_platform: bool = False) -> tuple[list | None, str | None]:
+    """
+    Fetches every coin CoinGecko lists (id, symbol, name).
+
+    Args:
+        include_platform (bool): Whether to include contract addresses per platform.
+
+    Returns:
+        tuple[list | None, str | None]: A tuple containing a list of coins (list of dicts)
+                                         or None, and an error message (str) or None.
+    """
+    url = f"{COINGECKO_BASE_URL}/coins/list?include_platform={str(include_platform).lower()}"
+    headers = {"accept": "application/json"}
+    try:
+        return transport.get_json(url, headers=headers, ttl=LOADER_TTL_SECONDS, endpoint="/coins/list"), None
+    except requests.exceptions.RequestException as e:
+        return None, f"An error occurred while fetching data: {e}"
+
+def _format_usd_price(usd_price) -> str:
+    # More decimals the smaller the price; "N/A" for non-numbers.
+    if not isinstance(usd_price, (float, int)):
+        return "N/A"
+    if usd_price > 1:
+        return f"{usd_price:.2f}"
+    if usd_price > 0.0001:
+        return f"{usd_price:.6f}"
+    return f"{usd_price:.10f}"
+
+def _build_trending(data: dict) -> list:
+    coins = data.get("coins", [])[:5]
+    trending_coins_data = []
+    for coin_data in coins:
+        item = coin_data.get("item", {})
+        usd_price = _format_usd_price(item.get("data", {}).get("price", "N/A"))
+
+        trending_coins_data.append({
+            "id": item.get("id"),
+            "name": item.get("name", "N/A"),
+            "symbol": item.get("symbol", "N/A"),
+            "rank": item.get("market_cap_rank", "N/A"),
+            "usd_price": usd_price,
+            "market_cap": item.get("data", {}).get("market_cap", "N/A"),
+            "market_cap_btc": item.get("data", {}).get("market_cap_btc", "N/A"),
+            "total_volume": item.get("data", {}).get("total_volume", "N/A"),
+            "total_volume_btc": item.get("data", {}).get("total_volume_btc", "N/A"),
+        })
+    return trending_coins_data
+
+@metrics.instrument_fetch
 def fetch_trending_data() -> tuple[list | None, str | None]:
     """
     Fetches trending cryptocurrencies.
@@ -73,42 +261,16 @@ def fetch_trending_data() -> tuple[list | None, str | None]:
     url = f"{COINGECKO_BASE_URL}/search/trending"
     headers = {"accept": "application/json"}
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
+        data = transport.get_json(url, headers=headers, ttl=TRENDING_TTL_SECONDS, endpoint="/search/trending")
 
-        coins = data.get("coins", [])[:5]
-        if not coins:
+        trending_coins_data = _derive("/search/trending", data, _build_trending)
+        if not trending_coins_data:
             return None, "No trending results available at the moment, please try again later."
-
-        trending_coins_data = []
-        for coin_data in coins:
-            item = coin_data.get("item", {})
-            usd_price = item.get("data", {}).get("price", "N/A")
-            if isinstance(usd_price, (float, int)):
-                if usd_price > 1:
-                    usd_price = f"{usd_price:.2f}"
-                elif 0.0001 < usd_price <= 1:
-                    usd_price = f"{usd_price:.6f}"
-                elif usd_price <= 0.0001:
-                    usd_price = f"{usd_price:.10f}"
-            else:
-                usd_price = "N/A"
-
-            trending_coins_data.append({
-                "name": item.get("name", "N/A"),
-                "symbol": item.get("symbol", "N/A"),
-                "rank": item.get("market_cap_rank", "N/A"),
-                "usd_price": usd_price,
-                "market_cap": item.get("data", {}).get("market_cap", "N/A"),
-                "market_cap_btc": item.get("data", {}).get("market_cap_btc", "N/A"),
-                "total_volume": item.get("data", {}).get("total_volume", "N/A"),
-                "total_volume_btc": item.get("data", {}).get("total_volume_btc", "N/A"),
-            })
         return trending_coins_data, None
     except requests.exceptions.RequestException as e:
         return None, f"An error occurred while fetching data: {e}"
 
+@metrics.instrument_fetch
 def fetch_dominance_data() -> tuple[dict | None, str | None]:
     """
     Fetches global market dominance data.
@@ -119,9 +281,7 @@ def fetch_dominance_data() -> tuple[dict | None, str | None]:
     """
     url = f"{COINGECKO_BASE_URL}/global"
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json().get("data", {})
+        data = transport.get_json(url, ttl=GLOBAL_TTL_SECONDS, endpoint="/global").get("data", {})
 
         active_cryptocurrencies = data.get("active_cryptocurrencies", "N/A")
         market_cap_percentage = data.get("market_cap_percentage", {})
@@ -140,37 +300,96 @@ def fetch_dominance_data() -> tuple[dict | None, str | None]:
     except requests.exceptions.RequestException as e:
         return None, f"An error occurred while fetching data: {e}"
 
+def _number_column(values) -> np.ndarray:
+    # Placeholders such as "N/A" become NaN.
+    return np.array(
+        [value if isinstance(value, (int, float)) and not isinstance(value, bool) else np.nan for value in values],
+        dtype=np.float64,
+    )
+
+def companies_table(companies: list[dict]) -> pd.DataFrame:
+    """
+    Flattens public treasury companies into typed columns, one row per company.
+
+    Args:
+        companies (list[dict]): Companies as returned by `/companies/public_treasury/{id}`.
+
+    Returns:
+        pd.DataFrame: The companies, largest holdings first, with their share
+                      of all listed holdings and their holdings and value ranks.
+    """
+    table = pd.DataFrame({
+        "name": [company.get("name") or "N/A" for company in companies],
+        "symbol": [company.get("symbol") or "N/A" for company in companies],
+        "country": [company.get("country") or "N/A" for company in companies],
+        **{
+            field: _number_column([company.get(field) for company in companies])
+            for field in ("total_holdings", "total_entry_value_usd", "total_current_value_usd", "percentage_of_total_supply")
+        },
+    })
+    holdings = table["total_holdings"]
+    table["share_of_holdings"] = holdings / holdings.sum() if holdings.sum() > 0 else np.nan
+    table["holdings_rank"] = holdings.rank(method="min", ascending=False).astype("Int64")
+    table["value_rank"] = table["total_current_value_usd"].rank(method="min", ascending=False).astype("Int64")
+    return table.sort_values("total_holdings", ascending=False, na_position="last", ignore_index=True)
+
+def _country_totals(table: pd.DataFrame) -> pd.DataFrame:
+    # Per-country totals, largest holdings first.
+    countries = table.groupby("country", sort=False).agg(
+        companies=("name", "size"),
+        total_holdings=("total_holdings", "sum"),
+        total_current_value_usd=("total_current_value_usd", "sum"),
+        share_of_holdings=("share_of_holdings", "sum"),
+    )
+    return countries.sort_values("total_holdings", ascending=False).reset_index()
+
+def _concentration(table: pd.DataFrame) -> dict:
+    # Shares of the top k holders and the Herfindahl-Hirschman index (sum of
+    # squared percentage shares: 10,000 for a single holder).
+    shares = np.nan_to_num(table["share_of_holdings"].to_numpy(dtype=np.float64))
+    cumulative = np.cumsum(np.sort(shares)[::-1])
+    top = {k: float(cumulative[min(k, len(cumulative)) - 1]) if len(cumulative) else 0.0 for k in CONCENTRATION_TOP_K}
+    return {"top_shares": top, "hhi": float(np.sum((shares * 100) ** 2))}
+
+def _build_companies(body: dict) -> dict:
+    table = companies_table(body.get("companies") or [])
+    return {
+        "total_holdings": body.get("total_holdings", "N/A"),
+        "total_value_usd": body.get("total_value_usd", "N/A"),
+        "market_cap_dominance": body.get("market_cap_dominance", "N/A"),
+        "companies": table,
+        "countries": _country_totals(table),
+        "concentration": _concentration(table),
+    }
+
+@metrics.instrument_fetch
 def fetch_companies_data(coin_id: str) -> tuple[dict | None, str | None]:
     """
     Fetches public treasury data for companies holding a specific coin.
 
+    The full company list is kept as a table, and the aggregates over it are
+    computed once per upstream response and shared by every caller.
+
     Args:
         coin_id (str): The ID of the coin (e.g., "bitcoin", "ethereum").
 
     Returns:
         tuple[dict | None, str | None]: A tuple containing companies data (dict)
                                          or None, and an error message (str) or None.
+                                         The dict holds the upstream totals,
+                                         "companies" (see `companies_table`),
+                                         "countries" (per-country totals) and
+                                         "concentration" ("top_shares" by k
+                                         and "hhi"). Treat them as read-only.
     """
     url = f"{COINGECKO_BASE_URL}/companies/public_treasury/{coin_id}"
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-
-        total_holdings = data.get("total_holdings", "N/A")
-        total_value_usd = data.get("total_value_usd", "N/A")
-        market_cap_dominance = data.get("market_cap_dominance", "N/A")
-        companies = data.get("companies", [])[:5]
-
-        return {
-            "total_holdings": total_holdings,
-            "total_value_usd": total_value_usd,
-            "market_cap_dominance": market_cap_dominance,
-            "companies": companies,
-        }, None
+        data = transport.get_json(url, ttl=COMPANIES_TTL_SECONDS, endpoint="/companies/public_treasury/{id}")
+        return _derive(f"/companies/public_treasury/{coin_id}", data, _build_companies), None
     except requests.exceptions.RequestException as e:
         return None, f"An error occurred while fetching data: {e}"
 
+@metrics.instrument_fetch
 def fetch_categories_data() -> tuple[list | None, str | None]:
     """
     Fetches top cryptocurrency categories.
@@ -181,15 +400,14 @@ def fetch_categories_data() -> tuple[list | None, str | None]:
     """
     url = f"{COINGECKO_BASE_URL}/coins/categories?order=market_cap_change_24h_desc"
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
+        data = transport.get_json(url, ttl=CATEGORIES_TTL_SECONDS, endpoint="/coins/categories")
 
-        top_categories = data[:3]
+        top_categories = _derive("/coins/categories", data, lambda body: body[:3])
         return top_categories, None
     except requests.exceptions.RequestException as e:
         return None, f"An error occurred while fetching data: {e}"
 
+@metrics.instrument_fetch
 def fetch_coin_details_by_name(user_query: str) -> tuple[dict | None, str | None]:
     """
     Fetches coin details by name or symbol.
@@ -201,30 +419,39 @@ def fetch_coin_details_by_name(user_query: str) -> tuple[dict | None, str | None
         tuple[dict | None, str | None]: A tuple containing coin details (dict)
                                          or None, and an error message (str) or None.
     """
-    search_url = f"{COINGECKO_BASE_URL}/search?query={user_query}"
     try:
-        search_response = requests.get(search_url)
-        search_response.raise_for_status()
-        search_data = search_response.json()
-
-        coins_list = search_data.get("coins", [])
-        if not coins_list:
+        coin = _resolve_coin(user_query)
+        if not coin:
             return None, f"No results found for '{user_query}'. Please try another query."
+    except requests.exceptions.RequestException as e:
+        return None, f"An error occurred while fetching data: {e}"
 
-        first_coin = coins_list[0]
-        coin_id = first_coin.get("id", None) # Use 'id' for details API
-        if not coin_id:
-            return None, "Could not find a valid coin ID. Please try again."
+    coin_id = coin.get("id", None) # Use 'id' for details API
+    if not coin_id:
+        return None, "Could not find a valid coin ID. Please try again."
+    with transport.step("details"):
+        return fetch_coin_details_by_id(coin_id)
+
+@metrics.instrument_fetch
+def fetch_coin_details_by_id(coin_id: str) -> tuple[dict | None, str | None]:
+    """
+    Fetches coin details by CoinGecko coin id through the response cache.
 
-        details_url = f"{COINGECKO_BASE_URL}/coins/{coin_id}"
-        details_response = requests.get(details_url)
-        details_response.raise_for_status()
-        details_data = details_response.json()
+    Args:
+        coin_id (str): The CoinGecko coin id.
 
+    Returns:
+        tuple[dict | None, str | None]: A tuple containing coin details (dict)
+                                         or None, and an error message (str) or None.
+    """
+    details_url = f"{COINGECKO_BASE_URL}/coins/{coin_id}"
+    try:
+        details_data = transport.get_json(details_url, ttl=DETAILS_CACHE_TTL_SECONDS, endpoint="/coins/{id}")
         return details_data, None
     except requests.exceptions.RequestException as e:
         return None, f"An error occurred while fetching data: {e}"
 
+@metrics.instrument_fetch
 def fetch_coin_details_by_address(platform: str, contract_address: str) -> tuple[dict | None, str | None]:
     """
     Fetches coin details by platform and contract address.
@@ -239,66 +466,268 @@ def fetch_coin_details_by_address(platform: str, contract_address: str) -> tuple
     """
     if platform not in ["ethereum", "solana"]:
         return None, "Invalid platform. Only `ethereum` and `solana` are supported."
-
-    details_url = f"{COINGECKO_BASE_URL}/coins/{platform}/contract/{contract_address}"
+    address_error = address_index.validate_address(platform, contract_address)
+    if address_error:
+        return None, address_error
+
+    # Known tokens go through the cached by-id path. The coin list behind the
+    # index may predate new listings, so other addresses are asked upstream
+    # unless upstream recently answered 404 for them.
+    index = address_index.get_index()
+    coin_id = index.lookup(platform, contract_address)
+    if coin_id:
+        return fetch_coin_details_by_id(coin_id)
+    not_listed = f"No CoinGecko listing found for this {platform} contract address."
+    if index.is_not_listed(platform, contract_address):
+        return None, not_listed
+
+    details_url = f"{COINGECKO_BASE_URL}/coins/{platform}/contract/{contract_address.strip()}"
     try:
-        details_response = requests.get(details_url)
-        details_response.raise_for_status()
-        details_data = details_response.json()
+        details_data = transport.get_json(
+            details_url, ttl=DETAILS_CACHE_TTL_SECONDS, endpoint="/coins/{platform}/contract/{address}"
+        )
+        if details_data.get("id"):
+            index.learn(platform, contract_address, details_data["id"])
         return details_data, None
+    except requests.exceptions.HTTPError as e:
+        if e.response is not None and e.response.status_code == 404:
+            index.mark_not_listed(platform, contract_address)
+            return None, not_listed
+        return None, f"An error occurred while fetching data: {e}"
     except requests.exceptions.RequestException as e:
         return None, f"An error occurred while fetching data: {e}"
 
+def _latest_series(key: tuple, days: int, fetch_days: int, ttl: float, fetch) -> tuple[np.ndarray, np.ndarray]:
+    # Serves "the last `days` days" of a series from the series cache. Misses
+    # fetch `fetch_days` (the widest horizon with the same granularity), so any
+    # shorter horizon asked for until the window expires is a slice of it.
+    cache = series_cache.get_cache()
+    cached = cache.get_latest(key, days * 86400, ttl)
+    if cached is not None:
+        return cached
+    fetch_days = max(days, fetch_days)
+    now = time.time()
+    try:
+        with transport.step(key[0]):
+            timestamps, values = fetch(fetch_days)
+    except requests.exceptions.Timeout:
+        # Out of time under a deadline: an expired window beats nothing.
+        budget = transport.current_deadline()
+        stale = cache.get_latest(key, days * 86400, math.inf) if budget is not None else None
+        if stale is None:
+            raise
+        budget.stale.add(key[0])
+        return stale
+    window = cache.put(key, now - fetch_days * 86400, now, timestamps, values, now)
+    return window.latest(days * 86400)
+
+def _range_granularity(span_seconds: int) -> str:
+    # /market_chart/range returns 5-minute points for ranges up to a day and
+    # hourly points beyond that (every chunk is at most 90 days).
+    return "5min" if span_seconds <= 86400 else "hourly"
+
+def _widen_range(start: int, end: int) -> int:
+    # Hourly ranges are widened back to the full length of the chunks they
+    # need anyway, within the history limit, so later and shorter ranges are
+    # sliced from the same window at no extra upstream cost.
+    if _range_granularity(end - start) != "hourly":
+        return start
+    chunk_seconds = MAX_RANGE_CHUNK_DAYS * 86400
+    widened = end - math.ceil((end - start) / chunk_seconds) * chunk_seconds
+    earliest = int(time.time()) - MAX_HISTORY_DAYS * 86400
+    return min(start, max(widened, earliest))
+
+def _range_chunks(start: int, end: int, max_chunk_seconds: int) -> list[tuple[int, int]]:
+    # Equal chunks keep every chunk on the same upstream granularity; adjacent
+    # chunks share their boundary second, and the duplicate point is dropped
+    # when stitching.
+    count = max(1, math.ceil((end - start) / max_chunk_seconds))
+    edges = np.linspace(start, end, count + 1).round().astype(np.int64)
+    return list(zip(edges[:-1].tolist(), edges[1:].tolist()))
+
+@metrics.instrument_fetch
+def fetch_price_range(coin_id: str, start: datetime, end: datetime, headers: dict | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Fetches a coin's USD prices over a date range as one stitched series.
+
+    Ranges covered by a fresh window in the series cache are sliced from it.
+    Otherwise the range is widened to whole chunks of `MAX_RANGE_CHUNK_DAYS`,
+    fetched concurrently as worker pool subtasks (within the calling
+    session's caps) through the rate-limited transport, and joined in
+    time order with boundary duplicates removed. Raises `requests` exceptions
+    on failures.
+
+    Args:
+        coin_id (str): The CoinGecko coin id.
+        start (datetime): The start of the range (timezone-aware).
+        end (datetime): The end of the range (timezone-aware).
+        headers (dict | None): Request headers.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The timestamps (ms) and prices; treat
+                                       them as read-only.
+    """
+    start_ts, end_ts = int(start.timestamp()), int(end.timestamp())
+    return _price_range_window(coin_id, start_ts, end_ts, headers).slice(start_ts * 1000, end_ts * 1000)
+
+def _price_range_window(coin_id: str, start_ts: int, end_ts: int, headers: dict | None) -> series_cache.Window:
+    # The cached (or newly fetched) window covering start_ts..end_ts; see
+    # `fetch_price_range`.
+    series_key = ("range", coin_id, _range_granularity(end_ts - start_ts))
+    cache = series_cache.get_cache()
+    window = cache.get_window(series_key, start_ts, end_ts, RANGE_TTL_SECONDS)
+    if window is not None:
+        return window
+
+    fetch_start = _widen_range(start_ts, end_ts)
+    # The stitched series is shared with the other processes on this host.
+    # The key names the upstream, so a process pointed at a mock never serves
+    # another's data; the shared views are copied since the window outlives
+    # them, and the window keeps the shared entry's age.
+    shared = shared_cache.get_cache()
+    shared_key = f"price_range:{COINGECKO_BASE_URL}:{coin_id}:{fetch_start}:{end_ts}"
+    if shared is not None:
+        timestamps = shared.get_array(f"{shared_key}:t", RANGE_TTL_SECONDS)
+        prices = shared.get_array(f"{shared_key}:p", RANGE_TTL_SECONDS)
+        if timestamps is not None and prices is not None and len(timestamps[0]) == len(prices[0]):
+            fetched_at = min(timestamps[1], prices[1])
+            return cache.put(series_key, fetch_start, end_ts, timestamps[0].copy(), prices[0].copy(), fetched_at)
+
+    chunks = _range_chunks(fetch_start, end_ts, MAX_RANGE_CHUNK_DAYS * 86400)
+
+    def fetch_chunk(bounds: tuple[int, int]) -> list:
+        url = f"{COINGECKO_BASE_URL}/coins/{coin_id}/market_chart/range?vs_currency=usd&from={bounds[0]}&to={bounds[1]}"
+        data = transport.get_json(url, headers=headers, ttl=RANGE_TTL_SECONDS, endpoint="/coins/{id}/market_chart/range")
+        return data.get("prices", [])
+
+    with profiling.phase("fetch"):
+        pool = worker_pool.get_pool()
+        jobs = [pool.spawn(fetch_chunk, chunk) for chunk in chunks]
+        parts = [job.result() for job in jobs]
+    timestamps, prices = indicators.stitch_series(parts)
+    fetched_at = time.time()
+    if shared is not None:
+        shared.put_array(f"{shared_key}:t", timestamps, fetched_at)
+        shared.put_array(f"{shared_key}:p", prices, fetched_at)
+    return cache.put(series_key, fetch_start, end_ts, timestamps, prices, fetched_at)
+
+def _aggregate_daily_bop(candles: dict) -> dict[str, float]:
+    # Average BOP per UTC day; candles with high == low carry no pressure and are skipped.
+    bop = indicators.balance_of_power(candles["open"], candles["high"], candles["low"], candles["close"])
+    return indicators.daily_mean(candles["timestamp"], bop)
+
+def _shared_daily_bop(coin_id: str, window: series_cache.Window, start_ts: int, end_ts: int, candle_freq: str) -> dict[str, float]:
+    # Daily BOP over a range, shared with the other processes on this host.
+    # The entry is stamped with its source window's fetch time, so it expires
+    # together with the prices it was computed from.
+    def build() -> dict[str, float]:
+        timestamps, prices = window.slice(start_ts * 1000, end_ts * 1000)
+        return _aggregate_daily_bop(indicators.resample_ohlc(timestamps, prices, candle_freq))
+
+    shared = shared_cache.get_cache()
+    if shared is None:
+        return build()
+    key = f"daily_bop:{COINGECKO_BASE_URL}:{coin_id}:{start_ts}:{end_ts}:{candle_freq}:{window.fetched_at!r}"
+    hit = shared.get(key, RANGE_TTL_SECONDS)
+    if hit is not None:
+        return json.loads(hit[0])
+    aggregated_bop = build()
+    shared.put(key, json.dumps(aggregated_bop, separators=(",", ":")).encode(), {"kind": "json"}, window.fetched_at)
+    return aggregated_bop
+
+@metrics.instrument_fetch
 def fetch_ohlc_data(coin_symbol: str, days: str) -> tuple[dict | None, str | None]:
     """
     Fetches Open-High-Low-Close (OHLC) data for a coin.
 
     Args:
         coin_symbol (str): The symbol of the coin.
-        days (str): The number of days (1, 7, or 14).
+        days (str): The number of days (1 to 365). 1, 7 and 14 use CoinGecko's
+                    native candles (7 is sliced from 14, which shares its
+                    candle size); other horizons are built from price ranges.
 
     Returns:
         tuple[dict | None, str | None]: A tuple containing OHLC data (dict)
                                          or None, and an error message (str) or None.
     """
-    if days not in ["1", "7", "14"]:
-        return None, "Invalid number of days! Please use 1, 7, or 14."
+    if days not in NATIVE_OHLC_DAYS:
+        if not days.isdigit() or not 1 <= int(days) <= MAX_HISTORY_DAYS:
+            return None, f"Invalid number of days! Please use a whole number from 1 to {MAX_HISTORY_DAYS}."
+        end = datetime.fromtimestamp(time.time() // RANGE_ALIGN_SECONDS * RANGE_ALIGN_SECONDS, timezone.utc)
+        return fetch_ohlc_range(coin_symbol, end - timedelta(days=int(days)), end)
 
-    encoded_query = urllib.parse.quote(coin_symbol)
     headers = {"accept": "application/json"}
 
     try:
-        search_url = f"{COINGECKO_BASE_URL}/search?query={encoded_query}"
-        search_response = requests.get(search_url, headers=headers)
-        search_response.raise_for_status()
-        search_data = search_response.json()
-
-        if search_data.get("coins") and len(search_data["coins"]) > 0:
-            first_coin = search_data["coins"][0]
-            coin_id = first_coin.get("id")
-            name = first_coin.get("name")
+        coin = _resolve_coin(coin_symbol, headers)
+        if coin:
+            coin_id = coin.get("id")
+            name = coin.get("name")
             if not coin_id:
                 return None, f"Error: No valid coin ID found for `{coin_symbol}`."
         else:
             return None, f"No coin found matching query: {coin_symbol}."
 
-        ohlc_url = f"{COINGECKO_BASE_URL}/coins/{coin_id}/ohlc?vs_currency=usd&days={days}"
-        ohlc_response = requests.get(ohlc_url, headers=headers)
-        ohlc_response.raise_for_status()
-        ohlc_data = ohlc_response.json()
+        def fetch(fetch_days: int) -> tuple[np.ndarray, np.ndarray]:
+            ohlc_url = f"{COINGECKO_BASE_URL}/coins/{coin_id}/ohlc?vs_currency=usd&days={fetch_days}"
+            ohlc_data = transport.get_json(ohlc_url, headers=headers, ttl=CHART_TTL_SECONDS, endpoint="/coins/{id}/ohlc")
+            candles = indicators.ohlc_to_arrays(ohlc_data or [])
+            return candles["timestamp"], np.column_stack([candles[field] for field in OHLC_FIELDS])
+
+        candle_size = NATIVE_OHLC_CANDLES[days]
+        widest = max(int(other) for other, size in NATIVE_OHLC_CANDLES.items() if size == candle_size)
+        timestamps, table = _latest_series(("ohlc", coin_id, candle_size), int(days), widest, CHART_TTL_SECONDS, fetch)
 
-        if not ohlc_data:
+        if not len(timestamps):
             return None, f"No OHLC data found for {name} in the last {days} days."
 
-        daily_bop = defaultdict(list)
-        for entry in ohlc_data:
-            timestamp, open_price, high_price, low_price, close_price = entry
-            date = datetime.utcfromtimestamp(timestamp / 1000).strftime('%Y-%m-%d')
-            if high_price != low_price:
-                bop = (close_price - open_price) / (high_price - low_price)
-                daily_bop[date].append(bop)
+        candles = {"timestamp": timestamps, **{field: table[:, i] for i, field in enumerate(OHLC_FIELDS)}}
+        aggregated_bop = _aggregate_daily_bop(candles)
+        if not aggregated_bop:
+            return None, f"No valid BOP data found for {name}."
 
-        aggregated_bop = {date: sum(values) / len(values) for date, values in daily_bop.items()}
+        return {"name": name, "bop_data": aggregated_bop}, None
+    except requests.exceptions.RequestException as e:
+        return None, f"Error fetching OHLC data: {e}"
+
+@metrics.instrument_fetch
+def fetch_ohlc_range(coin_symbol: str, start: datetime, end: datetime) -> tuple[dict | None, str | None]:
+    """
+    Computes daily BOP for a coin over an arbitrary date range.
+
+    Prices are fetched as parallel range chunks and resampled into candles of
+    the same size CoinGecko's native OHLC uses (30 minutes for a single day,
+    4 hours otherwise).
+
+    Args:
+        coin_symbol (str): The symbol of the coin.
+        start (datetime): The start of the range (timezone-aware).
+        end (datetime): The end of the range (timezone-aware).
+
+    Returns:
+        tuple[dict | None, str | None]: A tuple containing OHLC data (dict)
+                                         or None, and an error message (str) or None.
+    """
+    if end <= start:
+        return None, "Invalid date range! The start must be before the end."
+    if start < datetime.now(timezone.utc) - timedelta(days=MAX_HISTORY_DAYS, seconds=RANGE_ALIGN_SECONDS):
+        return None, f"Invalid date range! Only the last {MAX_HISTORY_DAYS} days are available."
+
+    headers = {"accept": "application/json"}
+
+    try:
+        coin = _resolve_coin(coin_symbol, headers)
+        if not coin or not coin.get("id"):
+            return None, f"No coin found matching query: {coin_symbol}."
+        name = coin.get("name")
+
+        start_ts, end_ts = int(start.timestamp()), int(end.timestamp())
+        window = _price_range_window(coin["id"], start_ts, end_ts, headers)
+        if not len(window.slice(start_ts * 1000, end_ts * 1000)[1]):
+            return None, f"No price data found for {name} in the selected range."
+
+        candle_freq = "30min" if end - start <= timedelta(days=1) else "4h"
+        aggregated_bop = _shared_daily_bop(coin["id"], window, start_ts, end_ts, candle_freq)
         if not aggregated_bop:
             return None, f"No valid BOP data found for {name}."
 
@@ -306,10 +735,14 @@ def fetch_ohlc_data(coin_symbol: str, days: str) -> tuple[dict | None, str | Non
     except requests.exceptions.RequestException as e:
         return None, f"Error fetching OHLC data: {e}"
 
+@metrics.instrument_fetch
 def fetch_market_chart_data(coin_symbol: str, days: int, interval: str) -> tuple[list | None, str | None]:
     """
     Fetches market chart data for RSI calculation.
 
+    Daily charts are fetched for `MAX_HISTORY_DAYS` and cached, so every
+    shorter horizon for the same coin is sliced from that one response.
+
     Args:
         coin_symbol (str): The symbol of the coin.
         days (int): The number of days for the chart data.
@@ -319,43 +752,40 @@ def fetch_market_chart_data(coin_symbol: str, days: int, interval: str) -> tuple
         tuple[list | None, str | None]: A tuple containing a list of prices (list of floats)
                                          or None, and an error message (str) or None.
     """
-    search_url = f"{COINGECKO_BASE_URL}/search?query={coin_symbol}"
     try:
-        search_response = requests.get(search_url)
-        search_response.raise_for_status()
-        search_data = search_response.json()
-
-        coins_list = search_data.get("coins", [])
-        if not coins_list:
+        coin = _resolve_coin(coin_symbol)
+        if not coin:
             return None, f"No results found for '{coin_symbol}'. Please try another search."
 
-        first_coin = coins_list[0]
-        coin_id = first_coin.get("id", None)
+        coin_id = coin.get("id", None)
         if not coin_id:
             return None, "Could not find a valid coin ID. Please try again."
 
         # CG_API_KEY is not strictly necessary for public endpoints, but keeping it if it's in .env
         cg_api_key = os.getenv("CG_API_KEY")
-        url = f"{COINGECKO_BASE_URL}/coins/{coin_id}/market_chart?vs_currency=usd&days={days}&interval={interval}"
         headers = {"accept": "application/json"}
         if cg_api_key:
             headers["x-cg-demo-api-key"] = cg_api_key
 
-        chart_response = requests.get(url, headers=headers)
-        chart_response.raise_for_status()
-        chart_data = chart_response.json()
+        def fetch(fetch_days: int) -> tuple[np.ndarray, np.ndarray]:
+            url = f"{COINGECKO_BASE_URL}/coins/{coin_id}/market_chart?vs_currency=usd&days={fetch_days}&interval={interval}"
+            chart_data = transport.get_json(url, headers=headers, ttl=CHART_TTL_SECONDS, endpoint="/coins/{id}/market_chart")
+            return indicators.market_chart_to_arrays(chart_data.get('prices', []))
 
-        prices = chart_data.get('prices', [])
-        if not prices:
+        # Only daily points keep the same spacing whatever the horizon.
+        widest = MAX_HISTORY_DAYS if interval == "daily" else days
+        _, prices = _latest_series(("market_chart", coin_id, interval), days, widest, CHART_TTL_SECONDS, fetch)
+        if not len(prices):
             return None, f"Price data not available for {coin_symbol}. Please try again later."
 
-        closing_prices = [price[1] for price in prices]
+        closing_prices = prices.tolist()
         return closing_prices, None
     except requests.exceptions.RequestException as e:
         return None, f"An error occurred while fetching data: {e}"
 
 # --- DexScreener API Functions ---
 
+@metrics.instrument_fetch
 def fetch_top_boosted_tokens() -> tuple[list | None, str | None]:
     """
     Fetches the top boosted tokens from DexScreener.
@@ -366,14 +796,13 @@ def fetch_top_boosted_tokens() -> tuple[list | None, str | None]:
     """
     url = f"{DEXSCREENER_BASE_URL}/token-boosts/top/v1"
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
+        data = transport.get_json(url, ttl=BOOSTS_TTL_SECONDS, endpoint="/token-boosts/top/v1")
         top_tokens = data[:5]
         return top_tokens, None
     except requests.exceptions.RequestException as e:
         return None, f"An error occurred while fetching data: {e}"
 
+@metrics.instrument_fetch
 def fetch_latest_boosted_tokens() -> tuple[list | None, str | None]:
     """
     Fetches the latest boosted tokens from DexScreener.
@@ -385,14 +814,57 @@ def fetch_latest_boosted_tokens() -> tuple[list | None, str | None]:
     """
     url = f"{DEXSCREENER_BASE_URL}/token-boosts/top/v1" # Assuming latest is also from 'top' as per original
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
+        data = transport.get_json(url, ttl=BOOSTS_TTL_SECONDS, endpoint="/token-boosts/top/v1")
         latest_tokens = data[:5] # Taking top 5 as "latest"
         return latest_tokens, None
     except requests.exceptions.RequestException as e:
         return None, f"An error occurred while fetching data: {e}"
 
+def stream_boosted_tokens(limit: int = 5) -> Iterator[dict]:
+    """
+    Yields the top boosted tokens from DexScreener as they are decoded.
+
+    The rest of the body is still read after `limit` tokens, so it is cached
+    for the other boosted-token views. Raises `requests` exceptions.
+
+    Args:
+        limit (int): The number of tokens yielded.
+    """
+    url = f"{DEXSCREENER_BASE_URL}/token-boosts/top/v1"
+    items = transport.stream_json_items(url, ttl=BOOSTS_TTL_SECONDS, endpoint="/token-boosts/top/v1")
+    for index, token in enumerate(items):
+        if index < limit:
+            yield token
+
+def _get_token_orders(chain_id: str, token_address: str) -> list:
+    url = f"{DEXSCREENER_BASE_URL}/orders/v1/{chain_id}/{token_address}"
+    return transport.get_json(url, ttl=ORDERS_TTL_SECONDS, endpoint="/orders/v1/{chain}/{address}") or []
+
+def _validate_order_query(chain_id: str, token_address: str) -> str | None:
+    if chain_id not in ["ethereum", "solana"]:
+        return "Invalid chain ID. Please use `ethereum` or `solana`."
+    return address_index.validate_address(chain_id, token_address)
+
+def stream_token_orders(chain_id: str, token_address: str) -> tuple[Iterator[dict] | None, str | None]:
+    """
+    Streams token orders from DexScreener as they are decoded.
+
+    Args:
+        chain_id (str): The blockchain chain ID (e.g., "ethereum", "solana").
+        token_address (str): The contract address of the token.
+
+    Returns:
+        tuple[Iterator[dict] | None, str | None]: An iterator of orders (raising `requests`
+                                                  exceptions while iterating) or None,
+                                                  and an error message (str) or None.
+    """
+    error = _validate_order_query(chain_id, token_address)
+    if error:
+        return None, error
+    url = f"{DEXSCREENER_BASE_URL}/orders/v1/{chain_id}/{token_address.strip()}"
+    return transport.stream_json_items(url, ttl=ORDERS_TTL_SECONDS, endpoint="/orders/v1/{chain}/{address}"), None
+
+@metrics.instrument_fetch
 def fetch_token_orders(chain_id: str, token_address: str) -> tuple[list | None, str | None]:
     """
     Fetches token orders from DexScreener.
@@ -405,20 +877,19 @@ def fetch_token_orders(chain_id: str, token_address: str) -> tuple[list | None,
         tuple[list | None, str | None]: A tuple containing a list of orders (list of dicts)
                                          or None, and an error message (str) or None.
     """
-    if chain_id not in ["ethereum", "solana"]:
-        return None, "Invalid chain ID. Please use `ethereum` or `solana`."
+    error = _validate_order_query(chain_id, token_address)
+    if error:
+        return None, error
 
-    url = f"{DEXSCREENER_BASE_URL}/orders/v1/{chain_id}/{token_address}"
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
+        data = _get_token_orders(chain_id, token_address.strip())
         if not data:
             return None, "No orders found for the specified token."
         return data, None
     except requests.exceptions.RequestException as e:
         return None, f"An error occurred while fetching data: {e}"
 
+@metrics.instrument_fetch
 def fetch_trade_info(token_address: str) -> tuple[list | None, str | None]:
     """
     Fetches trade information for a given token address from DexScreener.
@@ -432,9 +903,7 @@ def fetch_trade_info(token_address: str) -> tuple[list | None, str | None]:
     """
     url = f"{DEXSCREENER_BASE_URL}/latest/dex/tokens/{token_address}"
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
+        data = transport.get_json(url, ttl=PAIRS_TTL_SECONDS, endpoint="/latest/dex/tokens/{address}")
         pairs = data.get("pairs", [])
         if not pairs:
             return None, "No data found for the entered token address. Please try again."
@@ -442,3 +911,232 @@ def fetch_trade_info(token_address: str) -> tuple[list | None, str | None]:
     except requests.exceptions.RequestException as e:
         return None, f"An error occurred while fetching data: {e}"
 
+def stream_trade_info(token_address: str) -> Iterator[dict]:
+    """
+    Yields the trade pairs of a token from DexScreener as they are decoded.
+    Raises `requests` exceptions.
+
+    Args:
+        token_address (str): The contract address of the token.
+    """
+    url = f"{DEXSCREENER_BASE_URL}/latest/dex/tokens/{token_address}"
+    return transport.stream_json_items(url, ttl=PAIRS_TTL_SECONDS, endpoint="/latest/dex/tokens/{address}", key="pairs")
+
+def _batches(items: list, size: int) -> list[list]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def _get_pairs_batch(addresses: list[str]) -> list:
+    # One request for up to DEXSCREENER_MAX_ADDRESSES tokens on any chains.
+    url = f"{DEXSCREENER_BASE_URL}/latest/dex/tokens/{','.join(addresses)}"
+    data = transport.get_json(url, ttl=PAIRS_TTL_SECONDS, endpoint="/latest/dex/tokens/{addresses}")
+    return (data or {}).get("pairs") or []
+
+def pairs_table(pairs: list[dict]) -> pd.DataFrame:
+    """
+    Flattens DexScreener pair dicts into typed columns, one row per pair.
+
+    Args:
+        pairs (list[dict]): Pairs as returned by the `/pairs` and `/tokens` endpoints.
+
+    Returns:
+        pd.DataFrame: The pairs, with numpy-backed numeric columns.
+    """
+    def column(get, dtype=None):
+        values = [get(pair) for pair in pairs]
+        return np.array(values, dtype=dtype) if dtype else values
+
+    def number(value):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return np.nan
+
+    return pd.DataFrame({
+        "token_address": column(lambda pair: pair.get("baseToken", {}).get("address")),
+        "symbol": column(lambda pair: pair.get("baseToken", {}).get("symbol")),
+        "quote_symbol": column(lambda pair: pair.get("quoteToken", {}).get("symbol")),
+        "chain": column(lambda pair: pair.get("chainId")),
+        "dex": column(lambda pair: pair.get("dexId")),
+        "pair_address": column(lambda pair: pair.get("pairAddress")),
+        "price_usd": column(lambda pair: number(pair.get("priceUsd")), np.float64),
+        "liquidity_usd": column(lambda pair: number((pair.get("liquidity") or {}).get("usd")), np.float64),
+        "volume_24h_usd": column(lambda pair: number((pair.get("volume") or {}).get("h24")), np.float64),
+        "buys_24h": column(lambda pair: (pair.get("txns") or {}).get("h24", {}).get("buys") or 0, np.int64),
+        "sells_24h": column(lambda pair: (pair.get("txns") or {}).get("h24", {}).get("sells") or 0, np.int64),
+        "url": column(lambda pair: pair.get("url")),
+    })
+
+def _rollup_pairs(table: pd.DataFrame) -> pd.DataFrame:
+    # Per-token totals; the price is weighted by each pair's 24h volume and
+    # falls back to the plain mean for tokens without any volume.
+    volume = table["volume_24h_usd"].fillna(0.0)
+    priced = table["price_usd"].notna()
+    weighted = table.assign(
+        _value=(table["price_usd"] * volume).where(priced, 0.0),
+        _weight=volume.where(priced, 0.0),
+    )
+    grouped = weighted.groupby("token_address", sort=False)
+    rollup = grouped.agg(
+        symbol=("symbol", "first"),
+        pairs=("pair_address", "size"),
+        total_liquidity_usd=("liquidity_usd", "sum"),
+        volume_24h_usd=("volume_24h_usd", "sum"),
+        buys_24h=("buys_24h", "sum"),
+        sells_24h=("sells_24h", "sum"),
+        _value=("_value", "sum"),
+        _weight=("_weight", "sum"),
+        _mean_price=("price_usd", "mean"),
+    )
+    weight = rollup["_weight"]
+    rollup["vwap_usd"] = (rollup["_value"] / weight.where(weight > 0)).fillna(rollup["_mean_price"])
+    rollup = rollup.drop(columns=["_value", "_weight", "_mean_price"]).reset_index()
+    columns = ["token_address", "symbol", "pairs", "vwap_usd", "total_liquidity_usd", "volume_24h_usd", "buys_24h", "sells_24h"]
+    return rollup[columns].sort_values("total_liquidity_usd", ascending=False, ignore_index=True)
+
+@metrics.instrument_fetch
+def fetch_trade_info_batch(token_addresses: list[str]) -> tuple[dict | None, str | None]:
+    """
+    Fetches trade information for many token addresses at once.
+
+    Addresses are grouped into DexScreener multi-token requests of up to
+    `DEXSCREENER_MAX_ADDRESSES` each, which run concurrently as worker pool
+    subtasks. Pairs are
+    attributed to their base token; a pair returned for several requested
+    tokens appears once.
+
+    Args:
+        token_addresses (list[str]): The contract addresses of the tokens.
+
+    Returns:
+        tuple[dict | None, str | None]: A dict with "pairs" (one row per pair),
+                                        "tokens" (per-token rollups: total liquidity,
+                                        volume-weighted price, aggregate buys/sells)
+                                        and "missing" (addresses without pairs), or
+                                        None and an error message (str).
+    """
+    addresses = list(dict.fromkeys(address.strip() for address in token_addresses if address.strip()))
+    if not addresses:
+        return None, "Please enter at least one token address."
+
+    pool = worker_pool.get_pool()
+    jobs = [pool.spawn(_get_pairs_batch, batch) for batch in _batches(addresses, DEXSCREENER_MAX_ADDRESSES)]
+    requested = {address.lower(): address for address in addresses}
+    pairs, seen, errors = [], set(), []
+    with profiling.phase("fetch"):
+        for job in jobs:
+            try:
+                batch_pairs = job.result()
+            except requests.exceptions.RequestException as e:
+                errors.append(str(e))
+                continue
+            for pair in batch_pairs:
+                key = (pair.get("chainId"), pair.get("pairAddress"))
+                base = (pair.get("baseToken") or {}).get("address", "")
+                if key in seen or base.lower() not in requested:
+                    continue
+                seen.add(key)
+                pairs.append(pair)
+
+    if not pairs:
+        if errors:
+            return None, f"An error occurred while fetching data: {errors[0]}"
+        return None, "No data found for the entered token addresses. Please try again."
+    table = pairs_table(pairs)
+    # Report rows under the address as the user typed it.
+    table["token_address"] = table["token_address"].map(lambda address: requested.get(address.lower(), address))
+    found = set(table["token_address"])
+    return {
+        "pairs": table,
+        "tokens": _rollup_pairs(table),
+        "missing": [address for address in addresses if address not in found],
+    }, None
+
+def _get_chain_pairs(chain_id: str, addresses: list[str]) -> list:
+    # One request for up to DEXSCREENER_MAX_ADDRESSES tokens of one chain.
+    url = f"{DEXSCREENER_BASE_URL}/tokens/v1/{chain_id}/{','.join(addresses)}"
+    return transport.get_json(url, ttl=PAIRS_TTL_SECONDS, endpoint="/tokens/v1/{chain}/{addresses}") or []
+
+def _token_key(chain_id: str, address: str) -> tuple[str, str]:
+    # EVM addresses are case-insensitive; Solana's base58 addresses are not.
+    return chain_id, address if chain_id == "solana" else address.lower()
+
+def enrich_boosted_tokens(tokens: list[dict]) -> tuple[pd.DataFrame | None, str | None]:
+    """
+    Joins boosted tokens with their most liquid DexScreener pair and their orders.
+
+    Pairs are fetched per chain through the multi-token endpoint (up to
+    `DEXSCREENER_MAX_ADDRESSES` tokens per request) and orders per token; all
+    requests run concurrently as worker pool subtasks. A token whose lookups
+    fail keeps empty columns.
+
+    Args:
+        tokens (list[dict]): Boosted tokens with "chainId" and "tokenAddress".
+
+    Returns:
+        tuple[pd.DataFrame | None, str | None]: One row per token, or None and an error message.
+    """
+    tokens = [token for token in tokens if token.get("chainId") and token.get("tokenAddress")]
+    if not tokens:
+        return None, "No boosted tokens to enrich."
+
+    by_chain = {}
+    for token in tokens:
+        by_chain.setdefault(token["chainId"], []).append(token["tokenAddress"])
+    pool = worker_pool.get_pool()
+    pair_jobs = [
+        pool.spawn(_get_chain_pairs, chain_id, batch)
+        for chain_id, addresses in by_chain.items()
+        for batch in _batches(list(dict.fromkeys(addresses)), DEXSCREENER_MAX_ADDRESSES)
+    ]
+    order_jobs = {
+        _token_key(token["chainId"], token["tokenAddress"]): pool.spawn(
+            _get_token_orders, token["chainId"], token["tokenAddress"]
+        )
+        for token in tokens
+    }
+
+    # Most liquid pair per token, keyed like the tokens.
+    best_pairs = {}
+    with profiling.phase("fetch"):
+        for job in pair_jobs:
+            try:
+                pairs = job.result()
+            except requests.exceptions.RequestException as e:
+                print(f"Boosted token pair lookup failed: {e}")
+                continue
+            for pair in pairs:
+                key = _token_key(pair.get("chainId", ""), pair.get("baseToken", {}).get("address", ""))
+                liquidity = (pair.get("liquidity") or {}).get("usd") or 0
+                if key not in best_pairs or liquidity > best_pairs[key][0]:
+                    best_pairs[key] = (liquidity, pair)
+        orders = {}
+        for key, job in order_jobs.items():
+            try:
+                orders[key] = job.result()
+            except requests.exceptions.RequestException as e:
+                print(f"Boosted token order lookup failed: {e}")
+
+    rows = []
+    for token in tokens:
+        key = _token_key(token["chainId"], token["tokenAddress"])
+        pair = best_pairs.get(key, (0, {}))[1]
+        token_orders = orders.get(key)
+        rows.append({
+            "chain": token["chainId"],
+            "token_address": token["tokenAddress"],
+            "symbol": pair.get("baseToken", {}).get("symbol"),
+            "boost_amount": token.get("totalAmount", token.get("amount")),
+            "price_usd": pd.to_numeric(pair.get("priceUsd"), errors="coerce"),
+            "liquidity_usd": (pair.get("liquidity") or {}).get("usd"),
+            "volume_24h_usd": (pair.get("volume") or {}).get("h24"),
+            "price_change_24h": (pair.get("priceChange") or {}).get("h24"),
+            "buys_24h": (pair.get("txns") or {}).get("h24", {}).get("buys"),
+            "sells_24h": (pair.get("txns") or {}).get("h24", {}).get("sells"),
+            "dex": pair.get("dexId"),
+            "orders": None if token_orders is None else len(token_orders),
+            "approved_orders": None if token_orders is None else ", ".join(
+                sorted({order.get("type", "?") for order in token_orders if order.get("status") == "approved"})
+            ),
+            "url": token.get("url"),
+        })
+    return pd.DataFrame(rows), None
@@ -1,5 +1,12 @@
 import streamlit as st
+import cache_warmer
 import commands
+import dominance_history
+import market_snapshot
+import metrics
+import persistence
+import profiling
+import search_index
 import utils
 
 # --- Initial Page Config ---
@@ -10,6 +17,19 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# --- Background Data Loaders ---
+# Start the shared markets snapshot and coin search index with the first session
+# so lookups and suggestions are warm (restored from the last warm-restart
+# snapshot, if any), keep popular queries' data fresh, record market dominance
+# history, snapshot state to disk and serve metrics on the side port.
+market_snapshot.get_snapshot()
+search_index.get_index()
+cache_warmer.get_warmer()
+dominance_history.get_history()
+persistence.start()
+metrics.start_server()
+metrics.track_session(st.session_state)
+
 # --- Dark Theme CSS ---
 custom_css = f"""
     <style>
@@ -144,6 +164,7 @@ command_choice = st.sidebar.radio(
     (
         "Introduction",
         "Search Coin",
+        "Live Watchlist",
         "Trending Coins",
         "Market Dominance",
         "Companies Holdings",
@@ -169,47 +190,58 @@ coin_name_translations = {
 # --- Command Logic: What happens when you pick a command ---
 # Now calling functions from the 'commands' module for each choice.
 
-if command_choice == "Introduction":
-    commands.display_introduction()
+# Opt-in: when off, the phase hooks in the command path are shared no-ops.
+profile_commands = st.sidebar.checkbox("Profile commands (debug)", key="profile_commands")
+
+with profiling.profile(command_choice, enabled=profile_commands):
+    if command_choice == "Introduction":
+        commands.display_introduction()
+
+    elif command_choice == "Search Coin":
+        commands.display_search_coin()
+
+    elif command_choice == "Live Watchlist":
+        commands.display_live_watchlist()
 
-elif command_choice == "Search Coin":
-    commands.display_search_coin()
+    elif command_choice == "Trending Coins":
+        commands.display_trending_coins()
 
-elif command_choice == "Trending Coins":
-    commands.display_trending_coins()
+    elif command_choice == "Market Dominance":
+        commands.display_market_dominance()
 
-elif command_choice == "Market Dominance":
-    commands.display_market_dominance()
+    elif command_choice == "Companies Holdings":
+        commands.display_companies_holdings(coin_name_translations)
 
-elif command_choice == "Companies Holdings":
-    commands.display_companies_holdings(coin_name_translations)
+    elif command_choice == "Coin Categories":
+        commands.display_coin_categories()
 
-elif command_choice == "Coin Categories":
-    commands.display_coin_categories()
+    elif command_choice == "Coin Details (by Name)":
+        commands.display_coin_details_by_name()
 
-elif command_choice == "Coin Details (by Name)":
-    commands.display_coin_details_by_name()
+    elif command_choice == "Coin Details (by Address)":
+        commands.display_coin_details_by_address()
 
-elif command_choice == "Coin Details (by Address)":
-    commands.display_coin_details_by_address()
+    elif command_choice == "Balance of Power (BOP)":
+        commands.display_bop()
 
-elif command_choice == "Balance of Power (BOP)":
-    commands.display_bop()
+    elif command_choice == "Relative Strength Index (RSI)":
+        commands.display_rsi()
 
-elif command_choice == "Relative Strength Index (RSI)":
-    commands.display_rsi()
+    elif command_choice == "Top Boosted Tokens":
+        commands.display_top_boosted_tokens()
 
-elif command_choice == "Top Boosted Tokens":
-    commands.display_top_boosted_tokens()
+    elif command_choice == "Latest Boosted Tokens":
+        commands.display_latest_boosted_tokens()
 
-elif command_choice == "Latest Boosted Tokens":
-    commands.display_latest_boosted_tokens()
+    elif command_choice == "Token Orders":
+        commands.display_token_orders()
 
-elif command_choice == "Token Orders":
-    commands.display_token_orders()
+    elif command_choice == "Trade Info":
+        commands.display_trade_info()
 
-elif command_choice == "Trade Info":
-    commands.display_trade_info()
+if profile_commands:
+    st.sidebar.subheader("Profile")
+    profiling.render_report(command_choice)
 
 # --- Footer Section ---
 st.markdown(
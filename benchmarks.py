@@ -0,0 +1,400 @@
+import argparse
+import gc
+import json
+import math
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import api_client
+import commands
+import indicators
+import price_feed
+import utils
+
+# Hot-path cases fail the baseline check when their time or peak memory grows
+# by more than this fraction ...
+REGRESSION_THRESHOLD = 0.25
+# ... and by more than these absolute amounts, so timer noise on the smallest
+# inputs does not count as a regression.
+MIN_TIME_REGRESSION_SECONDS = 0.0005
+MIN_MEMORY_REGRESSION_BYTES = 64 * 1024
+# Repetitions of one hot-path case stop once they have taken this long.
+REPEAT_BUDGET_SECONDS = 2.0
+
+# --- Naive Python References ---
+# Straightforward per-point loops, kept deliberately simple so they double as
+# correctness oracles for the vectorized kernels in `indicators`.
+
+def naive_sma(values: list[float], period: int) -> list[float]:
+    result = []
+    for i in range(len(values)):
+        if i + 1 < period:
+            result.append(math.nan)
+        else:
+            result.append(sum(values[i + 1 - period:i + 1]) / period)
+    return result
+
+def _naive_smoothing(values: list[float], alpha: float, period: int) -> list[float]:
+    result = [math.nan] * len(values)
+    if len(values) < period:
+        return result
+    current = sum(values[:period]) / period
+    result[period - 1] = current
+    for i in range(period, len(values)):
+        current = alpha * values[i] + (1 - alpha) * current
+        result[i] = current
+    return result
+
+def naive_ema(values: list[float], period: int) -> list[float]:
+    return _naive_smoothing(values, 2.0 / (period + 1), period)
+
+def naive_macd(values: list[float], fast: int = 12, slow: int = 26, signal: int = 9) -> list[float]:
+    fast_ema = naive_ema(values, fast)
+    slow_ema = naive_ema(values, slow)
+    line = [f - s for f, s in zip(fast_ema, slow_ema)]
+    start = next((i for i, v in enumerate(line) if not math.isnan(v)), len(line))
+    signal_line = [math.nan] * start + naive_ema(line[start:], signal)
+    return [l - s for l, s in zip(line, signal_line)]
+
+def naive_bollinger_upper(values: list[float], period: int = 20, num_std: float = 2.0) -> list[float]:
+    result = []
+    for i in range(len(values)):
+        if i + 1 < period:
+            result.append(math.nan)
+            continue
+        window = values[i + 1 - period:i + 1]
+        mean = sum(window) / period
+        std = math.sqrt(sum((v - mean) ** 2 for v in window) / period)
+        result.append(mean + num_std * std)
+    return result
+
+def naive_atr(high: list[float], low: list[float], close: list[float], period: int = 14) -> list[float]:
+    ranges = [high[0] - low[0]]
+    for i in range(1, len(close)):
+        ranges.append(max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1])))
+    return _naive_smoothing(ranges, 1.0 / period, period)
+
+def naive_stochastic_k(high: list[float], low: list[float], close: list[float], period: int = 14) -> list[float]:
+    result = []
+    for i in range(len(close)):
+        if i + 1 < period:
+            result.append(math.nan)
+            continue
+        highest = max(high[i + 1 - period:i + 1])
+        lowest = min(low[i + 1 - period:i + 1])
+        spread = highest - lowest
+        result.append(50.0 if spread == 0 else 100 * (close[i] - lowest) / spread)
+    return result
+
+# --- Benchmark Harness ---
+
+def synthetic_ohlc(n_points: int, n_series: int = 1, seed: int = 7) -> dict[str, np.ndarray]:
+    """
+    Generates random-walk OHLC candles.
+
+    Args:
+        n_points (int): The number of candles per series.
+        n_series (int): The number of independent series.
+        seed (int): The random seed.
+
+    Returns:
+        dict[str, np.ndarray]: Arrays of shape (n_series, n_points) keyed by
+                               "open", "high", "low" and "close".
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (n_series, n_points)), axis=1))
+    open_ = np.roll(close, 1, axis=1)
+    open_[:, 0] = close[:, 0]
+    wick = np.abs(rng.normal(0, 0.005, (2, n_series, n_points))) * close
+    return {
+        "open": open_,
+        "high": np.maximum(open_, close) + wick[0],
+        "low": np.minimum(open_, close) - wick[1],
+        "close": close,
+    }
+
+def _best_time(func, repeat: int, budget: float = math.inf) -> float:
+    best = math.inf
+    spent = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        spent += elapsed
+        if spent >= budget:
+            break
+    return best
+
+def _cases(data: dict[str, np.ndarray]) -> list[tuple[str, callable, callable, callable]]:
+    o, h, l, c = (data[k][0] for k in ("open", "high", "low", "close"))
+    ol, hl, ll, cl = (series.tolist() for series in (o, h, l, c))
+    return [
+        ("sma(20)", lambda: indicators.sma(c, 20), lambda: naive_sma(cl, 20), lambda: indicators.sma(data["close"], 20)),
+        ("ema(20)", lambda: indicators.ema(c, 20), lambda: naive_ema(cl, 20), lambda: indicators.ema(data["close"], 20)),
+        ("macd(12,26,9)", lambda: indicators.macd(c)[2], lambda: naive_macd(cl), lambda: indicators.macd(data["close"])),
+        ("bollinger(20,2)", lambda: indicators.bollinger_bands(c)[1], lambda: naive_bollinger_upper(cl),
+         lambda: indicators.bollinger_bands(data["close"])),
+        ("atr(14)", lambda: indicators.atr(h, l, c), lambda: naive_atr(hl, ll, cl),
+         lambda: indicators.atr(data["high"], data["low"], data["close"])),
+        ("stochastic(14)", lambda: indicators.stochastic(h, l, c)[0], lambda: naive_stochastic_k(hl, ll, cl),
+         lambda: indicators.stochastic(data["high"], data["low"], data["close"])),
+        ("rsi(14)", lambda: indicators.rsi(c)[-1], lambda: utils.calculate_rsi(cl, 14),
+         lambda: indicators.rsi(data["close"])),
+    ]
+
+def run_indicator_benchmarks(sizes: list[int], n_series: int, repeat: int) -> list[dict]:
+    """
+    Times each vectorized indicator against its naive Python reference.
+
+    Args:
+        sizes (list[int]): The series lengths to benchmark.
+        n_series (int): The number of series used for the batched timing.
+        repeat (int): The number of repetitions; the best time is kept.
+
+    Returns:
+        list[dict]: One row per (indicator, size) with timings in seconds.
+    """
+    rows = []
+    for size in sizes:
+        data = synthetic_ohlc(size, n_series)
+        for name, vectorized, naive, batched in _cases(data):
+            if not np.allclose(vectorized(), naive(), equal_nan=True):
+                raise AssertionError(f"{name} disagrees with its reference at n={size}")
+            rows.append({
+                "indicator": name,
+                "points": size,
+                "vectorized_s": _best_time(vectorized, repeat),
+                "naive_s": _best_time(naive, repeat),
+                "batch_s": _best_time(batched, repeat),
+            })
+    return rows
+
+# --- Hot Paths ---
+# The app's own request-path code on synthetic inputs of growing size. Each
+# case builds its input outside the measurement and returns the callable to
+# time; `max_size` keeps the pure-Python cases within a few hundred MB.
+
+def synthetic_prices(n_points: int, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_points)))
+
+def synthetic_ohlc_rows(n_points: int) -> list[list[float]]:
+    # `/coins/{id}/ohlc` rows: [timestamp ms, open, high, low, close], 30-minute candles.
+    data = synthetic_ohlc(n_points)
+    timestamps = 1.7e12 + 1_800_000 * np.arange(n_points)
+    return np.column_stack([timestamps] + [data[k][0] for k in ("open", "high", "low", "close")]).tolist()
+
+def synthetic_pairs(n_items: int, seed: int = 7) -> list[dict]:
+    # DexScreener pairs shaped like `/latest/dex/tokens/{address}` returns them.
+    rng = np.random.default_rng(seed)
+    prices = rng.lognormal(0, 3, n_items)
+    windows = ("m5", "h1", "h6", "h24")
+    return [
+        {
+            "chainId": "ethereum",
+            "dexId": f"dex-{i % 5}",
+            "url": f"https://dexscreener.com/ethereum/0x{i:040x}",
+            "pairAddress": f"0x{i:040x}",
+            "baseToken": {"address": f"0x{i + 1:040x}", "symbol": "TOKEN"},
+            "quoteToken": {"symbol": "WETH"},
+            "priceNative": f"{price / 3000:.10f}",
+            "priceUsd": f"{price:.8f}",
+            "txns": {window: {"buys": i % 97, "sells": i % 89} for window in windows},
+            "volume": {window: price * 1000.0 for window in windows},
+            "priceChange": {window: (i % 21) - 10.0 for window in windows},
+            "liquidity": {"usd": price * 5e4},
+            "marketCap": price * 1e6,
+            "fdv": price * 1.2e6,
+            "boosts": {"active": i % 3},
+        }
+        for i, price in enumerate(prices.tolist())
+    ]
+
+def _rsi_python(size: int):
+    prices = synthetic_prices(size).tolist()
+    return lambda: utils.calculate_rsi(prices, 14)
+
+def _rsi_vectorized(size: int):
+    prices = synthetic_prices(size)
+    return lambda: indicators.rsi(prices, 14)[-1]
+
+def _bop_native(size: int):
+    rows = synthetic_ohlc_rows(size)
+    return lambda: api_client._aggregate_daily_bop(indicators.ohlc_to_arrays(rows))
+
+def _bop_range(size: int):
+    # Five-minute prices as `fetch_price_range` stitches them, resampled to 4h candles.
+    timestamps = 1.7e12 + 300_000 * np.arange(size)
+    prices = synthetic_prices(size)
+    return lambda: api_client._aggregate_daily_bop(indicators.resample_ohlc(timestamps, prices, "4h"))
+
+def _trending_prices(size: int):
+    prices = np.random.default_rng(7).lognormal(-2, 5, size).tolist()
+    return lambda: [api_client._format_usd_price(price) for price in prices]
+
+def _trade_info_markdown(size: int):
+    pairs = synthetic_pairs(size)
+    return lambda: "".join(commands._pair_markdown(pair) for pair in pairs)
+
+HOT_PATH_CASES = [
+    # (name, max_size, setup)
+    ("rsi: utils.calculate_rsi", 10 ** 6, _rsi_python),
+    ("rsi: indicators.rsi", 10 ** 7, _rsi_vectorized),
+    ("bop: native candles", 10 ** 6, _bop_native),
+    ("bop: range resample", 10 ** 7, _bop_range),
+    ("trending: price format", 10 ** 6, _trending_prices),
+    ("trade info: markdown", 10 ** 5, _trade_info_markdown),
+]
+
+def _peak_memory(func) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def run_hot_path_benchmarks(sizes: list[int], repeat: int, cases: list[str] | None = None) -> list[dict]:
+    """
+    Times the app's hot paths and measures their peak memory.
+
+    Time is the best of up to `repeat` runs with the garbage collector off;
+    peak memory is measured in a separate run under tracemalloc, so tracing
+    does not skew the timing.
+
+    Args:
+        sizes (list[int]): Input sizes (points or items); sizes above a case's
+                           `max_size` are skipped for that case.
+        repeat (int): The maximum number of timed repetitions.
+        cases (list[str] | None): Only run cases whose name contains one of these.
+
+    Returns:
+        list[dict]: One row per (case, size) with "time_s" and "peak_bytes".
+    """
+    rows = []
+    for name, max_size, setup in HOT_PATH_CASES:
+        if cases and not any(pattern in name for pattern in cases):
+            continue
+        for size in sizes:
+            if size > max_size:
+                continue
+            func = setup(size)
+            # Like timeit, keep collector pauses triggered by the (large) setup
+            # data out of the timing.
+            gc.collect()
+            gc.disable()
+            try:
+                elapsed = _best_time(func, repeat, REPEAT_BUDGET_SECONDS)
+            finally:
+                gc.enable()
+            rows.append({"case": name, "size": size, "time_s": elapsed, "peak_bytes": _peak_memory(func)})
+            del func
+    return rows
+
+def _baseline_key(row: dict) -> str:
+    return f"{row['case']}@{row['size']}"
+
+def save_baseline(rows: list[dict], path: str):
+    baseline = {_baseline_key(row): {"time_s": row["time_s"], "peak_bytes": row["peak_bytes"]} for row in rows}
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+def compare_to_baseline(rows: list[dict], baseline: dict, threshold: float = REGRESSION_THRESHOLD) -> list[str]:
+    """
+    Lists the cases that regressed against a saved baseline.
+
+    Args:
+        rows (list[dict]): Results of `run_hot_path_benchmarks`.
+        baseline (dict): A baseline written by `save_baseline`.
+        threshold (float): The tolerated relative growth of time and peak memory.
+
+    Returns:
+        list[str]: One message per regressed measurement; cases missing from
+                   the baseline are not compared.
+    """
+    regressions = []
+    for row in rows:
+        reference = baseline.get(_baseline_key(row))
+        if reference is None:
+            continue
+        for field, floor, unit in (
+            ("time_s", MIN_TIME_REGRESSION_SECONDS, "s"),
+            ("peak_bytes", MIN_MEMORY_REGRESSION_BYTES, "B"),
+        ):
+            old, new = reference[field], row[field]
+            if new > old * (1 + threshold) and new - old > floor:
+                regressions.append(
+                    f"{_baseline_key(row)} {field}: {old:.6g}{unit} -> {new:.6g}{unit} (+{(new / old - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the indicator kernels and the app's hot paths.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000, 100_000])
+    parser.add_argument("--series", type=int, default=100, help="Number of series in the batched run.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--feed-seconds", type=float, default=0.0,
+                        help="Also measure live price feed absorption for this many seconds per subscriber count.")
+    parser.add_argument("--hot-paths", action="store_true",
+                        help="Benchmark the app's hot paths (time and peak memory) instead of the indicator kernels.")
+    parser.add_argument("--hot-path-sizes", type=int, nargs="+", default=[10 ** k for k in range(2, 8)])
+    parser.add_argument("--hot-path-repeat", type=int, default=10,
+                        help="Maximum timed runs per hot-path case (also bounded by a time budget).")
+    parser.add_argument("--cases", nargs="+", help="Only run hot-path cases whose name contains one of these.")
+    parser.add_argument("--baseline", help="Compare hot-path results to this baseline file and exit 1 on regressions.")
+    parser.add_argument("--save-baseline", help="Write hot-path results to this baseline file.")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="Relative time/memory growth counted as a regression.")
+    args = parser.parse_args()
+
+    if args.hot_paths or args.cases or args.baseline or args.save_baseline:
+        main_hot_paths(args)
+        return
+
+    print(f"{'indicator':<18}{'points':>10}{'vectorized':>14}{'naive':>14}{'speedup':>10}{'batch/series':>16}")
+    for row in run_indicator_benchmarks(args.sizes, args.series, args.repeat):
+        speedup = row["naive_s"] / row["vectorized_s"] if row["vectorized_s"] else math.inf
+        print(
+            f"{row['indicator']:<18}{row['points']:>10}"
+            f"{row['vectorized_s'] * 1e3:>12.3f}ms{row['naive_s'] * 1e3:>12.3f}ms"
+            f"{speedup:>9.1f}x{row['batch_s'] / args.series * 1e3:>14.3f}ms"
+        )
+
+    if args.feed_seconds:
+        print(f"\n{'subscribers':<13}{'target/s':>12}{'published/s':>14}{'consumed/s':>14}{'updates/s':>12}{'dropped':>14}")
+        for subscribers in (1, 4, 16):
+            for rate in (10_000, 100_000, 1_000_000):
+                row = price_feed.measure_throughput(rate, args.feed_seconds, n_subscribers=subscribers)
+                print(
+                    f"{subscribers:<13}{rate:>12,}{row['published_ticks_s']:>14,.0f}{row['consumed_ticks_s']:>14,.0f}"
+                    f"{row['view_updates_s']:>12,.0f}{row['dropped_ticks']:>14,}"
+                )
+
+def main_hot_paths(args):
+    print(f"{'case':<26}{'size':>10}{'time':>14}{'per item':>12}{'peak memory':>14}")
+    rows = run_hot_path_benchmarks(args.hot_path_sizes, args.hot_path_repeat, args.cases)
+    for row in rows:
+        print(
+            f"{row['case']:<26}{row['size']:>10}{row['time_s'] * 1e3:>12.3f}ms"
+            f"{row['time_s'] / row['size'] * 1e9:>10.0f}ns{row['peak_bytes'] / 2 ** 20:>12.2f}MB"
+        )
+
+    if args.save_baseline:
+        save_baseline(rows, args.save_baseline)
+        print(f"\nBaseline written to {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_to_baseline(rows, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) past {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"\nNo regressions past {args.threshold:.0%} against {args.baseline}")
+
+if __name__ == "__main__":
+    main()
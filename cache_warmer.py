@@ -0,0 +1,203 @@
+import math
+import threading
+import time
+
+import api_client
+import transport
+import utils
+import worker_pool
+
+# Popularity halves after this long without new requests.
+POPULARITY_HALF_LIFE_SECONDS = 30 * 60
+# Entries kept in the table; the least popular are pruned beyond this.
+POPULARITY_MAX_ENTRIES = 5000
+# Each warm cycle re-runs up to this many of the most popular entries ...
+WARM_TOP_K = 25
+# ... that still have at least this decayed score (about one request within
+# the last half-life).
+WARM_MIN_SCORE = 0.5
+WARM_INTERVAL_SECONDS = 10
+# Warming only spends rate-limit tokens while more than this share of a
+# host's burst is available, so user requests always have headroom.
+WARM_RESERVE_FRACTION = 0.5
+
+class PopularityTable:
+    """
+    Exponentially decaying request counts per (command, query).
+
+    Scores are stored as of their last update and decayed lazily on read, so
+    recording an event is O(1).
+    """
+
+    def __init__(self, half_life: float = POPULARITY_HALF_LIFE_SECONDS, max_entries: int = POPULARITY_MAX_ENTRIES):
+        self.decay_rate = math.log(2) / half_life
+        self.max_entries = max_entries
+        self._scores: dict[tuple[str, str], tuple[float, float]] = {}  # key -> (score, updated_at)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def _decayed(self, score: float, updated_at: float, now: float) -> float:
+        return score * math.exp(-self.decay_rate * (now - updated_at))
+
+    def record(self, command: str, query: str, weight: float = 1.0, now: float | None = None):
+        now = time.time() if now is None else now
+        key = (command, query.strip())
+        with self._lock:
+            score, updated_at = self._scores.get(key, (0.0, now))
+            self._scores[key] = (self._decayed(score, updated_at, now) + weight, now)
+            if len(self._scores) > self.max_entries:
+                self._prune(now)
+
+    def _prune(self, now: float):
+        ranked = sorted(self._scores.items(), key=lambda item: self._decayed(*item[1], now), reverse=True)
+        self._scores = dict(ranked[:self.max_entries * 9 // 10])
+
+    def top(self, limit: int, min_score: float = 0.0, command: str | None = None, now: float | None = None) -> list[tuple[str, str, float]]:
+        """
+        Returns the most popular entries.
+
+        Args:
+            limit (int): The maximum number of entries.
+            min_score (float): Entries with a lower decayed score are left out.
+            command (str | None): Only entries of this command (e.g. "/bop").
+
+        Returns:
+            list[tuple[str, str, float]]: (command, query, score), most popular first.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            items = list(self._scores.items())
+        scored = [
+            (entry_command, query, self._decayed(score, updated_at, now))
+            for (entry_command, query), (score, updated_at) in items
+            if command is None or entry_command == command
+        ]
+        scored = [entry for entry in scored if entry[2] >= min_score]
+        scored.sort(key=lambda entry: entry[2], reverse=True)
+        return scored[:limit]
+
+# --- Warm Specs ---
+# How to re-run each command from the query string it logs: the upstream base
+# URL (for its rate limiter) and a function calling the api_client fetcher.
+
+def _split(query: str) -> tuple[str, str]:
+    first, _, rest = query.partition(" ")
+    return first, rest
+
+def _bop(query: str):
+    symbol, _, days = query.rpartition(" ")
+    return api_client.fetch_ohlc_data(symbol, days)
+
+def _rsi(query: str):
+    symbol, _, days = query.rpartition(" ")
+    return api_client.fetch_market_chart_data(symbol, int(days.rstrip("d")), "daily")
+
+def _boosted(fetch, query: str):
+    tokens, error = fetch()
+    if tokens and query == "enriched":
+        return api_client.enrich_boosted_tokens(tokens)
+    return tokens, error
+
+WARM_SPECS = {
+    "/search": ("coingecko", api_client.fetch_search_data),
+    "/trending": ("coingecko", lambda query: api_client.fetch_trending_data()),
+    "/dominance": ("coingecko", lambda query: api_client.fetch_dominance_data()),
+    "/companies": ("coingecko", api_client.fetch_companies_data),
+    "/categories": ("coingecko", lambda query: api_client.fetch_categories_data()),
+    "/coin_details_name": ("coingecko", api_client.fetch_coin_details_by_name),
+    "/coin_details_address": ("coingecko", lambda query: api_client.fetch_coin_details_by_address(*_split(query))),
+    "/bop": ("coingecko", _bop),
+    "/rsi": ("coingecko", _rsi),
+    "/top_boosted_tokens": ("dexscreener", lambda query: _boosted(api_client.fetch_top_boosted_tokens, query)),
+    "/latest_boosted_tokens": ("dexscreener", lambda query: _boosted(api_client.fetch_latest_boosted_tokens, query)),
+    "/token_orders": ("dexscreener", lambda query: api_client.fetch_token_orders(*_split(query))),
+    "/trade_info": ("dexscreener", api_client.fetch_trade_info),
+    "/trade_info_batch": ("dexscreener", lambda query: api_client.fetch_trade_info_batch(query.split())),
+}
+
+def _base_url(upstream: str) -> str:
+    return api_client.COINGECKO_BASE_URL if upstream == "coingecko" else api_client.DEXSCREENER_BASE_URL
+
+class CacheWarmer:
+    """
+    Re-runs the most popular commands in the background so their upstream
+    responses (and api_client's derived views) stay fresh in the shared
+    caches, spending only spare rate-limit and worker pool capacity.
+    """
+
+    def __init__(self, table: PopularityTable, interval: float = WARM_INTERVAL_SECONDS):
+        self.table = table
+        self.interval = interval
+        self.warmed = 0
+        self.failed = 0
+        self.deferred = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        """
+        Starts the background warm loop (idempotent).
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="cache-warmer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.warm_once()
+            except Exception as e:
+                print(f"Cache warming failed: {e}")
+
+    def _has_spare_capacity(self, upstream: str) -> bool:
+        limiter = transport.get_rate_limiter(_base_url(upstream))
+        return limiter is None or limiter.available() > limiter.burst * WARM_RESERVE_FRACTION
+
+    def warm_once(self) -> int:
+        """
+        Runs one warm cycle over the current top entries.
+
+        Returns:
+            int: The number of entries warmed.
+        """
+        warmed = 0
+        for command, query, _ in self.table.top(WARM_TOP_K, WARM_MIN_SCORE):
+            spec = WARM_SPECS.get(command)
+            if spec is None:
+                continue
+            upstream, warm = spec
+            if not self._has_spare_capacity(upstream):
+                self.deferred += 1
+                continue
+            try:
+                _, error = worker_pool.get_pool().run(lambda: warm(query), priority=worker_pool.BACKGROUND)
+            except worker_pool.Overloaded:
+                self.deferred += 1
+                continue
+            except ValueError:
+                error = "unparseable query"
+            if error:
+                self.failed += 1
+            else:
+                warmed += 1
+        self.warmed += warmed
+        return warmed
+
+_table = PopularityTable()
+_warmer = CacheWarmer(_table)
+utils.add_usage_listener(_table.record)
+
+def get_table() -> PopularityTable:
+    return _table
+
+def get_warmer() -> CacheWarmer:
+    """
+    Returns the process-wide warmer, starting its loop on first use.
+    """
+    _warmer.start()
+    return _warmer
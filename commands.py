@@ -1,15 +1,92 @@
 import streamlit as st
 import utils
 import api_client
+import search_index
+import session_cache
+import snapshot_diff
 import pandas as pd
+import indicators
+import dominance_history
+import export
+import metrics
+import price_feed
+import profiling
+import transport
+import worker_pool
 from datetime import datetime
+import time
 import uuid
+import requests
+
+# Longer horizons keep the standard 14-day RSI period and use the extra
+# history to settle the smoothing.
+RSI_MAX_PERIOD = 14
+
+# Auto-refresh cadence of the live list views, matching their upstream cache
+# lifetimes so a refresh never fetches more often than the data can change.
+TRENDING_REFRESH_SECONDS = api_client.TRENDING_TTL_SECONDS
+CATEGORIES_REFRESH_SECONDS = api_client.CATEGORIES_TTL_SECONDS
+
+# Live views re-read the price feed's ring buffers on this cadence; no HTTP
+# calls are made per update.
+LIVE_REFRESH_SECONDS = 1
+# Ticks each live view reads back from a symbol's buffer.
+LIVE_WINDOW_TICKS = 600
+
+# Streamed results are appended in batches of at most this many items, and
+# at least this often while items keep arriving.
+STREAM_MAX_BATCH_ITEMS = 32
+STREAM_FLUSH_SECONDS = 0.25
+
+# Shown instead of waiting when the worker pool sheds a command's upstream work.
+BUSY_TEXT = "⏳ The dashboard is busy right now, so this is the latest cached data."
+BUSY_NO_CACHE_TEXT = "⏳ The dashboard is busy right now and has no cached data for this yet. Please try again in a moment."
+
+# End-to-end time budget of a command's upstream work, queueing included, by
+# worker pool priority. Steps that cannot finish in time fall back to stale
+# cached data or are left out.
+COMMAND_DEADLINE_SECONDS = {worker_pool.INTERACTIVE: 10.0, worker_pool.LIVE: 3.0}
+SLOW_TEXT = "🐢 Upstream is slow right now, so some of this is older cached data or missing."
 
 coin_name_translations = {
     "bitcoin": "Bitcoin",
     "ethereum": "Ethereum"
 }
 
+def _coin_picker(query: str, key: str) -> str:
+    """
+    Shows ranked matches for a coin query from the local search index, so
+    ambiguous names and symbols can be disambiguated without a `/search` call.
+
+    Args:
+        query (str): The text entered by the user.
+        key (str): The widget key for the selectbox.
+
+    Returns:
+        str: The picked coin id, or the raw query if the index has no match
+             or nothing is picked.
+    """
+    if not query:
+        return query
+    with profiling.phase("resolve"):
+        suggestions = search_index.get_index().suggest(query)
+    if not suggestions:
+        return query
+    labels = {
+        coin["id"]: f"{coin['name']} ({coin['symbol'].upper()}) · Rank #{coin['market_cap_rank']} · ID: {coin['id']}"
+        for coin in suggestions
+    }
+    # Without a market cap rank the order says nothing about which coin is
+    # meant (e.g. before the markets snapshot has loaded), so nothing is
+    # preselected and the query resolves through `/search` unless one is picked.
+    ranked = suggestions[0]["market_cap_rank"] != "N/A"
+    picked = st.selectbox(
+        "Matching coins:", list(labels), index=0 if ranked else None, format_func=labels.get, key=key,
+        placeholder="Best match (via CoinGecko search)",
+    )
+    return picked or query
+
+@metrics.instrument_command
 def display_introduction():
     st.header("👋 Welcome to Pumpies!")
     st.markdown(
@@ -37,98 +114,428 @@ def display_introduction():
         💡 Command Descriptions:
 
         * Search Coin: Pick this to search for a crypto and get basic info like its name, symbol, and market rank.
+        * Live Watchlist: Watch prices and a tick-level RSI update every second from the live price feed.
         * Trending Coins: Choose this to see a list of cryptocurrencies that are currently trending based on market activity.
-        * Market Dominance: This shows how much of the market big cryptos like Bitcoin and Ethereum control.
+        * Market Dominance: This shows how much of the market big cryptos like Bitcoin and Ethereum control, with a chart of how that share has moved over time.
         * Companies Holdings: Get info on companies that hold a lot of specific cryptocurrencies (like Bitcoin or Ethereum).
         * Coin Categories: Shows the top 3 crypto categories based on how their market cap changed in the last 24 hours.
         * Coin Details (by Name): Get detailed info about a coin just by typing its name.
         * Coin Details (by Address): Get detailed info about a coin using its contract address (works for Solana or Ethereum).
-        * Balance of Power (BOP): Calculates the BOP for a crypto over 1, 7, or 14 days. It's about buy/sell pressure.
-        * Relative Strength Index (RSI): Calculates the RSI for a crypto over the last 14 days. Helps see if it's overbought or oversold.
+        * Balance of Power (BOP): Calculates the BOP for a crypto over anything from 1 day to a year. It's about buy/sell pressure.
+        * Relative Strength Index (RSI): Calculates the RSI for a crypto over up to the last year. Helps see if it's overbought or oversold.
         * Top Boosted Tokens: See which tokens are getting the most "boosts" on DexScreener.
         * Latest Boosted Tokens: Check out the newest tokens that have been boosted on DexScreener.
         * Token Orders: Get details about token orders for Ethereum or Solana.
-        * Trade Info: This gives you trading data for a token, like price, volume, and recent transactions.
+        * Trade Info: This gives you trading data for a token, like price, volume, and recent transactions. Tick "Compare several tokens" to get a summary table for a whole basket at once.
 
         Got questions or need more help? Just ask! ☺️
         """
     )
 
+def _has_data(data) -> bool:
+    # DataFrames have no truth value.
+    return not data.empty if isinstance(data, pd.DataFrame) else bool(data)
+
+def _pooled(fetch, priority: int = worker_pool.INTERACTIVE) -> tuple:
+    """
+    Runs a fetch on the shared upstream worker pool, under the priority's
+    `COMMAND_DEADLINE_SECONDS`. If the pool sheds it, the fetch runs here
+    instead, against cached responses only.
+
+    Args:
+        fetch: A callable returning the `(data, error)` tuple of an api_client call.
+        priority (int): The worker pool priority.
+
+    Returns:
+        tuple: `(data, error, notice)`, where `notice` is None, `BUSY_TEXT` if
+               the work was shed (the error is then `BUSY_NO_CACHE_TEXT`), or
+               `SLOW_TEXT` if the deadline left some of the data stale or out.
+    """
+    with transport.deadline(COMMAND_DEADLINE_SECONDS[priority]) as budget:
+        wait = min(worker_pool.QUEUE_WAIT_SECONDS[priority], budget.remaining())
+        try:
+            data, error = worker_pool.get_pool().run(transport.propagate(fetch), utils.get_session_id(), priority, wait)
+        except worker_pool.Overloaded:
+            with transport.cached_only():
+                data, error = fetch()
+            return data, None if _has_data(data) else BUSY_NO_CACHE_TEXT, BUSY_TEXT
+    return data, error, SLOW_TEXT if budget.degraded else None
+
+def _within_deadline(items, seconds: float):
+    # The deadline starts on the thread that drains the items.
+    with transport.deadline(seconds):
+        yield from items
+
+def _pooled_items(items, priority: int = worker_pool.INTERACTIVE) -> tuple:
+    # Like `_pooled` for a streamed iterator: (iterator or list, busy), with
+    # None instead of items when the work was shed and nothing is cached.
+    items = _within_deadline(items, COMMAND_DEADLINE_SECONDS[priority])
+    try:
+        return worker_pool.get_pool().iterate(items, utils.get_session_id(), priority), False
+    except worker_pool.Overloaded:
+        try:
+            with transport.cached_only():
+                return list(items), True
+        except requests.exceptions.RequestException:
+            return None, True
+
+def _run_command(command: str, log_query: str, params: tuple, fetch, spinner_text: str, success_text: str):
+    """
+    Runs a command's fetch on the worker pool under a spinner and keeps a
+    successful result in this session's result store, so later reruns can
+    show it without a refetch.
+
+    Args:
+        command (str): The command name used for logging and as the store key.
+        log_query (str): The query string written to the usage log.
+        params (tuple): The parameters the result is stored under.
+        fetch: A callable returning the `(data, error)` tuple of an api_client call.
+        spinner_text (str): The text shown while fetching.
+        success_text (str): The text shown when the fetch succeeds.
+    """
+    utils.log_command_usage(command, log_query)
+    # Whatever the fetch does besides resolving, fetching and decoding (e.g.
+    # aggregating OHLC rows) is charged to "compute".
+    with st.spinner(spinner_text), profiling.phase("compute"):
+        data, error, notice = _pooled(fetch)
+    if _has_data(data):
+        session_cache.store_result(command, params, data)
+        if notice:
+            st.warning(notice)
+        else:
+            st.success(success_text)
+    elif notice == BUSY_TEXT:
+        st.warning(error)
+    else:
+        st.error(error)
+
+def _export_buttons(key: str, file_stem: str, data, build):
+    """
+    Offers the data behind a panel as Parquet and Arrow downloads.
+
+    A file is only encoded once the user asks for it, into a temporary file
+    kept for this session next to the result it was built from; files over
+    `export.EXPORT_MAX_BYTES` are not offered.
+
+    Args:
+        key (str): Identifies the panel (widget keys).
+        file_stem (str): The download file name without extension.
+        data: The panel's stored result.
+        build: Converts `data` to a `pyarrow.Table` (see `export`).
+    """
+    exports = st.session_state.setdefault("_exports", {})
+    for column, (fmt, (extension, mime)) in zip(st.columns(len(export.FORMATS)), export.FORMATS.items()):
+        widget_key = f"export_{key}_{extension}"
+        prepared = exports.get(widget_key)
+        if prepared is None or prepared[0] is not data:
+            if not column.button(f"📦 Prepare {fmt} export", key=f"{widget_key}_prepare"):
+                continue
+            # Kept together with the result, so a refetched result is never
+            # offered an older file; the replaced file is deleted with it.
+            prepared = exports[widget_key] = (data, export.ExportFile(build(data), fmt))
+        if prepared[1].size > export.EXPORT_MAX_BYTES:
+            column.warning(f"The {fmt} file is {prepared[1].size / 2**20:.0f} MB, over the "
+                           f"{export.EXPORT_MAX_BYTES / 2**20:.0f} MB export limit.")
+            continue
+        with prepared[1].open() as file:
+            column.download_button(
+                f"⬇️ Download {fmt}", file, file_name=f"{file_stem}.{extension}", mime=mime, key=widget_key,
+            )
+
+def _render_items(title: str, items: list, item_markdown):
+    st.markdown(title + "\n" + "".join(item_markdown(item) for item in items))
+
+def _stream_command(
+    command: str, log_query: str, params: tuple, stream, title: str, item_markdown,
+    empty_text: str, success_text: str,
+) -> bool:
+    """
+    Like `_run_command` for multi-item results (read on the worker pool too),
+    but renders items while they are still arriving: the first item as soon as it is decoded, then batches
+    that double in size up to `STREAM_MAX_BATCH_ITEMS` (or whatever arrived
+    within `STREAM_FLUSH_SECONDS`), each appended below the previous ones.
+
+    Args:
+        command (str): The command name used for logging and as the store key.
+        log_query (str): The query string written to the usage log.
+        params (tuple): The parameters the complete result is stored under.
+        stream: A callable returning `(iterator of items | None, error | None)`;
+                the iterator may raise `requests` exceptions.
+        title (str): Markdown shown above the items.
+        item_markdown: Renders one item as markdown.
+        empty_text (str): The error shown when there are no items.
+        success_text (str): The text shown once every item has arrived.
+
+    Returns:
+        bool: Whether the items were rendered (and stored).
+    """
+    utils.log_command_usage(command, log_query)
+    items, error = stream()
+    if error:
+        st.error(error)
+        return False
+    items, busy = _pooled_items(items)
+    if items is None:
+        st.warning(BUSY_NO_CACHE_TEXT)
+        return False
+
+    container = st.container()
+    received, pending = [], []
+
+    def flush():
+        if len(received) == len(pending):
+            container.markdown(title)
+        container.markdown("".join(pending))
+        pending.clear()
+
+    batch_size, flushed_at = 1, time.perf_counter()
+    try:
+        with st.spinner("Loading..."):
+            for item in items:
+                received.append(item)
+                pending.append(item_markdown(item))
+                if len(pending) >= batch_size or time.perf_counter() - flushed_at >= STREAM_FLUSH_SECONDS:
+                    flush()
+                    flushed_at = time.perf_counter()
+                    batch_size = min(batch_size * 2, STREAM_MAX_BATCH_ITEMS)
+    except requests.exceptions.RequestException as e:
+        st.error(f"An error occurred while fetching data: {e}")
+        return False
+    if not received:
+        st.error(empty_text)
+        return False
+    if pending:
+        flush()
+    session_cache.store_result(command, params, received)
+    if busy:
+        st.warning(BUSY_TEXT)
+    else:
+        st.success(success_text)
+    return True
+
+@metrics.instrument_command
 def display_search_coin():
     st.header("🔎 Search for a Coin")
     coin_query = st.text_input("Enter coin name or symbol (e.g., bitcoin, btc)", key="search_input")
+    coin_choice = _coin_picker(coin_query, key="search_pick")
     # Removed st.columns and with block
     if st.button("Search"):
         if coin_query:
-            utils.log_command_usage("/search", coin_query)
-            with st.spinner(f"Searching for {coin_query}..."):
-                data, error = api_client.fetch_search_data(coin_query)
-                if data:
-                    st.success("Search results found!")
-                    st.markdown(f"""
-                        🔎 Search Results
-                        - ID: `{data['coin_id']}`
-                        - Name: *{data['name']}*
-                        - Market Rank: #{data['market_cap_rank']}
-                        - Symbol: `{data['symbol'].upper()}`
-
-                        Price Details (USD):
-                        - Current Price: `${data['usd_price']:,.10f}`
-                        - Market Cap: `${data['usd_market_cap']:,.2f}`
-                        - 24h Trading Volume: `${data['usd_24h_vol']:,.2f}`
-                        - 24h Change: `{data['usd_24h_change']:.2f}%`
-                    """)
-                else:
-                    st.error(error)
+            _run_command(
+                "/search", coin_query, (coin_choice,),
+                lambda: api_client.fetch_search_data(coin_choice),
+                f"Searching for {coin_query}...",
+                "Search results found!",
+            )
         else:
             st.warning("Please enter a coin name or symbol to search.")
 
+    data = session_cache.get_result("/search", (coin_choice,)) if coin_choice else None
+    if data:
+        st.markdown(f"""
+            🔎 Search Results
+            - ID: `{data['coin_id']}`
+            - Name: *{data['name']}*
+            - Market Rank: #{data['market_cap_rank']}
+            - Symbol: `{data['symbol'].upper()}`
+
+            Price Details (USD):
+            - Current Price: `{_number(data['usd_price'], "${:,.10f}")}`
+            - Market Cap: `{_number(data['usd_market_cap'], "${:,.2f}")}`
+            - 24h Trading Volume: `{_number(data['usd_24h_vol'], "${:,.2f}")}`
+            - 24h Change: `{_number(data['usd_24h_change'], "{:.2f}%")}`
+        """)
+
+def _number(value, template: str) -> str:
+    # "N/A" (e.g. a price left out under a deadline) is shown as is.
+    return template.format(value) if isinstance(value, (int, float)) else str(value)
+
+def _change_badges(diff: snapshot_diff.SnapshotDiff) -> dict:
+    badges = {key: " 🆕" for key, _ in diff.entered}
+    for key, old_rank, new_rank in diff.moved:
+        badges[key] = f" 🔼{old_rank - new_rank}" if new_rank < old_rank else f" 🔽{new_rank - old_rank}"
+    return badges
+
+def _render_snapshot_changes(diff: snapshot_diff.SnapshotDiff, names: dict):
+    if diff.is_first:
+        return
+    if not diff.has_changes:
+        st.caption(f"No changes in the last update ({diff.detected_at.strftime('%H:%M:%S')}).")
+        return
+    lines = []
+    if diff.entered:
+        lines.append("- 🆕 New: " + ", ".join(f"*{names.get(key, key)}* (#{rank})" for key, rank in diff.entered))
+    if diff.moved:
+        lines.append("- ↕️ Moved: " + ", ".join(
+            f"*{names.get(key, key)}* #{old_rank} → #{new_rank}" for key, old_rank, new_rank in diff.moved
+        ))
+    if diff.dropped:
+        lines.append("- ❌ Dropped: " + ", ".join(f"`{key}` (was #{rank})" for key, rank in diff.dropped))
+    if diff.updated:
+        lines.append(f"- 🔄 Updated in place: {len(diff.updated)}")
+    st.markdown(f"Changes in the last update ({diff.detected_at.strftime('%H:%M:%S')}):\n" + "\n".join(lines))
+
+def _row_slots(key: str, live: bool):
+    # Called in the full script run, outside the live fragment. Streamlit keeps
+    # what a fragment writes into containers created outside it across its
+    # reruns, so the rows of a live list go into placeholders created here and
+    # a rerun only sends the rows whose text changed (`_write_rows`).
+    if live:
+        st.session_state[f"_rows_{key}"] = {"container": st.container(), "placeholders": [], "shown": []}
+    else:
+        st.session_state.pop(f"_rows_{key}", None)
+
+def _write_rows(key: str, rows: list[str]):
+    slots = st.session_state.get(f"_rows_{key}")
+    if slots is None:
+        st.markdown("".join(rows))
+        return
+    placeholders, shown = slots["placeholders"], slots["shown"]
+    while len(placeholders) < len(rows):
+        placeholders.append(slots["container"].empty())
+        shown.append(None)
+    for index, placeholder in enumerate(placeholders):
+        text = rows[index] if index < len(rows) else None
+        if text == shown[index]:
+            continue
+        if text is None:
+            placeholder.empty()
+        else:
+            placeholder.markdown(text)
+        shown[index] = text
+
+def _live_view(command: str, fetch, render):
+    # Refetches through the response cache on every fragment run; api_client
+    # returns the identical list while upstream is unchanged, which the
+    # snapshot tracker then diffs in O(1). Shed refreshes keep the last data.
+    data, error, notice = _pooled(fetch, worker_pool.LIVE)
+    if data:
+        session_cache.store_result(command, (), data)
+    elif notice != BUSY_TEXT:
+        st.error(error)
+    if notice:
+        st.caption(notice)
+    render()
+
+def _show_trending():
+    data = session_cache.get_result("/trending", ())
+    if data:
+        diff = snapshot_diff.get_tracker().update("/trending", data, key="id")
+        _render_snapshot_changes(diff, {coin["id"]: coin["name"] for coin in data})
+        badges = _change_badges(diff)
+        rows = ["🔥 Trending Tokens:\n\n"]
+        for coin in data:
+            rows.append(
+                f"- Name: *{coin['name']}*{badges.get(coin['id'], '')}\n"
+                f"- Symbol: `{coin['symbol'].upper()}`\n"
+                f"- Rank: #{coin['rank']}\n"
+                f"- Current Price: `${coin['usd_price']}`\n"
+                f"- Market Cap: `{coin['market_cap']}`\n"
+                f"- Market Cap (BTC): `{coin['market_cap_btc']} BTC`\n"
+                f"- Total Volume (USD): `{coin['total_volume']}`\n"
+                f"- Total Volume (BTC): `{coin['total_volume_btc']} BTC`\n"
+                "---------------------------\n"
+            )
+        _write_rows("trending", rows)
+
+@st.experimental_fragment(run_every=TRENDING_REFRESH_SECONDS)
+def _live_trending():
+    _live_view("/trending", api_client.fetch_trending_data, _show_trending)
+
+@metrics.instrument_command
 def display_trending_coins():
     st.header("🔥 Trending Cryptocurrencies")
+    auto_refresh = st.checkbox(f"Auto-refresh every {TRENDING_REFRESH_SECONDS}s", key="trending_auto_refresh")
     # Removed st.columns and with block
     if st.button("Get Trending Coins"):
-        utils.log_command_usage("/trending", "")
-        with st.spinner("Fetching trending coins..."):
-            data, error = api_client.fetch_trending_data()
-            if data:
-                st.success("Trending coins fetched successfully!")
-                message = "🔥 Trending Tokens:\n\n"
-                for coin in data:
-                    message += (
-                        f"- Name: *{coin['name']}*\n"
-                        f"- Symbol: `{coin['symbol'].upper()}`\n"
-                        f"- Rank: #{coin['rank']}\n"
-                        f"- Current Price: `${coin['usd_price']}`\n"
-                        f"- Market Cap: `{coin['market_cap']}`\n"
-                        f"- Market Cap (BTC): `{coin['market_cap_btc']} BTC`\n"
-                        f"- Total Volume (USD): `{coin['total_volume']}`\n"
-                        f"- Total Volume (BTC): `{coin['total_volume_btc']} BTC`\n"
-                        "---------------------------\n"
-                    )
-                st.markdown(message)
-            else:
-                st.error(error)
+        _run_command(
+            "/trending", "", (),
+            api_client.fetch_trending_data,
+            "Fetching trending coins...",
+            "Trending coins fetched successfully!",
+        )
 
+    _row_slots("trending", auto_refresh)
+    if auto_refresh:
+        _live_trending()
+    else:
+        _show_trending()
+
+@metrics.instrument_command
 def display_market_dominance():
     st.header("📊 Crypto Market Dominance")
     # Removed st.columns and with block
     if st.button("Get Dominance Data"):
-        utils.log_command_usage("/dominance", "")
-        with st.spinner("Fetching market dominance data..."):
-            data, error = api_client.fetch_dominance_data()
-            if data:
-                st.success("Market dominance data fetched successfully!")
-                st.markdown(f"""
-                    📊 Crypto Market Dominance
-                    - Active Cryptocurrencies: `{data['active_cryptocurrencies']}`
-                    - BTC Dominance: `{data['btc_dominance']:.2f}%`
-                    - ETH Dominance: `{data['eth_dominance']:.2f}%`
-                    - USDT Dominance: `{data['usdt_dominance']:.2f}%`
-                    - 24h Market Cap Change: `{data['market_cap_change_24h']:.2f}%`
-                """)
-            else:
-                st.error(error)
+        _run_command(
+            "/dominance", "", (),
+            api_client.fetch_dominance_data,
+            "Fetching market dominance data...",
+            "Market dominance data fetched successfully!",
+        )
+
+    data = session_cache.get_result("/dominance", ())
+    if data:
+        st.markdown(f"""
+            📊 Crypto Market Dominance
+            - Active Cryptocurrencies: `{data['active_cryptocurrencies']}`
+            - BTC Dominance: `{data['btc_dominance']:.2f}%`
+            - ETH Dominance: `{data['eth_dominance']:.2f}%`
+            - USDT Dominance: `{data['usdt_dominance']:.2f}%`
+            - 24h Market Cap Change: `{data['market_cap_change_24h']:.2f}%`
+        """)
+
+    _display_dominance_history()
+
+DOMINANCE_HISTORY_SPANS = {
+    "1 hour": 3600,
+    "1 day": 86400,
+    "1 week": 7 * 86400,
+    "30 days": 30 * 86400,
+    "90 days": 90 * 86400,
+    "1 year": 365 * 86400,
+}
 
+def _display_dominance_history():
+    st.subheader("📈 Dominance History")
+    span_label = st.selectbox("Span:", list(DOMINANCE_HISTORY_SPANS), index=1, key="dominance_history_span")
+    history = dominance_history.get_history()
+    table, resolution, total = history.chart_data(
+        ("btc_dominance", "eth_dominance", "usdt_dominance"), DOMINANCE_HISTORY_SPANS[span_label]
+    )
+    if len(table) < 2:
+        st.info("Dominance history is still being collected; check back in a few minutes.")
+        return
+    st.line_chart(
+        table.rename(columns={"btc_dominance": "BTC %", "eth_dominance": "ETH %", "usdt_dominance": "USDT %"})
+    )
+    started = datetime.fromtimestamp(history.started_at).strftime("%Y-%m-%d %H:%M")
+    st.caption(
+        f"Sampled every {history.interval:.0f}s since {started} ({history.samples} samples). "
+        f"Showing {len(table)} of {total} {resolution} averages."
+    )
+
+# Sortable columns of the companies table: label -> (column, largest first by default).
+COMPANY_SORT_COLUMNS = {
+    "Holdings": ("total_holdings", True),
+    "Current Value (USD)": ("total_current_value_usd", True),
+    "% of Total Supply": ("percentage_of_total_supply", True),
+    "Name": ("name", False),
+    "Country": ("country", False),
+}
+COMPANY_PAGE_SIZES = (10, 25, 50, 100)
+COMPANY_COLUMN_CONFIG = {
+    "holdings_rank": st.column_config.NumberColumn("Rank"),
+    "name": "Name",
+    "symbol": "Symbol",
+    "country": "Country",
+    "total_holdings": st.column_config.NumberColumn("Holdings", format="%.2f"),
+    "total_entry_value_usd": st.column_config.NumberColumn("Entry Value (USD)", format="$%.0f"),
+    "total_current_value_usd": st.column_config.NumberColumn("Current Value (USD)", format="$%.0f"),
+    "percentage_of_total_supply": st.column_config.NumberColumn("% of Total Supply", format="%.4f%%"),
+    "share_of_holdings": st.column_config.NumberColumn("Share of Listed Holdings", format="%.4f"),
+}
+
+@metrics.instrument_command
 def display_companies_holdings(coin_translations):
     st.header("🏦 Companies Public Treasury Holdings")
     company_coin_choice = st.selectbox(
@@ -139,124 +546,186 @@ def display_companies_holdings(coin_translations):
     translated_coin_name = coin_translations.get(company_coin_choice, company_coin_choice.capitalize())
     # Removed st.columns and with block
     if st.button("Get Companies Data"):
-        utils.log_command_usage("/companies", company_coin_choice)
-        with st.spinner(f"Fetching companies holding {translated_coin_name}..."):
-            data, error = api_client.fetch_companies_data(company_coin_choice)
-            if data:
-                st.success(f"Companies holding {translated_coin_name} fetched successfully!")
-                message = (
-                    f"🏦 Companies Holding {translated_coin_name} 🏦\n"
-                    f"- Total Holdings: `{data['total_holdings']}`\n"
-                    f"- Total Value (USD): `${data['total_value_usd']:,.2f}`\n"
-                    f"- Market Cap Dominance: `{data['market_cap_dominance']}%`\n\n"
-                    f"Top Companies:\n\n"
-                )
-                for company in data['companies']:
-                    message += (
-                        f"- Name: *{company.get('name', 'N/A')}* ({company.get('symbol', 'N/A')})\n"
-                        f"- Country: `{company.get('country', 'N/A')}`\n"
-                        f"- Holdings: `{company.get('total_holdings', 'N/A')}`\n"
-                        f"- Current Value (USD): `${company.get('total_current_value_usd', 'N/A'):,.2f}`\n"
-                        f"- % of Total Supply: `{company.get('percentage_of_total_supply', 'N/A')}%`\n"
-                        "---------------------------\n"
-                    )
-                st.markdown(message)
-            else:
-                st.error(error)
+        _run_command(
+            "/companies", company_coin_choice, (company_coin_choice,),
+            lambda: api_client.fetch_companies_data(company_coin_choice),
+            f"Fetching companies holding {translated_coin_name}...",
+            f"Companies holding {translated_coin_name} fetched successfully!",
+        )
+
+    data = session_cache.get_result("/companies", (company_coin_choice,))
+    if data:
+        st.markdown(
+            f"🏦 Companies Holding {translated_coin_name} 🏦\n"
+            f"- Total Holdings: `{data['total_holdings']}`\n"
+            f"- Total Value (USD): `${data['total_value_usd']:,.2f}`\n"
+            f"- Market Cap Dominance: `{data['market_cap_dominance']}%`\n"
+            f"- Companies: `{len(data['companies'])}`"
+        )
+        concentration = data["concentration"]
+        columns = st.columns(len(concentration["top_shares"]) + 1)
+        for column, (k, share) in zip(columns, concentration["top_shares"].items()):
+            column.metric(f"Top {k} share", f"{share:.1%}")
+        columns[-1].metric("HHI", f"{concentration['hhi']:,.0f}", help="Sum of squared percentage shares of listed holdings (10,000 = one holder).")
+        with st.expander(f"Totals by country ({len(data['countries'])})"):
+            st.dataframe(data["countries"], hide_index=True, use_container_width=True, column_config=COMPANY_COLUMN_CONFIG)
+        _display_companies_table(data["companies"])
+        _export_buttons("companies", f"companies_{company_coin_choice}", data, export.companies_table)
+
+def _display_companies_table(table: pd.DataFrame):
+    # Sorting, filtering and paging all work on the stored table, so they
+    # never go back upstream.
+    sort_column, filter_column, search_column = st.columns(3)
+    sort_label = sort_column.selectbox("Sort by:", tuple(COMPANY_SORT_COLUMNS), key="companies_sort")
+    countries = filter_column.multiselect("Countries:", sorted(table["country"].unique()), key="companies_countries")
+    search = search_column.text_input("Name or symbol contains:", key="companies_search").strip()
+
+    mask = pd.Series(True, index=table.index)
+    if countries:
+        mask &= table["country"].isin(countries)
+    if search:
+        mask &= (
+            table["name"].str.contains(search, case=False, regex=False)
+            | table["symbol"].str.contains(search, case=False, regex=False)
+        )
+    column, descending = COMPANY_SORT_COLUMNS[sort_label]
+    view = table[mask].sort_values(column, ascending=not descending, na_position="last", kind="stable")
+
+    size_column, page_column = st.columns(2)
+    page_size = size_column.selectbox("Rows per page:", COMPANY_PAGE_SIZES, index=1, key="companies_page_size")
+    pages = max(1, -(-len(view) // page_size))
+    page = page_column.number_input("Page:", min_value=1, max_value=pages, value=1, step=1, key="companies_page")
+    page = min(int(page), pages)
+    first = (page - 1) * page_size
+    st.dataframe(
+        view.iloc[first:first + page_size],
+        hide_index=True,
+        use_container_width=True,
+        column_order=tuple(COMPANY_COLUMN_CONFIG),
+        column_config=COMPANY_COLUMN_CONFIG,
+    )
+    st.caption(f"Showing {min(first + 1, len(view))}–{min(first + page_size, len(view))} of {len(view)} companies (page {page} of {pages}).")
+
+def _show_categories():
+    data = session_cache.get_result("/categories", ())
+    if data:
+        diff = snapshot_diff.get_tracker().update("/categories", data, key="id")
+        _render_snapshot_changes(diff, {category.get("id"): category.get("name", "N/A") for category in data})
+        badges = _change_badges(diff)
+        rows = ["🏅 Top 3 Coin Categories (by 24h Market Cap Change) 🏅\n\n"]
+        for category in data:
+            name = category.get("name", "N/A")
+            market_cap = category.get("market_cap", 0)
+            market_cap_change = category.get("market_cap_change_24h", 0)
+            top_3_coins_id = category.get("top_3_coins_id", [])
+
+            rows.append(
+                f"- Category Name: `{name}`{badges.get(category.get('id'), '')}\n"
+                f"- Market Cap: `${market_cap:,.2f}`\n"
+                f"- 24h Change: `{market_cap_change:.2f}%`\n"
+                f"- Top 3 Tokens: `{', '.join(top_3_coins_id) if top_3_coins_id else 'N/A'}`\n"
+                "------------------------------------\n"
+            )
+        _write_rows("categories", rows)
+        _export_buttons("categories", "categories", data, export.categories_table)
+
+@st.experimental_fragment(run_every=CATEGORIES_REFRESH_SECONDS)
+def _live_categories():
+    _live_view("/categories", api_client.fetch_categories_data, _show_categories)
 
+@metrics.instrument_command
 def display_coin_categories():
     st.header("🏅 Top Coin Categories")
+    auto_refresh = st.checkbox(f"Auto-refresh every {CATEGORIES_REFRESH_SECONDS}s", key="categories_auto_refresh")
     # Removed st.columns and with block
     if st.button("Get Categories"):
-        utils.log_command_usage("/categories", "")
-        with st.spinner("Fetching top coin categories..."):
-            data, error = api_client.fetch_categories_data()
-            if data:
-                st.success("Coin categories fetched successfully!")
-                message = "🏅 Top 3 Coin Categories (by 24h Market Cap Change) 🏅\n\n"
-                for category in data:
-                    name = category.get("name", "N/A")
-                    market_cap = category.get("market_cap", 0)
-                    market_cap_change = category.get("market_cap_change_24h", 0)
-                    top_3_coins_id = category.get("top_3_coins_id", [])
-
-                    message += (
-                        f"- Category Name: `{name}`\n"
-                        f"- Market Cap: `${market_cap:,.2f}`\n"
-                        f"- 24h Change: `{market_cap_change:.2f}%`\n"
-                        f"- Top 3 Tokens: `{', '.join(top_3_coins_id) if top_3_coins_id else 'N/A'}`\n"
-                        "------------------------------------\n"
-                    )
-                st.markdown(message)
-            else:
-                st.error(error)
+        _run_command(
+            "/categories", "", (),
+            api_client.fetch_categories_data,
+            "Fetching top coin categories...",
+            "Coin categories fetched successfully!",
+        )
+
+    _row_slots("categories", auto_refresh)
+    if auto_refresh:
+        _live_categories()
+    else:
+        _show_categories()
+
+def _render_coin_details(data: dict):
+    description = data.get("description", {}).get("en", "No description available.")
+    truncated_description = description[:500] + "..." if len(description) > 500 else description
+
+    tickers = data.get("tickers", [])
+    first_ticker_info = {}
+    if tickers:
+        first_ticker = tickers[0]
+        first_ticker_info = {
+            "base": first_ticker.get("base"),
+            "target": first_ticker.get("target"),
+            "market_name": first_ticker.get("market", {}).get("name"),
+            "converted_last_usd": first_ticker.get("converted_last", {}).get("usd"),
+            "converted_volume_usd": first_ticker.get("converted_volume", {}).get("usd"),
+            "trust_score": first_ticker.get("trust_score"),
+            "trade_url": first_ticker.get("trade_url"),
+        }
+
+    st.markdown(f"""
+        🪙 Coin Details 🪙
+
+        - Name: `{data.get('name')} ({data.get('symbol', '').upper()})`
+        - Platform: `{data.get('asset_platform_id', 'N/A')}`
+
+        - Sentiment Upvotes: `{data.get('sentiment_votes_up_percentage', 'N/A')}%`
+        - Sentiment Downvotes: `{data.get('sentiment_votes_down_percentage', 'N/A')}%`
+        - Watchlist Users: `{data.get('watchlist_portfolio_users', 'N/A')}`
+
+        Description: {truncated_description}
+
+        Market Information 📊
+
+        - Current Price (USD): `${data.get('market_data', {}).get('current_price', {}).get('usd', 0):,.4f}`
+        - Total Supply (#): `{data.get('market_data', {}).get('total_supply', 'N/A')}`
+        - Max Supply (#): `{data.get('market_data', {}).get('max_supply', 'N/A')}`
+        - Circulating Supply (#): `{data.get('market_data', {}).get('circulating_supply', 'N/A')}`
+        - Market Cap (USD): `${data.get('market_data', {}).get('market_cap', {}).get('usd', 0):,.2f}`
+        - All-Time High (USD): `${data.get('market_data', {}).get('ath', {}).get('usd', 0):,.8f}`
+        - All-Time Low (USD): `${data.get('market_data', {}).get('atl', {}).get('usd', 0):,.8f}`
+        - 24h Price Change: `{data.get('market_data', {}).get('price_change_percentage_24h', 0):.4f}%`
+
+        🏛️ Top Exchange Information 🏛️
+
+        - Exchange Name: `{first_ticker_info.get('market_name', 'N/A')}`
+        - Base - Token Address: `{first_ticker_info.get('base', 'N/A')}`
+        - Target Token Address: `{first_ticker_info.get('target', 'N/A')}`
+        - Last Price (USD): `${first_ticker_info.get('converted_last_usd', 0):,.8f}`
+        - Volume (USD): `${first_ticker_info.get('converted_volume_usd', 0):,.2f}`
+        - Trust Score (Exchange): `{first_ticker_info.get('trust_score', 'N/A')}`
+        {f"- [Trade Now]({first_ticker_info['trade_url']})" if first_ticker_info.get('trade_url') else ""}
+    """)
 
+@metrics.instrument_command
 def display_coin_details_by_name():
     st.header("🪙 Coin Details by Name/Symbol")
     coin_name_query = st.text_input("Enter coin name or symbol (e.g., btc, ethereum)", key="coin_details_name_input")
+    coin_choice = _coin_picker(coin_name_query, key="coin_details_name_pick")
     # Removed st.columns and with block
     if st.button("Get Details by Name"):
         if coin_name_query:
-            utils.log_command_usage("/coin_details_name", coin_name_query)
-            with st.spinner(f"Fetching details for {coin_name_query}..."):
-                data, error = api_client.fetch_coin_details_by_name(coin_name_query)
-                if data:
-                    st.success(f"Details for {coin_name_query} fetched successfully!")
-                    description = data.get("description", {}).get("en", "No description available.")
-                    truncated_description = description[:500] + "..." if len(description) > 500 else description
-
-                    tickers = data.get("tickers", [])
-                    first_ticker_info = {}
-                    if tickers:
-                        first_ticker = tickers[0]
-                        first_ticker_info = {
-                            "base": first_ticker.get("base"),
-                            "target": first_ticker.get("target"),
-                            "market_name": first_ticker.get("market", {}).get("name"),
-                            "converted_last_usd": first_ticker.get("converted_last", {}).get("usd"),
-                            "converted_volume_usd": first_ticker.get("converted_volume", {}).get("usd"),
-                            "trust_score": first_ticker.get("trust_score"),
-                            "trade_url": first_ticker.get("trade_url"),
-                        }
-
-                    st.markdown(f"""
-                        🪙 Coin Details 🪙
-
-                        - Name: `{data.get('name')} ({data.get('symbol', '').upper()})`
-                        - Platform: `{data.get('asset_platform_id', 'N/A')}`
-
-                        - Sentiment Upvotes: `{data.get('sentiment_votes_up_percentage', 'N/A')}%`
-                        - Sentiment Downvotes: `{data.get('sentiment_votes_down_percentage', 'N/A')}%`
-                        - Watchlist Users: `{data.get('watchlist_portfolio_users', 'N/A')}`
-
-                        Description: {truncated_description}
-
-                        Market Information 📊
-
-                        - Current Price (USD): `${data.get('market_data', {}).get('current_price', {}).get('usd', 0):,.4f}`
-                        - Total Supply (#): `{data.get('market_data', {}).get('total_supply', 'N/A')}`
-                        - Max Supply (#): `{data.get('market_data', {}).get('max_supply', 'N/A')}`
-                        - Circulating Supply (#): `{data.get('market_data', {}).get('circulating_supply', 'N/A')}`
-                        - Market Cap (USD): `${data.get('market_data', {}).get('market_cap', {}).get('usd', 0):,.2f}`
-                        - All-Time High (USD): `${data.get('market_data', {}).get('ath', {}).get('usd', 0):,.8f}`
-                        - All-Time Low (USD): `${data.get('market_data', {}).get('atl', {}).get('usd', 0):,.8f}`
-                        - 24h Price Change: `{data.get('market_data', {}).get('price_change_percentage_24h', 0):.4f}%`
-
-                        🏛️ Top Exchange Information 🏛️
-
-                        - Exchange Name: `{first_ticker_info.get('market_name', 'N/A')}`
-                        - Base - Token Address: `{first_ticker_info.get('base', 'N/A')}`
-                        - Target Token Address: `{first_ticker_info.get('target', 'N/A')}`
-                        - Last Price (USD): `${first_ticker_info.get('converted_last_usd', 0):,.8f}`
-                        - Volume (USD): `${first_ticker_info.get('converted_volume_usd', 0):,.2f}`
-                        - Trust Score (Exchange): `{first_ticker_info.get('trust_score', 'N/A')}`
-                        {f"- [Trade Now]({first_ticker_info['trade_url']})" if first_ticker_info.get('trade_url') else ""}
-                    """)
-                else:
-                    st.error(error)
+            _run_command(
+                "/coin_details_name", coin_name_query, (coin_choice,),
+                lambda: api_client.fetch_coin_details_by_name(coin_choice),
+                f"Fetching details for {coin_name_query}...",
+                f"Details for {coin_name_query} fetched successfully!",
+            )
         else:
             st.warning("Please enter a coin name or symbol.")
 
+    data = session_cache.get_result("/coin_details_name", (coin_choice,)) if coin_choice else None
+    if data:
+        _render_coin_details(data)
+
+@metrics.instrument_command
 def display_coin_details_by_address():
     st.header("🪙 Coin Details by Contract Address")
     platform_address = st.selectbox(
@@ -265,178 +734,248 @@ def display_coin_details_by_address():
         key="platform_address_select"
     )
     contract_address_input = st.text_input("Enter Contract Address (e.g., 0x...)", key="contract_address_input")
+    params = (platform_address, contract_address_input)
     # Removed st.columns and with block
     if st.button("Get Details by Address"):
         if contract_address_input:
-            utils.log_command_usage("/coin_details_address", f"{platform_address} {contract_address_input}")
-            with st.spinner(f"Fetching details for {contract_address_input} on {platform_address}..."):
-                data, error = api_client.fetch_coin_details_by_address(platform_address, contract_address_input)
-                if data:
-                    st.success(f"Details for {contract_address_input} fetched successfully!")
-                    description = data.get("description", {}).get("en", "No description available.")
-                    truncated_description = description[:500] + "..." if len(description) > 500 else description
-
-                    tickers = data.get("tickers", [])
-                    first_ticker_info = {}
-                    if tickers:
-                        first_ticker = tickers[0]
-                        first_ticker_info = {
-                            "base": first_ticker.get("base"),
-                            "target": first_ticker.get("target"),
-                            "market_name": first_ticker.get("market", {}).get("name"),
-                            "converted_last_usd": first_ticker.get("converted_last", {}).get("usd"),
-                            "converted_volume_usd": first_ticker.get("converted_volume", {}).get("usd"),
-                            "trust_score": first_ticker.get("trust_score"),
-                            "trade_url": first_ticker.get("trade_url"),
-                        }
-
-                    st.markdown(f"""
-                        🪙 Coin Details 🪙
-
-                        - Name: `{data.get('name')} ({data.get('symbol', '').upper()})`
-                        - Platform: `{data.get('asset_platform_id', 'N/A')}`
-
-                        - Sentiment Upvotes: `{data.get('sentiment_votes_up_percentage', 'N/A')}%`
-                        - Sentiment Downvotes: `{data.get('sentiment_votes_down_percentage', 'N/A')}%`
-                        - Watchlist Users: `{data.get('watchlist_portfolio_users', 'N/A')}`
-
-                        Description: {truncated_description}
-
-                        Market Information 📊
-
-                        - Current Price (USD): `${data.get('market_data', {}).get('current_price', {}).get('usd', 0):,.4f}`
-                        - Total Supply (#): `{data.get('market_data', {}).get('total_supply', 'N/A')}`
-                        - Max Supply (#): `{data.get('market_data', {}).get('max_supply', 'N/A')}`
-                        - Circulating Supply (#): `{data.get('market_data', {}).get('circulating_supply', 'N/A')}`
-                        - Market Cap (USD): `${data.get('market_data', {}).get('market_cap', {}).get('usd', 0):,.2f}`
-                        - All-Time High (USD): `${data.get('market_data', {}).get('ath', {}).get('usd', 0):,.8f}`
-                        - All-Time Low (USD): `${data.get('market_data', {}).get('atl', {}).get('usd', 0):,.8f}`
-                        - 24h Price Change: `{data.get('market_data', {}).get('price_change_percentage_24h', 0):.4f}%`
-
-                        🏛️ Top Exchange Information 🏛️
-
-                        - Exchange Name: `{first_ticker_info.get('market_name', 'N/A')}`
-                        - Base - Token Address: `{first_ticker_info.get('base', 'N/A')}`
-                        - Target Token Address: `{first_ticker_info.get('target', 'N/A')}`
-                        - Last Price (USD): `${first_ticker_info.get('converted_last_usd', 0):,.8f}`
-                        - Volume (USD): `${first_ticker_info.get('converted_volume_usd', 0):,.2f}`
-                        - Trust Score (Exchange): `{first_ticker_info.get('trust_score', 'N/A')}`
-                        {f"- [Trade Now]({first_ticker_info['trade_url']})" if first_ticker_info.get('trade_url') else ""}
-                    """)
-                else:
-                    st.error(error)
+            _run_command(
+                "/coin_details_address", f"{platform_address} {contract_address_input}", params,
+                lambda: api_client.fetch_coin_details_by_address(platform_address, contract_address_input),
+                f"Fetching details for {contract_address_input} on {platform_address}...",
+                f"Details for {contract_address_input} fetched successfully!",
+            )
         else:
             st.warning("Please enter a contract address.")
 
+    data = session_cache.get_result("/coin_details_address", params) if contract_address_input else None
+    if data:
+        _render_coin_details(data)
+
+@metrics.instrument_command
 def display_bop():
     st.header("📊 Balance of Power (BOP)")
     bop_coin_symbol = st.text_input("Enter coin symbol (e.g., btc)", key="bop_coin_input")
-    bop_days = st.selectbox("Select days:", ("1", "7", "14"), key="bop_days_select")
+    bop_coin_choice = _coin_picker(bop_coin_symbol, key="bop_coin_pick")
+    bop_days = st.selectbox("Select days:", ("1", "7", "14", "30", "90", "180", "365"), key="bop_days_select")
+    params = (bop_coin_choice, bop_days)
     # Removed st.columns and with block
     if st.button("Calculate BOP"):
         if bop_coin_symbol:
-            utils.log_command_usage("/bop", f"{bop_coin_symbol} {bop_days}")
-            with st.spinner(f"Calculating BOP for {bop_coin_symbol} over {bop_days} days..."):
-                data, error = api_client.fetch_ohlc_data(bop_coin_symbol, bop_days)
-                if data:
-                    st.success(f"BOP for {bop_coin_symbol} calculated successfully!")
-                    message = f"📊 Overall Buy/Sell Pressure (BOP) for {data['name']} ({bop_days}-day OHLC):\n\n"
-                    for date, avg_bop in sorted(data['bop_data'].items()):
-                        pressure = "🔼 Buy Pressure" if avg_bop > 0 else "🔽 Sell Pressure"
-                        message += f"- {date}: `{avg_bop:.4f}` {pressure}\n"
-                    st.markdown(message)
-                else:
-                    st.error(error)
+            _run_command(
+                "/bop", f"{bop_coin_symbol} {bop_days}", params,
+                lambda: api_client.fetch_ohlc_data(bop_coin_choice, bop_days),
+                f"Calculating BOP for {bop_coin_symbol} over {bop_days} days...",
+                f"BOP for {bop_coin_symbol} calculated successfully!",
+            )
         else:
             st.warning("Please enter a coin symbol.")
 
+    data = session_cache.get_result("/bop", params) if bop_coin_choice else None
+    if data:
+        message = f"📊 Overall Buy/Sell Pressure (BOP) for {data['name']} ({bop_days}-day OHLC):\n\n"
+        for date, avg_bop in sorted(data['bop_data'].items()):
+            pressure = "🔼 Buy Pressure" if avg_bop > 0 else "🔽 Sell Pressure"
+            message += f"- {date}: `{avg_bop:.4f}` {pressure}\n"
+        st.markdown(message)
+        _export_buttons("bop", f"bop_{bop_coin_choice}_{bop_days}d", data, export.bop_table)
+
+@metrics.instrument_command
 def display_rsi():
     st.header("📉 Relative Strength Index (RSI)")
     rsi_coin_symbol = st.text_input("Enter coin symbol (e.g., btc)", key="rsi_coin_input")
-    rsi_days = st.slider("Select days (1-14):", 1, 14, 14, key="rsi_days_slider")
+    rsi_coin_choice = _coin_picker(rsi_coin_symbol, key="rsi_coin_pick")
+    rsi_days = st.slider(
+        f"Select days (1-{api_client.MAX_HISTORY_DAYS}):", 1, api_client.MAX_HISTORY_DAYS, 14, key="rsi_days_slider"
+    )
+    params = (rsi_coin_choice, rsi_days)
+    live_symbol = rsi_coin_symbol.strip().lower()
+    if live_symbol in price_feed.get_feed().symbols and st.checkbox(
+        "Stream RSI from the live price feed", key="rsi_live_toggle"
+    ):
+        _live_rsi(live_symbol, min(rsi_days, RSI_MAX_PERIOD))
     # Removed st.columns and with block
     if st.button("Calculate RSI"):
         if rsi_coin_symbol:
-            utils.log_command_usage("/rsi", f"{rsi_coin_symbol} {rsi_days}d")
-            with st.spinner(f"Calculating RSI for {rsi_coin_symbol} over {rsi_days} days..."):
-                interval_type = 'daily'
-                prices, error = api_client.fetch_market_chart_data(rsi_coin_symbol, rsi_days, interval_type)
-                if prices:
-                    total_rsi = utils.calculate_rsi(prices, period=rsi_days)
-                    total_rsi_interpretation = utils.interpret_rsi(total_rsi)
-                    st.success(f"RSI for {rsi_coin_symbol} calculated successfully!")
-                    st.markdown(f"""
-                        📉 Relative Strength Index (RSI) for *{rsi_coin_symbol.upper()}* (Last {rsi_days} days):
-
-                        - 🔸 RSI: *{total_rsi:.2f}* {total_rsi_interpretation}
-
-                        *Note: RSI is an indicator used to identify momentum strength, used to evaluate whether an asset is overbought (>70) or oversold (<30).*
-
-                        *🔄 RSI between 30 and 70 indicates neutral market conditions.*
-                    """)
-                else:
-                    st.error(error)
+            interval_type = 'daily'
+            _run_command(
+                "/rsi", f"{rsi_coin_symbol} {rsi_days}d", params,
+                lambda: api_client.fetch_market_chart_data(rsi_coin_choice, rsi_days, interval_type),
+                f"Calculating RSI for {rsi_coin_symbol} over {rsi_days} days...",
+                f"RSI for {rsi_coin_symbol} calculated successfully!",
+            )
         else:
             st.warning("Please enter a coin symbol.")
 
+    prices = session_cache.get_result("/rsi", params) if rsi_coin_choice else None
+    if prices:
+        with profiling.phase("compute"):
+            total_rsi = utils.calculate_rsi(prices, period=min(rsi_days, RSI_MAX_PERIOD))
+        total_rsi_interpretation = utils.interpret_rsi(total_rsi)
+        st.markdown(f"""
+            📉 Relative Strength Index (RSI) for *{rsi_coin_symbol.upper()}* (Last {rsi_days} days):
+
+            - 🔸 RSI: *{total_rsi:.2f}* {total_rsi_interpretation}
+
+            *Note: RSI is an indicator used to identify momentum strength, used to evaluate whether an asset is overbought (>70) or oversold (<30).*
+
+            *🔄 RSI between 30 and 70 indicates neutral market conditions.*
+        """)
+        _export_buttons(
+            "rsi", f"rsi_prices_{rsi_coin_choice}_{rsi_days}d", prices,
+            lambda prices: export.rsi_prices_table(prices, rsi_coin_choice),
+        )
+
+@st.experimental_fragment(run_every=LIVE_REFRESH_SECONDS)
+def _live_rsi(symbol: str, period: int):
+    _, prices = price_feed.get_feed().latest(symbol, LIVE_WINDOW_TICKS)
+    if len(prices) <= period:
+        st.info("Waiting for enough ticks...")
+        return
+    live_rsi = indicators.rsi(prices, period)[-1]
+    st.markdown(
+        f"🔴 Live RSI for *{symbol.upper()}* over the last {len(prices)} ticks (period {period}): "
+        f"*{live_rsi:.2f}* · Last price: `${prices[-1]:,.6f}`\n\n{utils.interpret_rsi(live_rsi)}"
+    )
+
+def _watchlist_rows(feed: price_feed.PriceFeed, symbols: list[str]) -> list[dict]:
+    rows = []
+    for symbol in symbols:
+        timestamps, prices = feed.latest(symbol, LIVE_WINDOW_TICKS)
+        if not len(prices):
+            continue
+        span = timestamps[-1] - timestamps[0]
+        rows.append({
+            "Symbol": symbol.upper(),
+            "Price (USD)": prices[-1],
+            "Change (window)": f"{(prices[-1] / prices[0] - 1) * 100:+.3f}%",
+            "RSI (14 ticks)": round(float(indicators.rsi(prices, RSI_MAX_PERIOD)[-1]), 2),
+            "Ticks/s": round((len(prices) - 1) / span, 1) if span > 0 else None,
+        })
+    return rows
+
+@st.experimental_fragment(run_every=LIVE_REFRESH_SECONDS)
+def _live_watchlist(symbols: list[str]):
+    feed = price_feed.get_feed()
+    rows = _watchlist_rows(feed, symbols)
+    if not rows:
+        st.info("Waiting for the first ticks...")
+        return
+    st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+    st.caption(
+        f"Source: {', '.join(source.name for source in feed.sources)} feed · "
+        f"updated {datetime.now().strftime('%H:%M:%S')}"
+    )
+
+@metrics.instrument_command
+def display_live_watchlist():
+    st.header("👀 Live Watchlist")
+    st.markdown("Prices streamed from the live price feed into in-memory buffers; updates make no API calls.")
+    feed = price_feed.get_feed()
+    symbols = st.multiselect("Symbols:", feed.symbols, default=feed.symbols, key="watchlist_symbols")
+    if symbols:
+        _live_watchlist(symbols)
+
+def _boosted_token_markdown(token: dict) -> str:
+    links_message = ""
+    for link in token.get("links", []):
+        link_type = link.get("type", link.get("label", "Unknown"))
+        link_url = link.get("url", "N/A")
+        links_message += f"  - {link_type.capitalize()}: [Link]({link_url})\n"
+
+    return (
+        f"- Token Address on DexScreener: [Link]({token.get('url', 'N/A')})\n"
+        f"- Platform: `{token.get('chainId', 'N/A')}`\n"
+        f"- Token Address: `{token.get('tokenAddress', 'N/A')}`\n\n"
+        f"Description: {token.get('description', 'No description available')}\n\n"
+        f"Links:\n{links_message}\n"
+        "---------------------------\n"
+    )
+
+def _with_enrichment(fetch, enrich: bool):
+    # Boosted tokens, optionally joined with their pairs and orders in one table.
+    def run():
+        tokens, error = fetch()
+        if not tokens or not enrich:
+            return tokens, error
+        return api_client.enrich_boosted_tokens(tokens)
+    return run
+
+def _render_enriched_tokens(title: str, table: pd.DataFrame):
+    st.markdown(title)
+    st.dataframe(
+        table,
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "url": st.column_config.LinkColumn("DexScreener"),
+            "price_usd": st.column_config.NumberColumn("Price (USD)", format="$%.8f"),
+            "liquidity_usd": st.column_config.NumberColumn("Liquidity (USD)", format="$%.0f"),
+            "volume_24h_usd": st.column_config.NumberColumn("24h Volume (USD)", format="$%.0f"),
+            "price_change_24h": st.column_config.NumberColumn("24h Change", format="%.2f%%"),
+        },
+    )
+
+@metrics.instrument_command
 def display_top_boosted_tokens():
     st.header("🔥 Top Boosted Tokens (DexScreener)")
+    enrich = st.checkbox("Enrich with pair and order data", key="top_boosted_enrich")
     # Removed st.columns and with block
+    title = "🔥 Top Boosted Tokens on DexScreener 🔥"
+    streamed = False
     if st.button("Get Top Boosted Tokens"):
-        utils.log_command_usage("/top_boosted_tokens", "")
-        with st.spinner("Fetching top boosted tokens..."):
-            data, error = api_client.fetch_top_boosted_tokens()
-            if data:
-                st.success("Top boosted tokens fetched successfully!")
-                message = "🔥 Top Boosted Tokens on DexScreener 🔥\n\n"
-                for token in data:
-                    links_message = ""
-                    for link in token.get("links", []):
-                        link_type = link.get("type", link.get("label", "Unknown"))
-                        link_url = link.get("url", "N/A")
-                        links_message += f"  - {link_type.capitalize()}: [Link]({link_url})\n"
-
-                    message += (
-                        f"- Token Address on DexScreener: [Link]({token.get('url', 'N/A')})\n"
-                        f"- Platform: `{token.get('chainId', 'N/A')}`\n"
-                        f"- Token Address: `{token.get('tokenAddress', 'N/A')}`\n\n"
-                        f"Description: {token.get('description', 'No description available')}\n\n"
-                        f"Links:\n{links_message}\n"
-                        "---------------------------\n"
-                    )
-                st.markdown(message)
-            else:
-                st.error(error)
+        if enrich:
+            _run_command(
+                "/top_boosted_tokens", "enriched", (enrich,),
+                _with_enrichment(api_client.fetch_top_boosted_tokens, enrich),
+                "Fetching top boosted tokens...",
+                "Top boosted tokens fetched successfully!",
+            )
+        else:
+            streamed = _stream_command(
+                "/top_boosted_tokens", "", (enrich,),
+                lambda: (api_client.stream_boosted_tokens(), None),
+                title, _boosted_token_markdown,
+                "No boosted tokens found.",
+                "Top boosted tokens fetched successfully!",
+            )
 
+    data = None if streamed else session_cache.get_result("/top_boosted_tokens", (enrich,))
+    if isinstance(data, pd.DataFrame):
+        _render_enriched_tokens(title, data)
+    elif data:
+        _render_items(title, data, _boosted_token_markdown)
+
+@metrics.instrument_command
 def display_latest_boosted_tokens():
     st.header("🔥 Latest Boosted Tokens (DexScreener)")
+    enrich = st.checkbox("Enrich with pair and order data", key="latest_boosted_enrich")
     # Removed st.columns and with block
+    title = "🔥 Latest Boosted Tokens on DexScreener 🔥"
+    streamed = False
     if st.button("Get Latest Boosted Tokens"):
-        utils.log_command_usage("/latest_boosted_tokens", "")
-        with st.spinner("Fetching latest boosted tokens..."):
-            data, error = api_client.fetch_latest_boosted_tokens()
-            if data:
-                st.success("Latest boosted tokens fetched successfully!")
-                message = "🔥 Latest Boosted Tokens on DexScreener 🔥\n\n"
-                for token in data:
-                    links_message = ""
-                    for link in token.get("links", []):
-                        link_type = link.get("type", link.get("label", "Unknown"))
-                        link_url = link.get("url", "N/A")
-                        links_message += f"  - {link_type.capitalize()}: [Link]({link_url})\n"
-
-                    message += (
-                        f"- Token Address on DexScreener: [Link]({token.get('url', 'N/A')})\n"
-                        f"- Platform: `{token.get('chainId', 'N/A')}`\n"
-                        f"- Token Address: `{token.get('tokenAddress', 'N/A')}`\n\n"
-                        f"Description: {token.get('description', 'No description available')}\n\n"
-                        f"Links:\n{links_message}\n"
-                        "---------------------------\n"
-                    )
-                st.markdown(message)
-            else:
-                st.error(error)
+        if enrich:
+            _run_command(
+                "/latest_boosted_tokens", "enriched", (enrich,),
+                _with_enrichment(api_client.fetch_latest_boosted_tokens, enrich),
+                "Fetching latest boosted tokens...",
+                "Latest boosted tokens fetched successfully!",
+            )
+        else:
+            streamed = _stream_command(
+                "/latest_boosted_tokens", "", (enrich,),
+                lambda: (api_client.stream_boosted_tokens(), None),
+                title, _boosted_token_markdown,
+                "No boosted tokens found.",
+                "Latest boosted tokens fetched successfully!",
+            )
 
+    data = None if streamed else session_cache.get_result("/latest_boosted_tokens", (enrich,))
+    if isinstance(data, pd.DataFrame):
+        _render_enriched_tokens(title, data)
+    elif data:
+        _render_items(title, data, _boosted_token_markdown)
+
+@metrics.instrument_command
 def display_token_orders():
     st.header("📋 Token Orders (DexScreener)")
     token_order_chain_id = st.selectbox(
@@ -445,87 +984,147 @@ def display_token_orders():
         key="token_order_chain_select"
     )
     token_order_address = st.text_input("Enter Token Address:", key="token_order_address_input")
+    params = (token_order_chain_id, token_order_address)
+    title = (
+        f"📋 Token Orders on DexScreener\n"
+        f"- Chain: `{token_order_chain_id}`\n"
+        f"- Token Address: `{token_order_address}`\n"
+    )
+    streamed = False
     # Removed st.columns and with block
     if st.button("Get Token Orders"):
         if token_order_address:
-            utils.log_command_usage("/token_orders", f"{token_order_chain_id} {token_order_address}")
-            with st.spinner(f"Fetching token orders for {token_order_address} on {token_order_chain_id}..."):
-                data, error = api_client.fetch_token_orders(token_order_chain_id, token_order_address)
-                if data:
-                    st.success("Token orders fetched successfully!")
-                    message = f"📋 Token Orders on DexScreener\n"
-                    message += (
-                        f"- Chain: `{token_order_chain_id}`\n"
-                        f"- Token Address: `{token_order_address}`\n\n"
-                    )
-                    type_mapping = {
-                        "tokenProfile": "Token Profile added to Dex Screener",
-                        "communityTakeover": "Community Takeover",
-                        "tokenAd": "Ad on Dex Screener",
-                        "trendingBarAd": "Trending Bar Ad on Dex Screener"
-                    }
-                    for order in data:
-                        order_type = order.get("type", "Unknown")
-                        status = order.get("status", "Unknown")
-                        timestamp = order.get("paymentTimestamp", 0)
-                        datetime_str = datetime.fromtimestamp(timestamp / 1000).strftime("%Y-%m-%d %H:%M:%S")
-
-                        message += (
-                            f"- Type: `{type_mapping.get(order_type, order_type)}`\n"
-                            f"- Status: `{status.capitalize()}`\n"
-                            f"- Date/Time: `{datetime_str}`\n"
-                            "------------------------------------\n"
-                        )
-                    st.markdown(message)
-                else:
-                    st.error(error)
+            streamed = _stream_command(
+                "/token_orders", f"{token_order_chain_id} {token_order_address}", params,
+                lambda: api_client.stream_token_orders(token_order_chain_id, token_order_address),
+                title, _order_markdown,
+                "No orders found for the specified token.",
+                "Token orders fetched successfully!",
+            )
         else:
             st.warning("Please enter a token address.")
 
+    data = session_cache.get_result("/token_orders", params) if token_order_address and not streamed else None
+    if data:
+        _render_items(title, data, _order_markdown)
+
+ORDER_TYPES = {
+    "tokenProfile": "Token Profile added to Dex Screener",
+    "communityTakeover": "Community Takeover",
+    "tokenAd": "Ad on Dex Screener",
+    "trendingBarAd": "Trending Bar Ad on Dex Screener"
+}
+
+def _order_markdown(order: dict) -> str:
+    order_type = order.get("type", "Unknown")
+    status = order.get("status", "Unknown")
+    timestamp = order.get("paymentTimestamp", 0)
+    datetime_str = datetime.fromtimestamp(timestamp / 1000).strftime("%Y-%m-%d %H:%M:%S")
+
+    return (
+        f"- Type: `{ORDER_TYPES.get(order_type, order_type)}`\n"
+        f"- Status: `{status.capitalize()}`\n"
+        f"- Date/Time: `{datetime_str}`\n"
+        "------------------------------------\n"
+    )
+
+@metrics.instrument_command
 def display_trade_info():
     st.header("📊 Trade Info (DexScreener)")
+    if st.checkbox("Compare several tokens", key="trade_info_batch_mode"):
+        _display_trade_info_batch()
+        return
     trade_info_token_address = st.text_input("Enter Token Address:", key="trade_info_token_address_input")
+    params = (trade_info_token_address,)
+    title = f"📊 Trade History for {trade_info_token_address} 📊\n"
+    streamed = False
     # Removed st.columns and with block
     if st.button("Get Trade Info"):
         if trade_info_token_address:
-            utils.log_command_usage("/trade_info", trade_info_token_address)
-            with st.spinner(f"Fetching trade info for {trade_info_token_address}..."):
-                data, error = api_client.fetch_trade_info(trade_info_token_address)
-                if data:
-                    st.success("Trade info fetched successfully!")
-                    message = f"📊 Trade History for {trade_info_token_address} 📊\n\n"
-                    for pair in data:
-                        txns_message = "\n".join(
-                            [
-                                f"- {key}: Buys: `{value.get('buys', 0)}`, Sells: `{value.get('sells', 0)}`"
-                                for key, value in pair.get("txns", {}).items()
-                            ]
-                        )
-                        volume_message = "\n".join(
-                            [f"- {key}: `${value:,.2f}`" for key, value in pair.get("volume", {}).items()]
-                        )
-                        price_change_message = "\n".join(
-                            [f"- {key}: `{value:.2f}%`" for key, value in pair.get("priceChange", {}).items()]
-                        )
-
-                        message += (
-                            f"- Dex: `{pair.get('dexId', 'N/A')}`\n"
-                            f"- DEX Screener Link: [Link]({pair.get('url', 'N/A')})\n"
-                            f"- Pair Address: `{pair.get('pairAddress', 'N/A')}`\n"
-                            f"- Base Token - Quote Token: `{pair.get('baseToken', {}).get('symbol', 'N/A')} / {pair.get('quoteToken', {}).get('symbol', 'N/A')}`\n"
-                            f"- Price (Native): `{pair.get('priceNative', 'N/A')}`\n"
-                            f"- Price (USD): `${pair.get('priceUsd', 'N/A')}`\n\n"
-                            f"Transactions:\n{txns_message}\n\n"
-                            f"Volume (USD):\n{volume_message}\n\n"
-                            f"Price Change (%):\n{price_change_message}\n\n"
-                            f"- Liquidity (USD): `${pair.get('liquidity', {}).get('usd', 0):,.2f}`\n"
-                            f"- Market Cap: `${pair.get('marketCap', 'N/A')}`\n"
-                            f"- FDV: `${pair.get('fdv', 'N/A')}`\n"
-                            f"- Active Boosts: `{pair.get('boosts', {}).get('active', 'N/A')}`\n"
-                            "---------------------------\n"
-                        )
-                    st.markdown(message)
-                else:
-                    st.error(error)
+            streamed = _stream_command(
+                "/trade_info", trade_info_token_address, params,
+                lambda: (api_client.stream_trade_info(trade_info_token_address), None),
+                title, _pair_markdown,
+                "No data found for the entered token address. Please try again.",
+                "Trade info fetched successfully!",
+            )
         else:
             st.warning("Please enter a token address.")
+
+    data = session_cache.get_result("/trade_info", params) if trade_info_token_address else None
+    if data and not streamed:
+        _render_items(title, data, _pair_markdown)
+    if data:
+        _export_buttons("trade_info", f"trade_info_{trade_info_token_address}", data, export.pairs_table)
+
+def _pair_markdown(pair: dict) -> str:
+    txns_message = "\n".join(
+        [
+            f"- {key}: Buys: `{value.get('buys', 0)}`, Sells: `{value.get('sells', 0)}`"
+            for key, value in pair.get("txns", {}).items()
+        ]
+    )
+    volume_message = "\n".join(
+        [f"- {key}: `${value:,.2f}`" for key, value in pair.get("volume", {}).items()]
+    )
+    price_change_message = "\n".join(
+        [f"- {key}: `{value:.2f}%`" for key, value in pair.get("priceChange", {}).items()]
+    )
+
+    return (
+        f"- Dex: `{pair.get('dexId', 'N/A')}`\n"
+        f"- DEX Screener Link: [Link]({pair.get('url', 'N/A')})\n"
+        f"- Pair Address: `{pair.get('pairAddress', 'N/A')}`\n"
+        f"- Base Token - Quote Token: `{pair.get('baseToken', {}).get('symbol', 'N/A')} / {pair.get('quoteToken', {}).get('symbol', 'N/A')}`\n"
+        f"- Price (Native): `{pair.get('priceNative', 'N/A')}`\n"
+        f"- Price (USD): `${pair.get('priceUsd', 'N/A')}`\n\n"
+        f"Transactions:\n{txns_message}\n\n"
+        f"Volume (USD):\n{volume_message}\n\n"
+        f"Price Change (%):\n{price_change_message}\n\n"
+        f"- Liquidity (USD): `${pair.get('liquidity', {}).get('usd', 0):,.2f}`\n"
+        f"- Market Cap: `${pair.get('marketCap', 'N/A')}`\n"
+        f"- FDV: `${pair.get('fdv', 'N/A')}`\n"
+        f"- Active Boosts: `{pair.get('boosts', {}).get('active', 'N/A')}`\n"
+        "---------------------------\n"
+    )
+
+def _display_trade_info_batch():
+    addresses_text = st.text_area(
+        "Enter token addresses (one per line or comma-separated):", key="trade_info_batch_addresses"
+    )
+    addresses = [address for address in addresses_text.replace(",", "\n").split() if address]
+    params = tuple(addresses)
+    if st.button("Get Trade Info"):
+        if addresses:
+            _run_command(
+                "/trade_info_batch", " ".join(addresses), params,
+                lambda: api_client.fetch_trade_info_batch(addresses),
+                f"Fetching trade info for {len(addresses)} tokens...",
+                "Trade info fetched successfully!",
+            )
+        else:
+            st.warning("Please enter at least one token address.")
+
+    data = session_cache.get_result("/trade_info_batch", params) if addresses else None
+    if data:
+        st.markdown(f"📊 Trade Summary for {data['tokens'].shape[0]} Tokens 📊")
+        st.dataframe(
+            data["tokens"],
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                "vwap_usd": st.column_config.NumberColumn("Volume-Weighted Price (USD)", format="$%.8f"),
+                "total_liquidity_usd": st.column_config.NumberColumn("Total Liquidity (USD)", format="$%.0f"),
+                "volume_24h_usd": st.column_config.NumberColumn("24h Volume (USD)", format="$%.0f"),
+            },
+        )
+        if data["missing"]:
+            st.warning("No pairs found for: " + ", ".join(f"`{address}`" for address in data["missing"]))
+        with st.expander(f"All {data['pairs'].shape[0]} pairs"):
+            st.dataframe(
+                data["pairs"],
+                hide_index=True,
+                use_container_width=True,
+                column_config={"url": st.column_config.LinkColumn("DexScreener")},
+            )
+        _export_buttons("trade_info_batch", "trade_info_pairs", data["pairs"], export.pairs_table)
@@ -0,0 +1,201 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import api_client
+import indicators
+from ring_buffer import RingBuffer
+
+# The `fetch_dominance_data` fields recorded on every sample.
+SERIES = ("btc_dominance", "eth_dominance", "usdt_dominance", "market_cap_change_24h")
+# One sample per upstream cache lifetime; sampling faster would only repeat values.
+SAMPLE_INTERVAL_SECONDS = api_client.GLOBAL_TTL_SECONDS
+# Rollup resolutions as (bucket seconds, buckets kept), finest first: two
+# weeks of minutes, a year of hours and five years of days.
+RESOLUTIONS = {
+    "minute": (60, 14 * 24 * 60),
+    "hour": (3600, 365 * 24),
+    "day": (86400, 5 * 365),
+}
+# Charts are downsampled to about this many points per series.
+CHART_POINTS = 300
+
+class Rollup:
+    """
+    Per-bucket means of every series at one resolution.
+
+    Closed buckets live in one ring buffer per series; the open bucket is
+    kept as running sums and folded in when it is read, so a sample costs
+    O(1) whatever the resolution.
+    """
+
+    def __init__(self, bucket_seconds: int, capacity: int):
+        self.bucket_seconds = bucket_seconds
+        self.capacity = capacity
+        self.buffers = {name: RingBuffer(capacity) for name in SERIES}
+        self._bucket = None  # start of the open bucket
+        self._sums = np.zeros(len(SERIES))
+        self._counts = np.zeros(len(SERIES))
+
+    @property
+    def span_seconds(self) -> int:
+        return self.bucket_seconds * self.capacity
+
+    def add(self, timestamp: float, values: np.ndarray):
+        """
+        Adds one sample; NaN values are left out of the means.
+        """
+        bucket = timestamp - timestamp % self.bucket_seconds
+        if self._bucket is not None and bucket != self._bucket:
+            self._close()
+        self._bucket = bucket
+        valid = ~np.isnan(values)
+        self._sums[valid] += values[valid]
+        self._counts[valid] += 1
+
+    def _means(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self._sums / self._counts
+
+    def _close(self):
+        for name, mean in zip(SERIES, self._means()):
+            self.buffers[name].extend([self._bucket], [mean])
+        self._sums[:] = 0
+        self._counts[:] = 0
+
+    def read(self, name: str, since: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the bucket start times and means of a series from `since` on,
+        including the open bucket.
+        """
+        timestamps, values = self.buffers[name].latest()
+        if self._bucket is not None:
+            timestamps = np.append(timestamps, self._bucket)
+            values = np.append(values, self._means()[SERIES.index(name)])
+        start = np.searchsorted(timestamps, since - since % self.bucket_seconds)
+        timestamps, values = timestamps[start:], values[start:]
+        valid = ~np.isnan(values)
+        return timestamps[valid], values[valid]
+
+class DominanceHistory:
+    """
+    Samples `/global` dominance on a fixed cadence into minute, hour and day
+    rollups, so trend charts over any span read a bounded number of buckets.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL_SECONDS):
+        self.interval = interval
+        self.rollups = {name: Rollup(*spec) for name, spec in RESOLUTIONS.items()}
+        self.samples = 0
+        self.started_at = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        """
+        Starts the background sampling loop (idempotent).
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="dominance-history", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                error = self.sample()
+                if error:
+                    print(f"Dominance sampling failed: {error}")
+            except Exception as e:
+                print(f"Dominance sampling failed: {e}")
+            time.sleep(self.interval)
+
+    def sample(self) -> str | None:
+        """
+        Fetches the current dominance and records it.
+
+        Returns:
+            str | None: An error message if the fetch failed.
+        """
+        data, error = api_client.fetch_dominance_data()
+        if error:
+            return error
+        self.record(time.time(), data)
+        return None
+
+    def record(self, timestamp: float, data: dict):
+        """
+        Records one sample (a `fetch_dominance_data` dict) at a unix time.
+        """
+        values = np.array([_number(data.get(name)) for name in SERIES])
+        with self._lock:
+            for rollup in self.rollups.values():
+                rollup.add(timestamp, values)
+            self.samples += 1
+            if self.started_at is None:
+                self.started_at = timestamp
+
+    def resolution_for(self, span_seconds: float) -> str:
+        """
+        Returns the finest resolution that still covers a span.
+        """
+        for name, rollup in self.rollups.items():
+            if rollup.span_seconds >= span_seconds:
+                return name
+        return name  # The coarsest one.
+
+    def chart_data(
+        self,
+        names: tuple[str, ...],
+        span_seconds: float,
+        points: int = CHART_POINTS,
+        now: float | None = None,
+    ) -> tuple[pd.DataFrame, str, int]:
+        """
+        Returns series downsampled for a chart over the last `span_seconds`.
+
+        Each series is reduced with LTTB and the union of the kept timestamps
+        is returned, so every line keeps its own extremes.
+
+        Args:
+            names (tuple[str, ...]): The series (see `SERIES`).
+            span_seconds (float): How far back to read.
+            points (int): The approximate number of points kept per series.
+            now (float | None): The end of the span; defaults to now.
+
+        Returns:
+            tuple[pd.DataFrame, str, int]: The points (indexed by time, one column
+                                           per series), the resolution read and the
+                                           number of buckets before downsampling.
+        """
+        now = time.time() if now is None else now
+        resolution = self.resolution_for(span_seconds)
+        rollup = self.rollups[resolution]
+        with self._lock:
+            series = {name: rollup.read(name, now - span_seconds) for name in names}
+
+        columns, kept = {}, []
+        for name, (timestamps, values) in series.items():
+            columns[name] = pd.Series(values, index=timestamps)
+            kept.append(timestamps[indicators.lttb(timestamps, values, points)])
+        index = np.unique(np.concatenate(kept)) if kept else np.empty(0)
+        table = pd.DataFrame({name: column.reindex(index) for name, column in columns.items()}, index=index)
+        table.index = pd.to_datetime(table.index, unit="s")
+        total = max((len(timestamps) for timestamps, _ in series.values()), default=0)
+        return table, resolution, total
+
+def _number(value) -> float:
+    # "N/A" and other placeholders become NaN.
+    return float(value) if isinstance(value, (int, float)) else np.nan
+
+_history = DominanceHistory()
+
+def get_history() -> DominanceHistory:
+    """
+    Returns the process-wide history, starting its sampler on first use.
+    """
+    _history.start()
+    return _history
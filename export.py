@@ -0,0 +1,155 @@
+import os
+import tempfile
+import weakref
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc
+import pyarrow.parquet as pq
+
+import api_client
+
+# Rows per record batch when writing; batches are zero-copy slices of the
+# table's columns, so writing adds no copy of the table besides the file.
+EXPORT_BATCH_ROWS = 64 * 1024
+# Larger files are not offered: `st.download_button` reads the file it offers
+# into Streamlit's in-memory media store.
+EXPORT_MAX_BYTES = 64 * 1024 * 1024
+# Download formats: label -> (file extension, MIME type).
+FORMATS = {
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Arrow": ("arrow", "application/vnd.apache.arrow.file"),
+}
+
+CATEGORY_FIELDS = {
+    "id": pa.string(),
+    "name": pa.string(),
+    "market_cap": pa.float64(),
+    "market_cap_change_24h": pa.float64(),
+    "volume_24h": pa.float64(),
+    "top_3_coins_id": pa.list_(pa.string()),
+    "updated_at": pa.string(),
+}
+
+# --- Building tables ---
+
+def _field_values(records: list[dict], name: str, field_type: pa.DataType) -> list:
+    values = [record.get(name) for record in records]
+    if pa.types.is_floating(field_type):
+        # Placeholders such as "N/A" become nulls.
+        return [value if isinstance(value, (int, float)) and not isinstance(value, bool) else None for value in values]
+    return values
+
+def records_table(records: list[dict], fields: dict[str, pa.DataType]) -> pa.Table:
+    """
+    Builds a typed table from JSON records one column at a time.
+
+    Args:
+        records (list[dict]): The decoded upstream records.
+        fields (dict[str, pa.DataType]): The exported fields and their types;
+                                         missing or mistyped values become nulls.
+
+    Returns:
+        pa.Table: One row per record.
+    """
+    return pa.table({
+        name: pa.array(_field_values(records, name, field_type), type=field_type)
+        for name, field_type in fields.items()
+    })
+
+def pairs_table(pairs) -> pa.Table:
+    """
+    Returns trade info pairs (a list of pair dicts or an `api_client.pairs_table`
+    frame) as a table; numeric columns are wrapped without copying.
+    """
+    frame = pairs if isinstance(pairs, pd.DataFrame) else api_client.pairs_table(pairs)
+    return pa.Table.from_pandas(frame, preserve_index=False)
+
+def bop_table(data: dict) -> pa.Table:
+    """
+    Returns a `fetch_ohlc_data` result as a daily BOP table.
+    """
+    days = sorted(data["bop_data"])
+    table = pa.table({
+        "date": pa.array(np.array(days, dtype="datetime64[D]")),
+        "bop": pa.array(np.fromiter((data["bop_data"][day] for day in days), dtype=np.float64, count=len(days))),
+    })
+    return table.replace_schema_metadata({"coin": data["name"]})
+
+def rsi_prices_table(prices, coin: str) -> pa.Table:
+    """
+    Returns the daily closing prices behind an RSI reading (oldest first).
+    """
+    return pa.table({"close": pa.array(np.asarray(prices, dtype=np.float64))}).replace_schema_metadata({"coin": coin})
+
+def categories_table(categories: list[dict]) -> pa.Table:
+    """
+    Returns `/coins/categories` records as a table.
+    """
+    return records_table(categories, CATEGORY_FIELDS)
+
+def companies_table(data: dict) -> pa.Table:
+    """
+    Returns a `fetch_companies_data` result as a table of all its companies,
+    with the upstream totals and concentration metrics kept as schema metadata.
+    """
+    metadata = {key: str(data[key]) for key in ("total_holdings", "total_value_usd", "market_cap_dominance")}
+    metadata["hhi"] = str(data["concentration"]["hhi"])
+    metadata.update({f"top_{k}_share": str(share) for k, share in data["concentration"]["top_shares"].items()})
+    table = pa.Table.from_pandas(data["companies"], preserve_index=False)
+    return table.replace_schema_metadata({**table.schema.metadata, **metadata})
+
+# --- Writing ---
+
+def write_batches(batches, schema: pa.Schema, sink, fmt: str = "Parquet"):
+    """
+    Writes record batches one at a time; written to a file, memory stays
+    flat however long the stream is.
+
+    Args:
+        batches: An iterable of `pa.RecordBatch` matching `schema`.
+        schema (pa.Schema): The schema of the file.
+        sink: A path or writable binary file (e.g. `io.BytesIO`).
+        fmt (str): "Parquet" or "Arrow" (the Arrow IPC file format).
+    """
+    if fmt == "Parquet":
+        writer = pq.ParquetWriter(sink, schema)
+    elif fmt == "Arrow":
+        writer = pa.ipc.new_file(sink, schema)
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+    with writer:
+        for batch in batches:
+            writer.write_batch(batch)
+
+def write_table(table: pa.Table, sink, fmt: str = "Parquet", batch_rows: int = EXPORT_BATCH_ROWS):
+    """
+    Writes a table in record batches of at most `batch_rows` rows.
+    """
+    write_batches(table.to_batches(max_chunksize=batch_rows), table.schema, sink, fmt)
+
+class ExportFile:
+    """
+    A table encoded as a Parquet or Arrow file in a private temporary file.
+
+    The table is written to disk batch by batch, so encoding holds no copy of
+    the file in memory. The file is deleted when the object is garbage
+    collected (e.g. with the session that kept it) or at exit.
+    """
+
+    def __init__(self, table: pa.Table, fmt: str = "Parquet"):
+        fd, self.path = tempfile.mkstemp(prefix="pumpies-export-", suffix=f".{FORMATS[fmt][0]}")
+        weakref.finalize(self, _remove, self.path)
+        with os.fdopen(fd, "wb") as sink:
+            write_table(table, sink, fmt)
+        self.size = os.path.getsize(self.path)
+
+    def open(self):
+        return open(self.path, "rb")
+
+def _remove(path: str):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
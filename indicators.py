@@ -0,0 +1,420 @@
+import numpy as np
+import pandas as pd
+
+# Every indicator accepts either a single series (1-D array, time along the
+# only axis) or a batch of series (2-D array, one series per row, time along
+# the last axis) and returns arrays of the same shape. Warm-up positions that
+# do not have enough history are NaN.
+
+# --- Shared Kernels ---
+
+def _as_batch(values) -> tuple[np.ndarray, bool]:
+    """
+    Normalises input into a 2-D float batch of shape (n_series, n_points).
+
+    Args:
+        values: A 1-D series or 2-D batch of series.
+
+    Returns:
+        tuple[np.ndarray, bool]: The 2-D batch and whether the input was 1-D.
+    """
+    arr = np.asarray(values, dtype=float)
+    if arr.ndim == 1:
+        return arr[np.newaxis, :], True
+    if arr.ndim == 2:
+        return arr, False
+    raise ValueError("Expected a 1-D series or a 2-D batch of series.")
+
+def _restore(batch: np.ndarray, was_1d: bool) -> np.ndarray:
+    return batch[0] if was_1d else batch
+
+def rolling_window(values, window: int, how: str = "mean") -> np.ndarray:
+    """
+    Applies a trailing rolling-window reduction along the time axis.
+
+    Each series becomes a column of one DataFrame reduced with
+    `pandas.DataFrame.rolling`, so the whole batch goes through pandas'
+    compiled rolling aggregations in one call. A window containing a NaN
+    gives NaN, and "std" is the population standard deviation (ddof=0).
+
+    Args:
+        values: A 1-D series or 2-D batch of series.
+        window (int): The window length in points.
+        how (str): One of "mean", "sum", "std", "max" or "min".
+
+    Returns:
+        np.ndarray: The reduced values; the first `window - 1` points are NaN.
+    """
+    if window < 1:
+        raise ValueError("Window must be at least 1.")
+    batch, was_1d = _as_batch(values)
+    rolling = pd.DataFrame(batch.T).rolling(window, min_periods=window)
+    if how == "mean":
+        result = rolling.mean()
+    elif how == "sum":
+        result = rolling.sum()
+    elif how == "std":
+        result = rolling.std(ddof=0)
+    elif how == "max":
+        result = rolling.max()
+    elif how == "min":
+        result = rolling.min()
+    else:
+        raise ValueError(f"Unsupported rolling reduction: {how}")
+    return _restore(result.to_numpy().T, was_1d)
+
+def exponential_smoothing(values, alpha: float, seed_period: int = 1) -> np.ndarray:
+    """
+    Runs the recursive smoother s[t] = alpha * x[t] + (1 - alpha) * s[t-1].
+
+    The recursion is seeded with the simple average of the first `seed_period`
+    valid points, which is the convention used by EMA (seed_period = period)
+    and Wilder's smoothing in RSI/ATR.
+
+    Args:
+        values: A 1-D series or 2-D batch of series.
+        alpha (float): The smoothing factor in (0, 1].
+        seed_period (int): The number of points averaged to seed the recursion.
+
+    Returns:
+        np.ndarray: The smoothed values, NaN before the seed point.
+    """
+    if not 0 < alpha <= 1:
+        raise ValueError("Alpha must be in the interval (0, 1].")
+    batch, was_1d = _as_batch(values)
+    seeds = rolling_window(batch, seed_period, "mean")
+    valid = ~np.isnan(seeds)
+    has_seed = valid.any(axis=1)
+    first = np.argmax(valid, axis=1)
+
+    # Blank out everything before the seed and drop the seed in place, so the
+    # recursion below starts from the SMA instead of the first raw value.
+    positions = np.arange(batch.shape[1])
+    seeded = np.where(positions[np.newaxis, :] < first[:, np.newaxis], np.nan, batch)
+    rows = np.flatnonzero(has_seed)
+    seeded[rows, first[rows]] = seeds[rows, first[rows]]
+    seeded[~has_seed] = np.nan
+
+    smoothed = pd.DataFrame(seeded.T).ewm(alpha=alpha, adjust=False).mean()
+    return _restore(smoothed.to_numpy().T, was_1d)
+
+def _lag(batch: np.ndarray) -> np.ndarray:
+    lagged = np.empty_like(batch)
+    lagged[:, 0] = np.nan
+    lagged[:, 1:] = batch[:, :-1]
+    return lagged
+
+# --- Indicators ---
+
+def sma(values, period: int) -> np.ndarray:
+    """
+    Simple moving average.
+
+    Args:
+        values: A 1-D series or 2-D batch of closing prices.
+        period (int): The averaging period.
+
+    Returns:
+        np.ndarray: The moving average.
+    """
+    return rolling_window(values, period, "mean")
+
+def ema(values, period: int) -> np.ndarray:
+    """
+    Exponential moving average with alpha = 2 / (period + 1), seeded by SMA.
+
+    Args:
+        values: A 1-D series or 2-D batch of closing prices.
+        period (int): The EMA period.
+
+    Returns:
+        np.ndarray: The exponential moving average.
+    """
+    return exponential_smoothing(values, 2.0 / (period + 1), seed_period=period)
+
+def wilder_smoothing(values, period: int) -> np.ndarray:
+    """
+    Wilder's smoothing (alpha = 1 / period), seeded by SMA.
+
+    Args:
+        values: A 1-D series or 2-D batch of series.
+        period (int): The smoothing period.
+
+    Returns:
+        np.ndarray: The smoothed values.
+    """
+    return exponential_smoothing(values, 1.0 / period, seed_period=period)
+
+def rsi(closes, period: int = 14) -> np.ndarray:
+    """
+    Relative Strength Index series using Wilder's smoothing.
+
+    The last value matches `utils.calculate_rsi` for the same prices and period.
+
+    Args:
+        closes: A 1-D series or 2-D batch of closing prices.
+        period (int): The RSI period (default is 14).
+
+    Returns:
+        np.ndarray: RSI values in [0, 100], NaN for the first `period` points.
+    """
+    batch, was_1d = _as_batch(closes)
+    changes = np.diff(batch, axis=1)
+    avg_gain = wilder_smoothing(np.clip(changes, 0, None), period)
+    avg_loss = wilder_smoothing(np.clip(-changes, 0, None), period)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = 100 - 100 / (1 + avg_gain / avg_loss)
+    flat = avg_loss == 0
+    values = np.where(flat & (avg_gain > 0), 100.0, values)
+    values = np.where(flat & (avg_gain == 0), 50.0, values)
+
+    result = np.full(batch.shape, np.nan)
+    result[:, 1:] = values
+    return _restore(result, was_1d)
+
+def macd(closes, fast: int = 12, slow: int = 26, signal: int = 9) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Moving Average Convergence Divergence.
+
+    Args:
+        closes: A 1-D series or 2-D batch of closing prices.
+        fast (int): The fast EMA period (default is 12).
+        slow (int): The slow EMA period (default is 26).
+        signal (int): The signal-line EMA period (default is 9).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: The MACD line, the signal
+                                                   line and the histogram.
+    """
+    macd_line = ema(closes, fast) - ema(closes, slow)
+    signal_line = ema(macd_line, signal)
+    return macd_line, signal_line, macd_line - signal_line
+
+def bollinger_bands(closes, period: int = 20, num_std: float = 2.0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bollinger Bands around a simple moving average.
+
+    Args:
+        closes: A 1-D series or 2-D batch of closing prices.
+        period (int): The averaging period (default is 20).
+        num_std (float): The band width in population standard deviations.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: The middle, upper and lower bands.
+    """
+    middle = rolling_window(closes, period, "mean")
+    width = num_std * rolling_window(closes, period, "std")
+    return middle, middle + width, middle - width
+
+def true_range(high, low, close) -> np.ndarray:
+    """
+    True range of each candle; the first candle uses its high-low range.
+
+    Args:
+        high: A 1-D series or 2-D batch of high prices.
+        low: A 1-D series or 2-D batch of low prices.
+        close: A 1-D series or 2-D batch of closing prices.
+
+    Returns:
+        np.ndarray: The true range.
+    """
+    high_b, was_1d = _as_batch(high)
+    low_b, _ = _as_batch(low)
+    prev_close = _lag(_as_batch(close)[0])
+    ranges = np.stack([
+        high_b - low_b,
+        np.abs(high_b - prev_close),
+        np.abs(low_b - prev_close),
+    ])
+    return _restore(np.nanmax(ranges, axis=0), was_1d)
+
+def atr(high, low, close, period: int = 14) -> np.ndarray:
+    """
+    Average True Range using Wilder's smoothing.
+
+    Args:
+        high: A 1-D series or 2-D batch of high prices.
+        low: A 1-D series or 2-D batch of low prices.
+        close: A 1-D series or 2-D batch of closing prices.
+        period (int): The ATR period (default is 14).
+
+    Returns:
+        np.ndarray: The average true range.
+    """
+    return wilder_smoothing(true_range(high, low, close), period)
+
+def stochastic(high, low, close, k_period: int = 14, d_period: int = 3) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Stochastic oscillator.
+
+    Args:
+        high: A 1-D series or 2-D batch of high prices.
+        low: A 1-D series or 2-D batch of low prices.
+        close: A 1-D series or 2-D batch of closing prices.
+        k_period (int): The %K look-back period (default is 14).
+        d_period (int): The %D smoothing period (default is 3).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The %K and %D lines in [0, 100]. A flat
+                                       look-back window yields 50.
+    """
+    highest = rolling_window(high, k_period, "max")
+    lowest = rolling_window(low, k_period, "min")
+    spread = highest - lowest
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percent_k = 100 * (np.asarray(close, dtype=float) - lowest) / spread
+    percent_k = np.where(spread == 0, 50.0, percent_k)
+    return percent_k, sma(percent_k, d_period)
+
+def balance_of_power(open_, high, low, close) -> np.ndarray:
+    """
+    Balance of Power per candle, (close - open) / (high - low).
+
+    Args:
+        open_: A 1-D series or 2-D batch of open prices.
+        high: A 1-D series or 2-D batch of high prices.
+        low: A 1-D series or 2-D batch of low prices.
+        close: A 1-D series or 2-D batch of closing prices.
+
+    Returns:
+        np.ndarray: The BOP values; candles with high == low are NaN.
+    """
+    spread = np.asarray(high, dtype=float) - np.asarray(low, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = (np.asarray(close, dtype=float) - np.asarray(open_, dtype=float)) / spread
+    return np.where(spread == 0, np.nan, values)
+
+# --- Input Helpers ---
+
+def ohlc_to_arrays(ohlc_rows: list[list[float]]) -> dict[str, np.ndarray]:
+    """
+    Converts CoinGecko `/ohlc` rows into column arrays.
+
+    Args:
+        ohlc_rows (list[list[float]]): Rows of [timestamp_ms, open, high, low, close].
+
+    Returns:
+        dict[str, np.ndarray]: Arrays keyed by "timestamp", "open", "high", "low" and "close".
+    """
+    table = np.asarray(ohlc_rows, dtype=float).reshape(-1, 5)
+    return {
+        "timestamp": table[:, 0].astype(np.int64),
+        "open": table[:, 1],
+        "high": table[:, 2],
+        "low": table[:, 3],
+        "close": table[:, 4],
+    }
+
+def market_chart_to_arrays(points: list[list[float]]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Converts CoinGecko `/market_chart` [timestamp_ms, value] points into arrays.
+
+    Args:
+        points (list[list[float]]): The "prices", "market_caps" or "total_volumes" list.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The timestamps (ms) and values.
+    """
+    table = np.asarray(points, dtype=float).reshape(-1, 2)
+    return table[:, 0].astype(np.int64), table[:, 1]
+
+def stitch_series(chunks: list[list[list[float]]]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Joins [timestamp_ms, value] chunks fetched for adjacent ranges into one
+    ordered series; points repeated at chunk boundaries are kept once.
+
+    Args:
+        chunks (list[list[list[float]]]): The point lists of each chunk, in any order.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The sorted unique timestamps (ms) and their values.
+    """
+    tables = [np.asarray(points, dtype=float).reshape(-1, 2) for points in chunks]
+    table = np.concatenate(tables) if tables else np.empty((0, 2))
+    timestamps, first = np.unique(table[:, 0].astype(np.int64), return_index=True)
+    return timestamps, table[first, 1]
+
+# --- Resampling ---
+
+def resample_ohlc(timestamps, prices, freq: str) -> dict[str, np.ndarray]:
+    """
+    Builds candles from a price series (open = first, close = last point of each bucket).
+
+    Args:
+        timestamps: Timestamps in milliseconds, ascending.
+        prices: The prices at those timestamps.
+        freq (str): A pandas offset alias for the candle size (e.g. "4h").
+
+    Returns:
+        dict[str, np.ndarray]: Arrays keyed like `ohlc_to_arrays`; empty buckets are dropped.
+    """
+    series = pd.Series(np.asarray(prices, dtype=float), index=pd.to_datetime(np.asarray(timestamps), unit="ms"))
+    candles = series.resample(freq).ohlc().dropna()
+    return {
+        "timestamp": candles.index.asi8 // 1_000_000,
+        "open": candles["open"].to_numpy(),
+        "high": candles["high"].to_numpy(),
+        "low": candles["low"].to_numpy(),
+        "close": candles["close"].to_numpy(),
+    }
+
+def daily_mean(timestamps, values) -> dict[str, float]:
+    """
+    Averages values per UTC day, ignoring NaNs.
+
+    Args:
+        timestamps: Timestamps in milliseconds.
+        values: The values at those timestamps.
+
+    Returns:
+        dict[str, float]: Means keyed by "YYYY-MM-DD"; days with no valid value are omitted.
+    """
+    days = pd.to_datetime(np.asarray(timestamps), unit="ms").strftime("%Y-%m-%d")
+    means = pd.Series(np.asarray(values, dtype=float)).groupby(days).mean().dropna()
+    return means.to_dict()
+
+def lttb(x, y, threshold: int) -> np.ndarray:
+    """
+    Picks the points of a series that best preserve its shape when plotted
+    (Largest-Triangle-Three-Buckets).
+
+    The first and last points are always kept. The points in between are
+    split into `threshold - 2` equal buckets, and from each bucket the point
+    forming the largest triangle with the previously kept point and the
+    average of the next bucket is kept.
+
+    Args:
+        x: The x values (e.g. timestamps), ascending.
+        y: The y values; should not contain NaNs.
+        threshold (int): The number of points to keep.
+
+    Returns:
+        np.ndarray: The indices of the kept points, ascending (all indices if
+                    the series has no more than `threshold` points).
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    # Bucket averages from prefix sums; the last bucket is followed by the last point.
+    x_sums = np.concatenate(([0.0], np.cumsum(x)))
+    y_sums = np.concatenate(([0.0], np.cumsum(y)))
+    widths = np.diff(edges)
+    x_means = np.append((x_sums[edges[1:]] - x_sums[edges[:-1]]) / widths, x[-1])
+    y_means = np.append((y_sums[edges[1:]] - y_sums[edges[:-1]]) / widths, y[-1])
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    kept = 0
+    for bucket in range(threshold - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        next_x, next_y = x_means[bucket + 1], y_means[bucket + 1]
+        # Twice the triangle areas; the factor does not change the argmax.
+        areas = np.abs((x[kept] - next_x) * (y[lo:hi] - y[kept]) - (x[kept] - x[lo:hi]) * (next_y - y[kept]))
+        kept = lo + int(np.argmax(areas))
+        selected[bucket + 1] = kept
+    return selected
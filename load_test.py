@@ -0,0 +1,510 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+# Simulated sessions talk to a real `streamlit run app.py` server over the same
+# websocket protocol the browser uses (protobuf BackMsg/ForwardMsg on
+# /_stcore/stream), so they exercise the single-process script-runner model
+# as deployed. Upstream APIs are replaced by a local mock, so results measure
+# the app (and its caches) rather than CoinGecko or DexScreener.
+
+MOCK_COINS = ["bitcoin", "ethereum", "solana", "dogecoin", "cardano", "ripple", "tron", "polkadot"] + [
+    f"mock-coin-{i}" for i in range(192)
+]
+SYMBOLS = {"bitcoin": "btc", "ethereum": "eth", "solana": "sol", "dogecoin": "doge",
+           "cardano": "ada", "ripple": "xrp", "tron": "trx", "polkadot": "dot"}
+COIN_QUERIES = ["btc", "eth", "sol", "doge", "bitcoin", "ethereum", "ada", "xrp"]
+ETH_ADDRESSES = [f"0x{i:040x}" for i in range(1, 21)]
+
+# --- Mock Upstream ---
+
+def _symbol(coin_id: str) -> str:
+    return SYMBOLS.get(coin_id, coin_id[-6:])
+
+def _coin(coin_id: str, rank: int) -> dict:
+    return {"id": coin_id, "symbol": _symbol(coin_id), "name": coin_id.replace("-", " ").title(), "market_cap_rank": rank}
+
+def _details(coin_id: str) -> dict:
+    return {
+        "id": coin_id,
+        "name": coin_id.title(),
+        "symbol": coin_id[:3],
+        "asset_platform_id": None,
+        "description": {"en": "A mock coin. " * 80},
+        "market_data": {
+            "current_price": {"usd": 101.5},
+            "market_cap": {"usd": 1.0e9},
+            "ath": {"usd": 250.0},
+            "atl": {"usd": 0.5},
+            "price_change_percentage_24h": 1.25,
+            "total_supply": 1e7,
+            "max_supply": 2e7,
+            "circulating_supply": 9e6,
+        },
+        "tickers": [{
+            "base": "MOCK",
+            "target": "USDT",
+            "market": {"name": "Mock Exchange"},
+            "converted_last": {"usd": 101.5},
+            "converted_volume": {"usd": 5.0e6},
+            "trust_score": "green",
+            "trade_url": "https://example.com/trade",
+        }] * 50,
+    }
+
+def _pair(address: str, i: int) -> dict:
+    return {
+        "chainId": "ethereum",
+        "dexId": f"dex-{i % 3}",
+        "url": f"https://dexscreener.com/ethereum/{address}",
+        "pairAddress": f"0x{i:04x}{address[6:]}",
+        "baseToken": {"address": address, "symbol": "MOCK"},
+        "quoteToken": {"symbol": "WETH"},
+        "priceNative": "0.0004",
+        "priceUsd": "1.23",
+        "txns": {window: {"buys": 10 * i + 1, "sells": 5 * i + 1} for window in ("m5", "h1", "h6", "h24")},
+        "volume": {window: 1000.0 * (i + 1) for window in ("m5", "h1", "h6", "h24")},
+        "priceChange": {window: 0.5 * i for window in ("m5", "h1", "h6", "h24")},
+        "liquidity": {"usd": 50000.0 * (i + 1)},
+        "marketCap": 1.0e6,
+        "fdv": 2.0e6,
+        "boosts": {"active": i},
+    }
+
+def _route(path: str, query: dict) -> object:
+    parts = [part for part in path.split("/") if part]
+    if parts[:2] == ["api", "v3"]:
+        parts = parts[2:]
+        if parts == ["search"]:
+            q = query.get("query", [""])[0].lower()
+            matches = [_coin(coin_id, rank + 1) for rank, coin_id in enumerate(MOCK_COINS) if q in (coin_id, _symbol(coin_id))]
+            return {"coins": matches[:10]}
+        if parts == ["simple", "price"]:
+            ids = query.get("ids", [""])[0].split(",")
+            return {i: {"usd": 101.5, "usd_market_cap": 1e9, "usd_24h_vol": 5e7, "usd_24h_change": 1.2} for i in ids}
+        if parts == ["search", "trending"]:
+            return {"coins": [{"item": {
+                "id": coin_id,
+                "name": coin_id.title(),
+                "symbol": _symbol(coin_id),
+                "market_cap_rank": rank + 1,
+                "data": {"price": 0.5 + rank, "market_cap": "$1,000,000", "market_cap_btc": "15.2",
+                         "total_volume": "$50,000", "total_volume_btc": "0.7"},
+            }} for rank, coin_id in enumerate(MOCK_COINS[:15])]}
+        if parts == ["global"]:
+            return {"data": {
+                "active_cryptocurrencies": 15000,
+                "market_cap_percentage": {"btc": 54.1, "eth": 16.8, "usdt": 4.1},
+                "market_cap_change_percentage_24h_usd": 0.8,
+            }}
+        if parts[:2] == ["companies", "public_treasury"]:
+            return {
+                "total_holdings": 500000,
+                "total_value_usd": 3.0e10,
+                "market_cap_dominance": 2.5,
+                "companies": [{
+                    "name": f"Company {i}",
+                    "symbol": f"C{i}",
+                    "country": ["US", "JP", "DE", "CA"][i % 4],
+                    "total_holdings": 1000 * (100 - i),
+                    "total_current_value_usd": 6.0e7 * (100 - i),
+                    "percentage_of_total_supply": 0.01 * (100 - i),
+                } for i in range(100)],
+            }
+        if parts == ["coins", "categories"]:
+            return [{"id": f"category-{i}", "name": f"Category {i}", "market_cap": 1.0e9 / (i + 1), "market_cap_change_24h": 10.0 - i,
+                     "top_3_coins_id": MOCK_COINS[i:i + 3]} for i in range(100)]
+        if parts == ["coins", "markets"]:
+            if query.get("page", ["1"])[0] != "1":
+                return []
+            return [dict(_coin(coin_id, rank + 1), current_price=100.0 / (rank + 1), market_cap=1e11 / (rank + 1),
+                         total_volume=1e9 / (rank + 1), price_change_percentage_24h=1.0) for rank, coin_id in enumerate(MOCK_COINS)]
+        if parts == ["coins", "list"]:
+            return [{"id": coin_id, "symbol": _symbol(coin_id), "name": coin_id.title(),
+                     "platforms": {"ethereum": ETH_ADDRESSES[i]} if i < len(ETH_ADDRESSES) else {}}
+                    for i, coin_id in enumerate(MOCK_COINS)]
+        if len(parts) == 3 and parts[0] == "coins" and parts[2] == "ohlc":
+            days = int(query.get("days", ["1"])[0])
+            start = int(time.time() // 14400 * 14400 * 1000) - days * 86400 * 1000
+            return [[start + i * 14400 * 1000, 100 + i % 7, 103 + i % 5, 97 - i % 3, 100 + i % 11] for i in range(days * 6)]
+        if len(parts) == 3 and parts[0] == "coins" and parts[2] == "market_chart":
+            days = int(query.get("days", ["1"])[0])
+            start = int(time.time() * 1000) - days * 86400 * 1000
+            return {"prices": [[start + i * 86400 * 1000, 100 + 5 * np.sin(i)] for i in range(days + 1)]}
+        if len(parts) == 4 and parts[0] == "coins" and parts[2:] == ["market_chart", "range"]:
+            start, end = int(query["from"][0]), int(query["to"][0])
+            step = 300 if end - start <= 86400 else 3600
+            return {"prices": [[t * 1000, 100 + 5 * np.sin(t / 7200)] for t in range(start - start % step + step, end + 1, step)]}
+        if len(parts) == 4 and parts[0] == "coins" and parts[2] == "contract":
+            return _details(MOCK_COINS[0])
+        if len(parts) == 2 and parts[0] == "coins":
+            return _details(parts[1])
+    if parts[:2] == ["token-boosts", "top"]:
+        return [{"url": f"https://dexscreener.com/ethereum/{address}", "chainId": "ethereum", "tokenAddress": address,
+                 "description": "Mock boosted token", "links": [{"type": "twitter", "url": "https://example.com"}]}
+                for address in ETH_ADDRESSES]
+    if parts[:2] == ["orders", "v1"]:
+        return [{"type": "tokenProfile", "status": "approved", "paymentTimestamp": 1.7e12}]
+    if parts[:2] == ["tokens", "v1"]:
+        return [_pair(address, i) for address in parts[3].split(",") for i in range(3)]
+    if parts[:3] == ["latest", "dex", "tokens"]:
+        addresses = parts[3].split(",")
+        return {"pairs": [_pair(address, i) for address in addresses for i in range(12)]}
+    return None
+
+def _path_label(path: str) -> str:
+    parts = [part for part in path.split("/") if part]
+    if parts[:2] == ["api", "v3"]:
+        parts = parts[2:]
+    return "/" + "/".join(parts[:2])
+
+class MockUpstream:
+    """
+    Local stand-in for the CoinGecko and DexScreener APIs with a fixed
+    per-request latency. Responses carry an ETag, so conditional requests are
+    answered with 304 like the real APIs do.
+    """
+
+    def __init__(self, latency_ms: float = 50.0):
+        self.latency = latency_ms / 1000
+        self.requests = Counter()
+        self._lock = threading.Lock()
+        upstream = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                parsed = urllib.parse.urlsplit(self.path)
+                with upstream._lock:
+                    upstream.requests[_path_label(parsed.path)] += 1
+                time.sleep(upstream.latency)
+                payload = _route(parsed.path, urllib.parse.parse_qs(parsed.query))
+                if payload is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body = json.dumps(payload).encode()
+                etag = f'"{hash(body) & 0xFFFFFFFF:x}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="mock-upstream", daemon=True).start()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    def total_requests(self) -> int:
+        with self._lock:
+            return sum(self.requests.values())
+
+# --- Simulated Sessions ---
+
+def _input(key: str, value):
+    return (key, value)
+
+# (weight, sidebar command, inputs as (widget key, value), button label)
+COMMAND_MIX = [
+    (20, "Search Coin", lambda rng: [_input("search_input", rng.choice(COIN_QUERIES))]),
+    (12, "Trending Coins", lambda rng: []),
+    (8, "Market Dominance", lambda rng: []),
+    (4, "Companies Holdings", lambda rng: [_input("company_coin_select", rng.choice(["bitcoin", "ethereum"]))]),
+    (4, "Coin Categories", lambda rng: []),
+    (8, "Coin Details (by Name)", lambda rng: [_input("coin_details_name_input", rng.choice(COIN_QUERIES))]),
+    (4, "Coin Details (by Address)", lambda rng: [_input("contract_address_input", rng.choice(ETH_ADDRESSES))]),
+    (12, "Balance of Power (BOP)", lambda rng: [
+        _input("bop_coin_input", rng.choice(COIN_QUERIES)),
+        _input("bop_days_select", rng.choice(["1", "7", "14", "90", "365"])),
+    ]),
+    (12, "Relative Strength Index (RSI)", lambda rng: [
+        _input("rsi_coin_input", rng.choice(COIN_QUERIES)),
+        _input("rsi_days_slider", rng.randint(2, 14)),
+    ]),
+    (6, "Top Boosted Tokens", lambda rng: []),
+    (3, "Latest Boosted Tokens", lambda rng: []),
+    (3, "Token Orders", lambda rng: [_input("token_order_address_input", rng.choice(ETH_ADDRESSES))]),
+    (8, "Trade Info", lambda rng: [_input("trade_info_token_address_input", rng.choice(ETH_ADDRESSES))]),
+]
+
+def _widget_id(element) -> str:
+    widget = getattr(element, element.WhichOneof("type"))
+    return widget.id if "id" in widget.DESCRIPTOR.fields_by_name else ""
+
+def _widget_state(element, value):
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+    kind = element.WhichOneof("type")
+    widget = getattr(element, kind)
+    state = WidgetState(id=widget.id)
+    if kind in ("radio", "selectbox"):
+        state.int_value = list(widget.options).index(value)
+    elif kind == "slider":
+        state.double_array_value.data.append(value)
+    elif kind == "text_input":
+        state.string_value = value
+    else:
+        raise ValueError(f"Unsupported widget type: {kind}")
+    return state
+
+class SimulatedSession:
+    """
+    A browser-less dashboard session speaking Streamlit's websocket protocol.
+    """
+
+    def __init__(self, url: str, rng: random.Random):
+        self.url = url
+        self.rng = rng
+        self.ws = None
+        self._message_cache = {}
+
+    async def connect(self):
+        from tornado.websocket import websocket_connect
+
+        self.ws = await websocket_connect(self.url, subprotocols=["streamlit"], max_message_size=64 * 2**20)
+
+    def close(self):
+        if self.ws is not None:
+            self.ws.close()
+
+    async def rerun(self, widget_states: list) -> list:
+        """
+        Requests a script run with the given widget states and waits for it to
+        finish.
+
+        Returns:
+            list: The Element protos the run produced.
+        """
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        msg.rerun_script.widget_states.widgets.extend(widget_states)
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+
+        elements = []
+        while True:
+            payload = await self.ws.read_message()
+            if payload is None:
+                raise ConnectionError("Server closed the websocket.")
+            forward = ForwardMsg.FromString(payload)
+            if forward.WhichOneof("type") == "ref_hash":
+                forward = self._message_cache.get(forward.ref_hash, forward)
+            elif forward.hash:
+                self._message_cache[forward.hash] = forward
+            kind = forward.WhichOneof("type")
+            if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                elements.append(forward.delta.new_element)
+            elif kind == "script_finished":
+                if forward.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    elements = []
+                    continue
+                return elements
+
+    async def run_command(self, command: str, inputs: list) -> tuple[float, bool]:
+        """
+        Picks a sidebar command, fills its inputs and clicks its button.
+
+        Returns:
+            tuple[float, bool]: The latency of the button run in seconds and
+                                whether it rendered an error.
+        """
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        elements = await self.rerun([])
+        radio = next(e for e in elements if e.WhichOneof("type") == "radio")
+        states = [_widget_state(radio, command)]
+        elements = await self.rerun(states)
+        if inputs:
+            for key, value in inputs:
+                element = next(e for e in elements if _widget_id(e).endswith(f"-{key}"))
+                states.append(_widget_state(element, value))
+            elements = await self.rerun(states)
+
+        button = next(e for e in elements if e.WhichOneof("type") == "button")
+        start = time.perf_counter()
+        elements = await self.rerun(states + [WidgetState(id=button.button.id, trigger_value=True)])
+        latency = time.perf_counter() - start
+        failed = any(
+            e.WhichOneof("type") == "exception"
+            or (e.WhichOneof("type") == "alert" and e.alert.format == e.alert.ERROR)
+            for e in elements
+        )
+        return latency, failed
+
+async def _run_session(url: str, session_no: int, commands: int, results: list):
+    rng = random.Random(session_no)
+    weights = [weight for weight, _, _ in COMMAND_MIX]
+    session = SimulatedSession(url, rng)
+    await session.connect()
+    try:
+        for _ in range(commands):
+            _, command, make_inputs = rng.choices(COMMAND_MIX, weights)[0]
+            results.append(await session.run_command(command, make_inputs(rng)))
+    finally:
+        session.close()
+
+# --- Server Under Test ---
+
+class DashboardServer:
+    """
+    Runs `streamlit run app.py` headless in a subprocess pointed at the mock.
+    """
+
+    def __init__(self, upstream: MockUpstream, port: int):
+        env = dict(os.environ)
+        env["COINGECKO_BASE_URL"] = f"{upstream.base_url}/api/v3"
+        env["DEXSCREENER_BASE_URL"] = upstream.base_url
+        # Start cold, and keep mock data out of the real warm-restart snapshot,
+        # the host-wide shared cache and the metrics port of a dashboard
+        # already running on this host.
+        env["SNAPSHOT_PATH"] = ""
+        env["SHARED_CACHE_PATH"] = ""
+        env["METRICS_PORT"] = ""
+        self.port = port
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", "app.py",
+             "--server.headless", "true", "--server.port", str(port),
+             "--browser.gatherUsageStats", "false"],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    @property
+    def stream_url(self) -> str:
+        return f"ws://127.0.0.1:{self.port}/_stcore/stream"
+
+    def wait_ready(self, timeout: float = 60.0):
+        import requests
+
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            try:
+                if requests.get(f"http://127.0.0.1:{self.port}/_stcore/health", timeout=1).ok:
+                    return
+            except requests.exceptions.RequestException:
+                pass
+            time.sleep(0.25)
+        raise TimeoutError("Streamlit server did not become healthy.")
+
+    def cpu_seconds(self) -> float:
+        with open(f"/proc/{self.process.pid}/stat") as stat:
+            fields = stat.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+    def rss_bytes(self) -> int:
+        with open(f"/proc/{self.process.pid}/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+    def stop(self):
+        self.process.terminate()
+        self.process.wait(timeout=10)
+
+def run_level(server: DashboardServer, upstream: MockUpstream, sessions: int, commands: int) -> dict:
+    """
+    Runs `sessions` concurrent simulated sessions of `commands` commands each.
+
+    Args:
+        server (DashboardServer): The dashboard server under test.
+        upstream (MockUpstream): The mock upstream the server is pointed at.
+        sessions (int): The number of concurrent sessions.
+        commands (int): The number of commands each session runs.
+
+    Returns:
+        dict: Throughput, latency percentiles, server CPU/RSS and upstream amplification.
+    """
+    results = []
+
+    async def run_all():
+        outcomes = await asyncio.gather(
+            *(_run_session(server.stream_url, i, commands, results) for i in range(sessions)),
+            return_exceptions=True,
+        )
+        return [outcome for outcome in outcomes if isinstance(outcome, Exception)]
+
+    upstream_before = upstream.total_requests()
+    cpu_before = server.cpu_seconds()
+    start = time.perf_counter()
+    session_failures = asyncio.run(run_all())
+    wall = time.perf_counter() - start
+
+    latencies = np.array([latency for latency, _ in results]) * 1e3
+    upstream_calls = upstream.total_requests() - upstream_before
+    percentile = lambda q: float(np.percentile(latencies, q)) if len(latencies) else float("nan")
+    return {
+        "sessions": sessions,
+        "commands": len(results),
+        "errors": sum(failed for _, failed in results) + len(session_failures),
+        "throughput_cmd_s": len(results) / wall,
+        "p50_ms": percentile(50),
+        "p95_ms": percentile(95),
+        "p99_ms": percentile(99),
+        "server_cpu_cores": (server.cpu_seconds() - cpu_before) / wall,
+        "server_rss_mb": server.rss_bytes() / 2**20,
+        "upstream_calls": upstream_calls,
+        "amplification": upstream_calls / len(results) if results else float("nan"),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for the dashboard against a mock upstream.")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10, 25, 50, 100],
+                        help="Concurrent session counts to run, one level each.")
+    parser.add_argument("--commands", type=int, default=20, help="Commands per session.")
+    parser.add_argument("--upstream-latency-ms", type=float, default=50.0)
+    parser.add_argument("--port", type=int, default=8599)
+    parser.add_argument("--json", help="Also write the results to this file.")
+    args = parser.parse_args()
+
+    upstream = MockUpstream(args.upstream_latency_ms)
+    server = DashboardServer(upstream, args.port)
+    rows = []
+    try:
+        server.wait_ready()
+        print(f"{'sessions':>8}{'cmds':>7}{'errors':>7}{'cmd/s':>9}{'p50':>10}{'p95':>10}{'p99':>10}"
+              f"{'cpu':>7}{'rss':>9}{'upstream':>10}{'ampl.':>7}")
+        for sessions in args.sessions:
+            row = run_level(server, upstream, sessions, args.commands)
+            rows.append(row)
+            print(
+                f"{row['sessions']:>8}{row['commands']:>7}{row['errors']:>7}{row['throughput_cmd_s']:>9.1f}"
+                f"{row['p50_ms']:>8.0f}ms{row['p95_ms']:>8.0f}ms{row['p99_ms']:>8.0f}ms"
+                f"{row['server_cpu_cores']:>7.2f}{row['server_rss_mb']:>7.0f}MB"
+                f"{row['upstream_calls']:>10}{row['amplification']:>7.2f}"
+            )
+    finally:
+        server.stop()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"upstream_by_path": dict(upstream.requests), "levels": rows}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
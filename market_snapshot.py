@@ -0,0 +1,263 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import api_client
+import persistence
+
+# Number of `/coins/markets` pages (250 coins each) kept in memory.
+SNAPSHOT_PAGES = 8
+# How often the background loader refreshes the table.
+REFRESH_INTERVAL_SECONDS = 60
+# Lookups are only served from a table younger than this, so a stalled
+# loader never serves prices that are minutes out of date.
+MAX_SNAPSHOT_AGE_SECONDS = 5 * 60
+
+COLUMNS = [
+    "id",
+    "symbol",
+    "name",
+    "market_cap_rank",
+    "current_price",
+    "market_cap",
+    "total_volume",
+    "price_change_percentage_24h",
+]
+
+def _number_or_na(value) -> float | str:
+    # Missing fields are NaN in the table; callers expect "N/A" like the API path.
+    return float(value) if pd.notna(value) else "N/A"
+
+class MarketSnapshot:
+    """
+    Columnar in-memory table of the top coins by market cap.
+
+    The table is a pandas DataFrame indexed by coin id, with a secondary
+    symbol index (symbol -> ids ordered by market cap) and a name index.
+    A refresh builds a complete new table and swaps it in, so readers never
+    see a half-updated snapshot.
+    """
+
+    def __init__(self, pages: int = SNAPSHOT_PAGES, refresh_interval: float = REFRESH_INTERVAL_SECONDS):
+        self.pages = pages
+        self.refresh_interval = refresh_interval
+        self.updated_at = 0.0
+        self._table = pd.DataFrame(columns=COLUMNS).set_index("id")
+        self._symbol_index: dict[str, list[str]] = {}
+        self._name_index: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        """
+        Starts the background refresh loop (idempotent).
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="market-snapshot", daemon=True)
+        self.restore()
+        self._thread.start()
+
+    def _run(self):
+        # A table restored from the boot snapshot is refreshed once it is due.
+        time.sleep(max(0.0, self.updated_at + self.refresh_interval - time.time()))
+        while True:
+            try:
+                error = self.refresh()
+                if error:
+                    print(f"Market snapshot refresh failed: {error}")
+            except Exception as e:
+                print(f"Market snapshot refresh failed: {e}")
+            time.sleep(self.refresh_interval)
+
+    def refresh(self) -> str | None:
+        """
+        Reloads all pages from `/coins/markets` and swaps in the new table.
+
+        Returns:
+            str | None: An error message if the first page could not be fetched.
+                        Later page failures just shorten the table.
+        """
+        rows = []
+        for page in range(1, self.pages + 1):
+            data, error = api_client.fetch_coin_markets(page)
+            if error:
+                if page == 1:
+                    return error
+                break
+            rows.extend(data)
+            if len(data) < api_client.COIN_MARKETS_PER_PAGE:
+                break
+        self._load(rows, time.time())
+        return None
+
+    def restore(self) -> bool:
+        """
+        Loads the table from the boot snapshot (see `persistence`), keeping
+        its age, unless a newer table is loaded already.
+
+        Returns:
+            bool: Whether a table was restored.
+        """
+        restored = persistence.restore("market_snapshot", "table")
+        if restored is None or restored[1]["updated_at"] <= self.updated_at:
+            return False
+        rows, meta = restored
+        self._load(rows, meta["updated_at"])
+        return True
+
+    def dump(self):
+        """
+        Yields the snapshot entry of the current table.
+        """
+        if self.updated_at:
+            rows = self._table.reset_index()[COLUMNS].to_dict("records")
+            meta, payload = persistence.encode_json(rows, {"updated_at": self.updated_at})
+            yield "table", meta, payload
+
+    def _load(self, rows: list[dict], updated_at: float):
+        # Builds a complete table and its indexes, then swaps them in.
+        table = pd.DataFrame.from_records(rows, columns=COLUMNS)
+        table = table.dropna(subset=["id"]).drop_duplicates("id").set_index("id")
+        table["symbol"] = table["symbol"].str.lower()
+        table = table.sort_values("market_cap", ascending=False, na_position="last")
+
+        symbol_index: dict[str, list[str]] = {}
+        for coin_id, symbol in zip(table.index, table["symbol"]):
+            symbol_index.setdefault(symbol, []).append(coin_id)
+        name_index: dict[str, str] = {}
+        for coin_id, name in zip(table.index, table["name"].str.lower()):
+            name_index.setdefault(name, coin_id)
+
+        with self._lock:
+            self._table = table
+            self._symbol_index = symbol_index
+            self._name_index = name_index
+            self.updated_at = updated_at
+
+    def is_fresh(self) -> bool:
+        return time.time() - self.updated_at < MAX_SNAPSHOT_AGE_SECONDS
+
+    @property
+    def table(self) -> pd.DataFrame:
+        """
+        The current snapshot (treat as read-only).
+        """
+        return self._table
+
+    def resolve_id(self, query: str) -> str | None:
+        """
+        Resolves an exact id, symbol or name to a coin id.
+
+        Symbols shared by several coins resolve to the one with the largest
+        market cap, which is what `/search` ranks first as well.
+
+        Args:
+            query (str): The coin id, symbol or name (case-insensitive).
+
+        Returns:
+            str | None: The coin id, or None if the query is not covered.
+        """
+        return self._resolve(query)[0]
+
+    def _resolve(self, query: str) -> tuple[str | None, pd.DataFrame]:
+        key = query.strip().lower()
+        with self._lock:
+            table, symbols, names = self._table, self._symbol_index, self._name_index
+        if key in table.index:
+            return key, table
+        if key in symbols:
+            return symbols[key][0], table
+        return names.get(key), table
+
+    def lookup(self, query: str) -> dict | None:
+        """
+        Returns Search Coin data for a query without any upstream call.
+
+        Args:
+            query (str): The coin id, symbol or name.
+
+        Returns:
+            dict | None: Data shaped like `api_client.fetch_search_data`, or None
+                         if the coin is not covered or the snapshot is stale.
+        """
+        if not self.is_fresh():
+            return None
+        coin_id, table = self._resolve(query)
+        if coin_id is None:
+            return None
+        row = table.loc[coin_id]
+        if pd.isna(row["current_price"]):
+            return None
+
+        rank = row["market_cap_rank"]
+        return {
+            "coin_id": coin_id,
+            "name": row["name"],
+            "market_cap_rank": int(rank) if pd.notna(rank) else "N/A",
+            "symbol": row["symbol"],
+            "usd_price": float(row["current_price"]),
+            "usd_market_cap": _number_or_na(row["market_cap"]),
+            "usd_24h_vol": _number_or_na(row["total_volume"]),
+            "usd_24h_change": _number_or_na(row["price_change_percentage_24h"]),
+        }
+
+    def get_many(self, coin_ids: list[str]) -> pd.DataFrame:
+        """
+        Returns the rows for a list of coin ids (e.g. a watchlist), skipping
+        ids that are not covered by the snapshot.
+
+        Args:
+            coin_ids (list[str]): The coin ids.
+
+        Returns:
+            pd.DataFrame: The matching rows, in the requested order.
+        """
+        table = self._table
+        return table.loc[[coin_id for coin_id in coin_ids if coin_id in table.index]]
+
+    def screen(
+        self,
+        min_market_cap: float | None = None,
+        min_volume: float | None = None,
+        min_change_24h: float | None = None,
+        max_change_24h: float | None = None,
+        limit: int = 50,
+    ) -> pd.DataFrame:
+        """
+        Filters the snapshot with vectorized column predicates.
+
+        Args:
+            min_market_cap (float | None): Minimum market cap in USD.
+            min_volume (float | None): Minimum 24h volume in USD.
+            min_change_24h (float | None): Minimum 24h price change in percent.
+            max_change_24h (float | None): Maximum 24h price change in percent.
+            limit (int): Maximum number of rows returned.
+
+        Returns:
+            pd.DataFrame: The matching rows ordered by market cap.
+        """
+        table = self._table
+        mask = np.ones(len(table), dtype=bool)
+        if min_market_cap is not None:
+            mask &= (table["market_cap"] >= min_market_cap).to_numpy()
+        if min_volume is not None:
+            mask &= (table["total_volume"] >= min_volume).to_numpy()
+        if min_change_24h is not None:
+            mask &= (table["price_change_percentage_24h"] >= min_change_24h).to_numpy()
+        if max_change_24h is not None:
+            mask &= (table["price_change_percentage_24h"] <= max_change_24h).to_numpy()
+        return table[mask].head(limit)
+
+_snapshot = MarketSnapshot()
+persistence.register("market_snapshot", _snapshot.dump)
+
+def get_snapshot() -> MarketSnapshot:
+    """
+    Returns the process-wide snapshot, starting its loader on first use.
+    """
+    _snapshot.start()
+    return _snapshot
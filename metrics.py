@@ -0,0 +1,280 @@
+import bisect
+import functools
+import os
+import threading
+import time
+import weakref
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Port of the Prometheus endpoint (http://host:port/metrics); set METRICS_PORT
+# to "" to disable it. Each app process needs its own port.
+METRICS_PORT = os.getenv("METRICS_PORT", "9464")
+# Loopback only by default; set METRICS_HOST (e.g. "0.0.0.0") to let a remote
+# scraper reach the endpoint.
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+PREFIX = "pumpies_"
+# Upper bounds in seconds; every histogram also has a +Inf bucket.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()):
+        self.name = PREFIX + name
+        self.help = help_text
+        self.labels = labels
+        self._lock = threading.Lock()
+
+    def _header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(_Metric):
+    """
+    A monotonically increasing value per label combination.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *label_values, amount: float = 1.0):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return self._header() + [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}" for key, value in values
+        ]
+
+class Histogram(_Metric):
+    """
+    Counts observations into cumulative buckets per label combination.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+        self._series: dict[tuple, list] = {}  # labels -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, value: float, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = [(key, list(series)) for key, series in self._series.items()]
+        lines = self._header()
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                bound_label = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, bound_label)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}")
+        return lines
+
+class Callback(_Metric):
+    """
+    A metric read from existing state at scrape time, so the code it
+    describes needs no instrumentation at all.
+
+    `read` returns a dict of label-value tuples to values.
+    """
+
+    def __init__(self, name: str, help_text: str, kind: str, labels: tuple[str, ...], read):
+        super().__init__(name, help_text, labels)
+        self.kind = kind
+        self.read = read
+
+    def render(self) -> list[str]:
+        try:
+            values = self.read()
+        except Exception as e:
+            print(f"Metric {self.name} could not be read: {e}")
+            return []
+        return self._header() + [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}" for key, value in values.items()
+        ]
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """
+        Returns every metric in the Prometheus text exposition format.
+        """
+        with self._lock:
+            metrics = list(self._metrics)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+def counter(name: str, help_text: str, labels: tuple[str, ...] = ()) -> Counter:
+    return registry.register(Counter(name, help_text, labels))
+
+def histogram(name: str, help_text: str, labels: tuple[str, ...] = (), buckets: tuple = LATENCY_BUCKETS) -> Histogram:
+    return registry.register(Histogram(name, help_text, labels, buckets))
+
+def callback(name: str, help_text: str, kind: str, labels: tuple[str, ...], read) -> Callback:
+    return registry.register(Callback(name, help_text, kind, labels, read))
+
+# --- Instrumentation ---
+
+UPSTREAM_REQUESTS = counter(
+    "upstream_requests_total", "Requests sent upstream, by endpoint and HTTP status.", ("endpoint", "status")
+)
+UPSTREAM_LATENCY = histogram(
+    "upstream_request_duration_seconds", "Upstream request latency, by endpoint and HTTP status.", ("endpoint", "status")
+)
+RATE_LIMIT_WAITS = counter("rate_limit_waits_total", "Requests delayed by a host's rate limiter.", ("host",))
+RATE_LIMIT_WAIT_SECONDS = counter(
+    "rate_limit_wait_seconds_total", "Time requests spent waiting for a host's rate limiter.", ("host",)
+)
+FETCH_CALLS = counter("fetch_calls_total", "api_client fetch calls, by function and outcome.", ("function", "outcome"))
+FETCH_LATENCY = histogram("fetch_duration_seconds", "api_client fetch call duration, by function.", ("function",))
+COMMAND_RUNS = counter("command_runs_total", "Command panel renders, by command.", ("command",))
+COMMAND_LATENCY = histogram("command_duration_seconds", "Command panel render duration, by command.", ("command",))
+WORKER_POOL_SHED = counter("worker_pool_shed_total", "Upstream work shed by the worker pool, by priority.", ("priority",))
+FETCH_STEP_LATENCY = histogram("fetch_step_duration_seconds", "Duration of the steps of multi-step fetches, by step.", ("step",))
+DEADLINE_OUTCOMES = counter(
+    "deadline_outcomes_total", "Commands run under a deadline, by outcome (met, stale, partial, expired).", ("outcome",)
+)
+
+def instrument_fetch(fetch):
+    """
+    Decorates an api_client `fetch_*` function to count its calls by outcome
+    ("error" when it returns an error message, "exception" when it raises,
+    "ok" otherwise) and time them.
+    """
+    name = fetch.__name__
+
+    @functools.wraps(fetch)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        outcome = "exception"
+        try:
+            result = fetch(*args, **kwargs)
+            outcome = "error" if isinstance(result, tuple) and isinstance(result[1], str) else "ok"
+            return result
+        finally:
+            FETCH_LATENCY.observe(time.perf_counter() - started, name)
+            FETCH_CALLS.inc(name, outcome)
+
+    return wrapper
+
+def instrument_command(display):
+    """
+    Decorates a `display_*` command to count and time its renders.
+    """
+    name = display.__name__.removeprefix("display_")
+
+    @functools.wraps(display)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return display(*args, **kwargs)
+        finally:
+            COMMAND_LATENCY.observe(time.perf_counter() - started, name)
+            COMMAND_RUNS.inc(name)
+
+    return wrapper
+
+# --- Sessions ---
+
+class _SessionMarker:
+    __slots__ = ("__weakref__",)
+
+_live_sessions = weakref.WeakSet()
+
+def track_session(session_state):
+    """
+    Counts a session as active until Streamlit drops its session state.
+    """
+    if "_metrics_session" not in session_state:
+        marker = _SessionMarker()
+        session_state["_metrics_session"] = marker
+        _live_sessions.add(marker)
+
+callback("active_sessions", "Sessions with live session state in this process.", "gauge", (),
+         lambda: {(): len(_live_sessions)})
+
+# --- Server ---
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+_server = None
+_server_lock = threading.Lock()
+_server_failed = False
+
+def start_server(port: str = METRICS_PORT, host: str = METRICS_HOST) -> ThreadingHTTPServer | None:
+    """
+    Serves `/metrics` on a side port from a daemon thread (idempotent).
+
+    Returns:
+        ThreadingHTTPServer | None: The server, or None if disabled or the
+                                    port could not be bound.
+    """
+    global _server, _server_failed
+    if not port or _server_failed:
+        return _server
+    with _server_lock:
+        if _server is None and not _server_failed:
+            try:
+                _server = ThreadingHTTPServer((host, int(port)), _Handler)
+            except OSError as e:
+                print(f"Metrics endpoint unavailable on port {port}: {e}")
+                _server_failed = True
+                return None
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+    return _server
@@ -0,0 +1,267 @@
+import atexit
+import json
+import mmap
+import os
+import stat
+import struct
+import tempfile
+import threading
+import time
+import zlib
+
+import numpy as np
+
+# Where the warm-restart snapshot is kept (by default in the user's cache
+# directory, not the shared temp dir); set SNAPSHOT_PATH to "" to disable
+# snapshots. Processes sharing a path restore whichever of them wrote last.
+_DEFAULT_DIR = os.path.join(os.getenv("XDG_CACHE_HOME") or os.path.expanduser(os.path.join("~", ".cache")), "pumpies")
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", os.path.join(_DEFAULT_DIR, "snapshot.bin"))
+SNAPSHOT_INTERVAL_SECONDS = 5 * 60
+# Snapshots older than this are ignored on boot.
+SNAPSHOT_MAX_AGE_SECONDS = 24 * 60 * 60
+# zlib level for JSON payloads; level 1 already shrinks API bodies several
+# times and decompresses far faster than the bodies parse.
+COMPRESS_LEVEL = 1
+
+MAGIC = b"PUMPSNP1"
+# Footer: index offset, index length, snapshot time, magic.
+FOOTER = struct.Struct("<QQd8s")
+
+# Layout: MAGIC, the payloads back to back, the zlib-compressed JSON index
+# ({section: {key: [offset, length, meta]}}), then FOOTER. Booting reads only
+# the footer and the index; payloads are decoded when first asked for.
+# Entries not restored by the time the next snapshot is written are carried
+# into it unchanged, tagged with the time of the snapshot they came from
+# (meta "snapshot_saved_at"), so they still expire after SNAPSHOT_MAX_AGE_SECONDS.
+
+def encode_json(value, meta: dict | None = None) -> tuple[dict, bytes]:
+    """
+    Encodes a JSON value as a compressed snapshot payload.
+    """
+    return dict(meta or {}, kind="json"), zlib.compress(json.dumps(value, separators=(",", ":")).encode(), COMPRESS_LEVEL)
+
+def encode_arrays(arrays: list[np.ndarray], meta: dict | None = None) -> tuple[dict, bytes]:
+    """
+    Encodes numpy arrays as one raw snapshot payload.
+    """
+    arrays = [np.ascontiguousarray(array) for array in arrays]
+    specs = [[array.dtype.str, list(array.shape)] for array in arrays]
+    return dict(meta or {}, kind="arrays", arrays=specs), b"".join(array.tobytes() for array in arrays)
+
+def _decode(payload: memoryview, meta: dict):
+    if meta["kind"] == "json":
+        return json.loads(zlib.decompress(payload))
+    arrays, offset = [], 0
+    for dtype, shape in meta["arrays"]:
+        dtype = np.dtype(dtype)
+        count = int(np.prod(shape, dtype=np.int64))
+        arrays.append(np.frombuffer(payload, dtype, count, offset).reshape(shape).copy())
+        offset += count * dtype.itemsize
+    return arrays
+
+class SnapshotReader:
+    """
+    Read access to a snapshot file, mapped into memory.
+
+    Each entry is decoded at most once: `take` hands it over and forgets it,
+    since the live structure it restores is newer from then on. Entries nobody
+    took are handed on to the next snapshot by `remaining`.
+    """
+
+    def __init__(self, path: str):
+        # Only map a file this user wrote: never follow a planted symlink, and
+        # refuse a file someone else owns or could have written to.
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+        try:
+            info = os.fstat(fd)
+            if not stat.S_ISREG(info.st_mode) or (
+                hasattr(os, "getuid") and (info.st_uid != os.getuid() or stat.S_IMODE(info.st_mode) != 0o600)
+            ):
+                raise PermissionError(f"{path} is not a regular file owned by this user with mode 0600")
+            self._map = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+        if self._map[:len(MAGIC)] != MAGIC or len(self._map) < len(MAGIC) + FOOTER.size:
+            raise ValueError("not a snapshot file")
+        index_offset, index_length, self.saved_at, magic = FOOTER.unpack_from(self._map, len(self._map) - FOOTER.size)
+        if magic != MAGIC:
+            raise ValueError("truncated snapshot file")
+        self._index = json.loads(zlib.decompress(self._map[index_offset:index_offset + index_length]))
+        self._lock = threading.Lock()
+
+    def sections(self) -> list[str]:
+        with self._lock:
+            return list(self._index)
+
+    def keys(self, section: str) -> list[str]:
+        with self._lock:
+            return list(self._index.get(section, {}))
+
+    def _expired(self, meta: dict) -> bool:
+        return time.time() - meta.get("snapshot_saved_at", self.saved_at) >= SNAPSHOT_MAX_AGE_SECONDS
+
+    def remaining(self, section: str) -> list[tuple[str, dict, bytes]]:
+        """
+        Returns the entries of a section nobody took, as raw (key, meta,
+        payload) entries for `write_snapshot`; expired entries are left out.
+        """
+        with self._lock:
+            entries = list(self._index.get(section, {}).items())
+        return [
+            (key, dict(meta, snapshot_saved_at=meta.get("snapshot_saved_at", self.saved_at)),
+             bytes(self._map[offset:offset + length]))
+            for key, (offset, length, meta) in entries
+            if not self._expired(meta)
+        ]
+
+    def take(self, section: str, key: str) -> tuple | None:
+        """
+        Returns a decoded entry and forgets it.
+
+        Returns:
+            tuple | None: (value, meta), or None if there is no such entry (or
+                          it was taken already). JSON payloads decode to their
+                          value, array payloads to a list of arrays.
+        """
+        with self._lock:
+            found = self._index.get(section, {}).pop(key, None)
+        if found is None or self._expired(found[2]):
+            return None
+        offset, length, meta = found
+        try:
+            return _decode(memoryview(self._map)[offset:offset + length], meta), meta
+        except (ValueError, TypeError, KeyError, zlib.error) as e:
+            print(f"Snapshot entry {section}/{key} could not be restored: {e}")
+            return None
+
+def write_snapshot(path: str, sections: dict, saved_at: float | None = None) -> int:
+    """
+    Writes a snapshot atomically (to a new private temporary file next to
+    `path`, then renamed over it).
+
+    Args:
+        path (str): The snapshot path.
+        sections (dict): Section name -> iterable of (key, meta, payload bytes).
+        saved_at (float | None): The snapshot time; defaults to now.
+
+    Returns:
+        int: The file size in bytes.
+    """
+    index = {}
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    # mkstemp creates the file exclusively with mode 0600, so a name planted
+    # in the directory (e.g. a symlink) is never written through.
+    fd, temporary = tempfile.mkstemp(prefix=f"{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC)
+            offset = len(MAGIC)
+            for section, entries in sections.items():
+                entries_index = index.setdefault(section, {})
+                for key, meta, payload in entries:
+                    f.write(payload)
+                    entries_index[key] = [offset, len(payload), meta]
+                    offset += len(payload)
+            packed_index = zlib.compress(json.dumps(index, separators=(",", ":")).encode(), COMPRESS_LEVEL)
+            f.write(packed_index)
+            f.write(FOOTER.pack(offset, len(packed_index), time.time() if saved_at is None else saved_at, MAGIC))
+            size = f.tell()
+    except BaseException:
+        os.unlink(temporary)
+        raise
+    os.replace(temporary, path)
+    return size
+
+# --- Process-wide snapshot ---
+
+_sections = {}  # section name -> dump callable returning an iterable of entries
+_reader = None
+_reader_loaded = False
+_lock = threading.Lock()
+_thread = None
+
+def register(section: str, dump):
+    """
+    Adds a section to every snapshot this process writes.
+
+    Args:
+        section (str): The section name.
+        dump: Called without arguments at snapshot time; returns an iterable
+              of (key, meta, payload) entries, e.g. built with `encode_json`.
+    """
+    _sections[section] = dump
+
+def get_reader() -> SnapshotReader | None:
+    """
+    Returns the snapshot this process booted with, or None if there is none
+    (disabled, missing, unreadable or older than SNAPSHOT_MAX_AGE_SECONDS).
+    """
+    global _reader, _reader_loaded
+    if _reader_loaded:
+        return _reader
+    with _lock:
+        if not _reader_loaded:
+            if SNAPSHOT_PATH and os.path.exists(SNAPSHOT_PATH):
+                try:
+                    reader = SnapshotReader(SNAPSHOT_PATH)
+                    if time.time() - reader.saved_at < SNAPSHOT_MAX_AGE_SECONDS:
+                        _reader = reader
+                except (OSError, ValueError, zlib.error) as e:
+                    print(f"Snapshot {SNAPSHOT_PATH} could not be read: {e}")
+            _reader_loaded = True
+    return _reader
+
+def restore(section: str, key: str) -> tuple | None:
+    """
+    Takes an entry from the boot snapshot (see `SnapshotReader.take`).
+    """
+    reader = get_reader()
+    return reader.take(section, key) if reader is not None else None
+
+def save() -> int | None:
+    """
+    Writes a snapshot of every registered section now, plus the entries of
+    the boot snapshot that were not restored yet (see `SnapshotReader.remaining`).
+
+    Returns:
+        int | None: The snapshot size in bytes, or None if disabled or failed.
+    """
+    if not SNAPSHOT_PATH:
+        return None
+    # Open the boot snapshot before it is replaced, so entries not restored
+    # yet can still be read from the old file (its mapping outlives the rename).
+    reader = get_reader()
+    try:
+        with _lock:
+            # Carried entries are read before the live dumps, so an entry
+            # restored in between is written once, from the live structure.
+            carried = {section: reader.remaining(section) for section in reader.sections()} if reader is not None else {}
+            sections = {section: list(dump()) for section, dump in _sections.items()}
+            for section, entries in carried.items():
+                live = sections.setdefault(section, [])
+                live_keys = {key for key, _, _ in live}
+                live.extend(entry for entry in entries if entry[0] not in live_keys)
+            return write_snapshot(SNAPSHOT_PATH, sections)
+    except Exception as e:
+        print(f"Snapshot could not be written: {e}")
+        return None
+
+def _run(interval: float):
+    while True:
+        time.sleep(interval)
+        save()
+
+def start(interval: float = SNAPSHOT_INTERVAL_SECONDS):
+    """
+    Starts snapshotting periodically and at interpreter exit (idempotent).
+    """
+    global _thread
+    if not SNAPSHOT_PATH:
+        return
+    with _lock:
+        if _thread is not None:
+            return
+        _thread = threading.Thread(target=_run, args=(interval,), name="snapshot-writer", daemon=True)
+        _thread.start()
+    atexit.register(save)
@@ -0,0 +1,340 @@
+import math
+import os
+import threading
+import time
+
+import numpy as np
+
+import indicators
+from ring_buffer import RingBuffer
+
+# Ticks kept per symbol; views read their windows straight from these buffers.
+BUFFER_CAPACITY = 4096
+# Which registered source `get_feed` starts (see `register_source`).
+PRICE_FEED_SOURCE = os.getenv("PRICE_FEED_SOURCE", "simulated")
+
+SIMULATED_SYMBOLS = ("btc", "eth", "sol", "doge", "ada", "xrp")
+SIMULATED_TICKS_PER_SECOND = 20  # per symbol
+SIMULATED_PUBLISH_INTERVAL_SECONDS = 0.05
+# Annualised volatility of the simulated geometric Brownian motion.
+SIMULATED_VOLATILITY = 0.8
+SECONDS_PER_YEAR = 365 * 24 * 3600
+
+class Subscription:
+    """
+    A consumer's cursor into the feed's per-symbol ring buffers.
+
+    Reading never blocks publishers: each poll copies out only the ticks
+    appended since the previous poll. A subscriber that falls further behind
+    than the buffer capacity skips the overwritten ticks and counts them in
+    `dropped`.
+    """
+
+    def __init__(self, feed, symbols: list[str], history: int = 0):
+        self.feed = feed
+        self.symbols = list(symbols)
+        self.dropped = 0
+        self._cursors = {symbol: max(feed.buffer(symbol).written - history, 0) for symbol in self.symbols}
+
+    def poll(self) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+        """
+        Returns the ticks published since the last poll, without waiting.
+
+        Returns:
+            dict[str, tuple[np.ndarray, np.ndarray]]: Timestamps and prices per
+                                                      symbol that had new ticks.
+        """
+        batches = {}
+        for symbol in self.symbols:
+            timestamps, prices, self._cursors[symbol], dropped = self.feed.buffer(symbol).read_since(self._cursors[symbol])
+            self.dropped += dropped
+            if len(prices):
+                batches[symbol] = (timestamps, prices)
+        return batches
+
+    def wait(self, timeout: float | None = None) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+        """
+        Like `poll`, but waits up to `timeout` seconds for the next publish
+        if nothing is pending.
+        """
+        version = self.feed.version
+        batches = self.poll()
+        if not batches:
+            self.feed.wait_for_publish(version, timeout)
+            batches = self.poll()
+        return batches
+
+    def ticks(self, timeout: float | None = None):
+        """
+        Yields (symbol, timestamp, price) ticks as they are published; stops
+        once `timeout` seconds pass without any.
+        """
+        while True:
+            batches = self.wait(timeout)
+            if not batches:
+                return
+            for symbol, (timestamps, prices) in batches.items():
+                yield from zip((symbol,) * len(prices), timestamps.tolist(), prices.tolist())
+
+class PriceSource:
+    """
+    Base class for push-based price sources.
+
+    A source runs on its own thread and hands batches of ticks to the feed
+    with `feed.publish_many`; subclasses implement `_run` and may override
+    `symbols`.
+    """
+
+    name = "source"
+
+    def __init__(self, symbols: tuple[str, ...]):
+        self.symbols = tuple(symbols)
+        self.feed = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self, feed):
+        self.feed = feed
+        self._thread = threading.Thread(target=self._run, name=f"price-source-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        raise NotImplementedError
+
+class SimulatedPriceSource(PriceSource):
+    """
+    Local geometric-Brownian-motion feed for testing the streaming views
+    without any upstream traffic.
+    """
+
+    name = "simulated"
+
+    def __init__(
+        self,
+        symbols: tuple[str, ...] = SIMULATED_SYMBOLS,
+        ticks_per_second: float = SIMULATED_TICKS_PER_SECOND,
+        initial_prices: dict[str, float] | None = None,
+        volatility: float = SIMULATED_VOLATILITY,
+        publish_interval: float = SIMULATED_PUBLISH_INTERVAL_SECONDS,
+        seed: int | None = None,
+    ):
+        super().__init__(symbols)
+        self.ticks_per_second = ticks_per_second
+        self.volatility = volatility
+        self.publish_interval = publish_interval
+        self._rng = np.random.default_rng(seed)
+        initial_prices = initial_prices or {}
+        self._log_prices = np.log([initial_prices.get(symbol, 100.0) for symbol in self.symbols])
+
+    def next_batch(self, start: float, end: float, count: int) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+        """
+        Advances every symbol by `count` ticks spread evenly over (start, end].
+        """
+        timestamps = np.linspace(start, end, count + 1)[1:]
+        step_std = self.volatility * math.sqrt((end - start) / count / SECONDS_PER_YEAR)
+        log_steps = self._rng.normal(-0.5 * step_std ** 2, step_std, size=(len(self.symbols), count))
+        paths = self._log_prices[:, None] + np.cumsum(log_steps, axis=1)
+        self._log_prices = paths[:, -1]
+        prices = np.exp(paths)
+        return {symbol: (timestamps, prices[row]) for row, symbol in enumerate(self.symbols)}
+
+    def _run(self):
+        last = time.time()
+        pending = 0.0
+        while not self._stop_event.wait(self.publish_interval):
+            now = time.time()
+            pending += (now - last) * self.ticks_per_second
+            count = int(pending)
+            if count:
+                pending -= count
+                self.feed.publish_many(self.next_batch(last, now, count))
+                last = now
+
+class PriceFeed:
+    """
+    Hub between price sources and subscribers: one ring buffer per symbol.
+    """
+
+    def __init__(self, capacity: int = BUFFER_CAPACITY):
+        self.capacity = capacity
+        self.sources = []
+        self.version = 0
+        self._buffers: dict[str, RingBuffer] = {}
+        self._lock = threading.Lock()
+        self._published = threading.Condition()
+
+    @property
+    def symbols(self) -> list[str]:
+        return sorted(self._buffers)
+
+    def buffer(self, symbol: str) -> RingBuffer:
+        buffer = self._buffers.get(symbol)
+        if buffer is None:
+            with self._lock:
+                buffer = self._buffers.setdefault(symbol, RingBuffer(self.capacity))
+        return buffer
+
+    def publish_many(self, batches: dict[str, tuple]):
+        """
+        Appends a batch of ticks per symbol and wakes waiting subscribers once.
+
+        Args:
+            batches (dict[str, tuple]): (timestamps, prices) keyed by symbol.
+        """
+        for symbol, (timestamps, prices) in batches.items():
+            self.buffer(symbol).extend(timestamps, prices)
+        with self._published:
+            self.version += 1
+            self._published.notify_all()
+
+    def publish(self, symbol: str, timestamps, prices):
+        self.publish_many({symbol: (timestamps, prices)})
+
+    def wait_for_publish(self, version: int, timeout: float | None = None) -> bool:
+        with self._published:
+            return self._published.wait_for(lambda: self.version != version, timeout)
+
+    def subscribe(self, symbols: list[str], history: int = 0) -> Subscription:
+        """
+        Subscribes to symbols, optionally replaying up to `history` buffered ticks each.
+        """
+        return Subscription(self, symbols, history)
+
+    def latest(self, symbol: str, count: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the most recent buffered ticks of a symbol (timestamps, prices).
+        """
+        return self.buffer(symbol).latest(count)
+
+    def add_source(self, source: PriceSource):
+        for symbol in source.symbols:
+            self.buffer(symbol)
+        self.sources.append(source)
+        source.start(self)
+
+    def stop(self):
+        for source in self.sources:
+            source.stop()
+
+# --- Source Registry ---
+
+def _simulated_source() -> PriceSource:
+    # Start the random walks from the latest market snapshot when it has loaded.
+    import market_snapshot
+
+    snapshot = market_snapshot.get_snapshot()
+    initial_prices = {}
+    if snapshot.is_fresh():
+        for symbol in SIMULATED_SYMBOLS:
+            coin = snapshot.lookup(symbol)
+            if coin and coin.get("usd_price"):
+                initial_prices[symbol] = coin["usd_price"]
+    return SimulatedPriceSource(initial_prices=initial_prices)
+
+_source_factories = {"simulated": _simulated_source}
+_feed = None
+_feed_lock = threading.Lock()
+
+def register_source(name: str, factory):
+    """
+    Registers a price source factory under a name selectable via PRICE_FEED_SOURCE.
+
+    Args:
+        name (str): The source name.
+        factory: A callable returning a `PriceSource`.
+    """
+    _source_factories[name] = factory
+
+def get_feed() -> PriceFeed:
+    """
+    Returns the process-wide feed, starting the configured source on first use.
+    """
+    global _feed
+    if _feed is None:
+        with _feed_lock:
+            if _feed is None:
+                feed = PriceFeed()
+                feed.add_source(_source_factories[PRICE_FEED_SOURCE]())
+                _feed = feed
+    return _feed
+
+# --- Throughput Measurement ---
+
+def measure_throughput(
+    ticks_per_second: float,
+    duration: float = 3.0,
+    n_symbols: int = 50,
+    n_subscribers: int = 4,
+    rsi_window: int = 256,
+    publish_interval: float = 0.01,
+) -> dict:
+    """
+    Publishes simulated ticks at a target rate while subscribers consume them
+    and recompute an RSI per updated symbol, like a live view would. The feed
+    keeps up with a rate when consumed ~= published and nothing is dropped.
+
+    Args:
+        ticks_per_second (float): Target publish rate over all symbols.
+        duration (float): Seconds to run.
+        n_symbols (int): The number of symbols published.
+        n_subscribers (int): Concurrent subscribers, each on its own thread.
+        rsi_window (int): Ticks each RSI recomputation reads from the buffer.
+        publish_interval (float): Seconds between publishes.
+
+    Returns:
+        dict: Published and consumed (per subscriber) ticks per second, view
+              updates per second per subscriber and the ticks subscribers skipped.
+    """
+    feed = PriceFeed()
+    symbols = tuple(f"sym{i}" for i in range(n_symbols))
+    source = SimulatedPriceSource(symbols, seed=0)
+    for symbol in symbols:
+        feed.buffer(symbol)
+    stop = threading.Event()
+    consumed = [0] * n_subscribers
+    updates = [0] * n_subscribers
+    subscriptions = [feed.subscribe(list(symbols)) for _ in range(n_subscribers)]
+
+    def consume(slot: int):
+        subscription = subscriptions[slot]
+        while not stop.is_set():
+            for symbol, (_, prices) in subscription.wait(0.1).items():
+                consumed[slot] += len(prices)
+                indicators.rsi(feed.latest(symbol, rsi_window)[1])
+                updates[slot] += 1
+
+    consumers = [threading.Thread(target=consume, args=(slot,), daemon=True) for slot in range(n_subscribers)]
+    for consumer in consumers:
+        consumer.start()
+
+    published = 0
+    pending = 0.0
+    start = last = time.perf_counter()
+    while last - start < duration:
+        time.sleep(publish_interval)
+        now = time.perf_counter()
+        pending += (now - last) * ticks_per_second / n_symbols
+        count = int(pending)
+        if count:
+            pending -= count
+            feed.publish_many(source.next_batch(last - start, now - start, count))
+            published += count * n_symbols
+        last = now
+    elapsed = last - start
+    # Let subscribers drain what is already buffered before stopping them.
+    time.sleep(0.2)
+    stop.set()
+    for consumer in consumers:
+        consumer.join()
+
+    return {
+        "published_ticks_s": published / elapsed,
+        "consumed_ticks_s": sum(consumed) / n_subscribers / elapsed,
+        "view_updates_s": sum(updates) / n_subscribers / elapsed,
+        "dropped_ticks": sum(subscription.dropped for subscription in subscriptions),
+    }
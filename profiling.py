@@ -0,0 +1,217 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import nullcontext
+
+import streamlit as st
+
+# Phases a command run is broken into. Time not spent in any explicit phase
+# (widgets, markdown building, st.* calls) is reported as "render".
+PHASES = ("resolve", "fetch", "decode", "compute", "render")
+SAMPLE_INTERVAL_SECONDS = 0.005
+FLAME_TOP_STACKS = 12
+FLAME_MAX_DEPTH = 6
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+_local = threading.local()
+_DISABLED = nullcontext()
+
+class _Phase:
+    __slots__ = ("profile", "name", "start", "nested")
+
+    def __init__(self, run, name: str):
+        self.profile = run
+        self.name = name
+
+    def __enter__(self):
+        self.nested = 0.0
+        self.start = time.perf_counter()
+        self.profile._stack.append(self)
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        stack = self.profile._stack
+        stack.pop()
+        # Phases are exclusive: time spent in a nested phase (e.g. the `/search`
+        # fetch inside resolve) is charged to that phase only.
+        self.profile.phases[self.name] += elapsed - self.nested
+        if stack:
+            stack[-1].nested += elapsed
+
+class _Sampler(threading.Thread):
+    """
+    Samples the Python stacks of a run's thread, and of the worker threads
+    currently running tasks for it (see `propagate`), at a fixed interval via
+    `sys._current_frames`. All their stacks are merged into one count.
+    """
+
+    def __init__(self, run: "Profile", thread_id: int, interval: float = SAMPLE_INTERVAL_SECONDS):
+        super().__init__(daemon=True)
+        self.profile = run
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in {self.thread_id, *self.profile._threads}:
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self.stacks[_collapse(frame)] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+def _collapse(frame) -> tuple[str, ...]:
+    # Keep the frames of this app's modules, plus the innermost frame wherever
+    # it is (so time blocked in a socket read or json decode stays visible).
+    leaf = frame
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        if code.co_filename.startswith(_PACKAGE_DIR) or frame is leaf:
+            module = os.path.splitext(os.path.basename(code.co_filename))[0]
+            stack.append(f"{module}.{code.co_name}")
+        frame = frame.f_back
+    return tuple(reversed(stack))
+
+class Profile:
+    """
+    Timing breakdown and upstream accounting of one command run.
+    """
+
+    def __init__(self, command: str):
+        self.command = command
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.calls = []
+        self.total_seconds = 0.0
+        self.samples = Counter()
+        self._stack = []
+        self._threads = set()  # ids of the worker threads running tasks for this run
+
+    def record_call(self, endpoint: str, outcome: str, seconds: float, wire_bytes: int):
+        self.calls.append({"endpoint": endpoint, "outcome": outcome, "ms": round(seconds * 1e3, 2), "bytes": wire_bytes})
+
+    @property
+    def ran_command(self) -> bool:
+        return bool(self.calls) or self.phases["compute"] > 0
+
+    def flame_summary(self, top: int = FLAME_TOP_STACKS, depth: int = FLAME_MAX_DEPTH) -> str:
+        """
+        Returns the most sampled stacks in collapsed form ("outer;...;inner  share").
+        """
+        total = sum(self.samples.values())
+        if not total:
+            return "No samples (the run was shorter than the sampling interval)."
+        trimmed = Counter()
+        for stack, count in self.samples.items():
+            trimmed[";".join(stack[-depth:])] += count
+        return "\n".join(f"{count / total:6.1%}  {stack}" for stack, count in trimmed.most_common(top))
+
+def active() -> Profile | None:
+    """
+    Returns the profile of the run on this thread, or None when profiling is off.
+    """
+    return getattr(_local, "profile", None)
+
+def phase(name: str):
+    """
+    Returns a context manager charging its block to a phase of the active
+    profile; a shared no-op when profiling is off.
+    """
+    run = getattr(_local, "profile", None)
+    if run is None or getattr(_local, "is_worker", False):
+        return _DISABLED
+    return _Phase(run, name)
+
+def propagate(fn, phases: bool = False):
+    """
+    Wraps a callable submitted to a thread pool so the upstream calls it makes
+    are recorded in the calling thread's profile. Phases stay with the calling
+    thread, which is charged for the time it waits, unless `phases` is set:
+    a caller that blocks on the callable alone can hand its phases over too.
+    The worker's stack is sampled into the profile while the callable runs.
+    """
+    run = active()
+    if run is None:
+        return fn
+
+    def wrapper(*args, **kwargs):
+        _local.profile, _local.is_worker = run, not phases
+        thread_id = threading.get_ident()
+        run._threads.add(thread_id)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            run._threads.discard(thread_id)
+            _local.profile, _local.is_worker = None, False
+
+    return wrapper
+
+class profile:
+    """
+    Profiles the enclosed command run on this thread when `enabled`.
+
+    Runs that executed a command (made upstream calls or computed a result)
+    are kept per command in `st.session_state`, for `render_report`.
+    """
+
+    def __init__(self, command: str, enabled: bool = True):
+        self.command = command
+        self.enabled = enabled
+
+    def __enter__(self) -> Profile | None:
+        if not self.enabled:
+            return None
+        self.profile = Profile(self.command)
+        _local.profile = self.profile
+        self.sampler = _Sampler(self.profile, threading.get_ident())
+        self.start = time.perf_counter()
+        self.sampler.start()
+        return self.profile
+
+    def __exit__(self, *exc_info):
+        if not self.enabled:
+            return
+        run = self.profile
+        run.total_seconds = time.perf_counter() - self.start
+        self.sampler.stop()
+        _local.profile = None
+        run.samples = self.sampler.stacks
+        run.phases["render"] = max(run.total_seconds - sum(run.phases.values()), 0.0)
+        if run.ran_command:
+            st.session_state.setdefault("_profiles", {})[run.command] = run
+
+def render_report(command: str):
+    """
+    Shows the last profiled run of a command in the sidebar.
+
+    Args:
+        command (str): The sidebar command name.
+    """
+    run = st.session_state.get("_profiles", {}).get(command)
+    if run is None:
+        st.sidebar.caption("Run the command to see its profile.")
+        return
+
+    st.sidebar.markdown(f"Last run: `{run.total_seconds * 1e3:.1f} ms`")
+    st.sidebar.dataframe(
+        [{"phase": name, "ms": round(seconds * 1e3, 2), "share": f"{seconds / run.total_seconds:.0%}"}
+         for name, seconds in run.phases.items()],
+        hide_index=True,
+    )
+    # A 304 is a round trip upstream that is still served from the cache.
+    hits = sum(call["outcome"] in ("hit", "304") for call in run.calls)
+    st.sidebar.markdown(
+        f"- Upstream calls: `{sum(call['outcome'] != 'hit' for call in run.calls)}`\n"
+        f"- Cache hits: `{hits}`\n"
+        f"- Bytes on the wire: `{sum(call['bytes'] for call in run.calls):,}`"
+    )
+    if run.calls:
+        st.sidebar.dataframe(run.calls, hide_index=True)
+    st.sidebar.code(run.flame_summary(), language=None)
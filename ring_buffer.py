@@ -0,0 +1,86 @@
+import threading
+
+import numpy as np
+
+class RingBuffer:
+    """
+    Fixed-capacity buffer of (timestamp, value) ticks backed by numpy arrays.
+
+    Every appended tick gets a sequence number (its position in the stream);
+    readers copy out the ticks after a sequence number they have seen. Once
+    the buffer is full the oldest ticks are overwritten, and a reader that
+    fell further behind than the capacity is told how many it missed.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._timestamps = np.empty(capacity, dtype=np.float64)
+        self._values = np.empty(capacity, dtype=np.float64)
+        self._written = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return min(self._written, self.capacity)
+
+    @property
+    def written(self) -> int:
+        """
+        The sequence number the next tick will get (total ticks ever appended).
+        """
+        return self._written
+
+    def extend(self, timestamps, values):
+        """
+        Appends ticks in time order.
+
+        Args:
+            timestamps: Tick timestamps in seconds.
+            values: Tick values, one per timestamp.
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        count = len(values)
+        if count > self.capacity:
+            timestamps, values = timestamps[-self.capacity:], values[-self.capacity:]
+        kept = len(values)
+        with self._lock:
+            start = (self._written + count - kept) % self.capacity
+            head = min(kept, self.capacity - start)
+            self._timestamps[start:start + head] = timestamps[:head]
+            self._values[start:start + head] = values[:head]
+            self._timestamps[:kept - head] = timestamps[head:]
+            self._values[:kept - head] = values[head:]
+            self._written += count
+
+    def read_since(self, sequence: int) -> tuple[np.ndarray, np.ndarray, int, int]:
+        """
+        Copies out the ticks appended at or after a sequence number.
+
+        Args:
+            sequence (int): The first sequence number wanted.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, int, int]: The timestamps, the values,
+                the sequence number to read from next time, and the number of
+                wanted ticks that were already overwritten.
+        """
+        with self._lock:
+            end = self._written
+            start = max(sequence, end - self.capacity, 0)
+            positions = np.arange(start, end) % self.capacity
+            timestamps, values = self._timestamps[positions], self._values[positions]
+        return timestamps, values, end, max(start - sequence, 0)
+
+    def latest(self, count: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Copies out the most recent ticks, oldest first.
+
+        Args:
+            count (int | None): How many ticks; None for everything buffered.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The timestamps and values.
+        """
+        count = self.capacity if count is None else count
+        timestamps, values, _, _ = self.read_since(self._written - count)
+        return timestamps, values
@@ -0,0 +1,318 @@
+import bisect
+import threading
+import time
+
+import numpy as np
+
+import address_index
+import api_client
+import market_snapshot
+import persistence
+
+# Prefixes up to this length are answered from the trie, which keeps the best
+# ranked coins at every node. Longer prefixes are answered by a binary search
+# over the sorted term list, where the matching range is already small.
+PREFIX_TRIE_DEPTH = 3
+TRIE_NODE_TOP_K = 16
+DEFAULT_SUGGESTIONS = 8
+# Minimum trigram similarity for a fuzzy match to be suggested.
+MIN_TRIGRAM_SCORE = 0.3
+
+COIN_LIST_REFRESH_SECONDS = 60 * 60
+RANK_REFRESH_SECONDS = 10 * 60
+# Until the index has ranks (the markets snapshot has not loaded yet) or a
+# coin list, the loader checks this often for a snapshot to rank with and
+# retries the coin list after RETRY_SECONDS.
+SNAPSHOT_POLL_SECONDS = 1
+RETRY_SECONDS = 30
+
+# Rank assigned to coins outside the markets snapshot (sorts them last).
+UNRANKED = np.iinfo(np.int64).max
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class _TrieNode:
+    __slots__ = ("children", "top")
+
+    def __init__(self):
+        self.children = {}
+        self.top = []
+
+class CoinSearchIndex:
+    """
+    In-memory fuzzy search over coin ids, symbols and names.
+
+    Coins are stored in market-cap order, so a coin's position doubles as its
+    rank and every candidate list can be ordered with a plain sort.
+    """
+
+    def __init__(self, coins: list[dict], ranks: dict[str, int] | None = None):
+        """
+        Builds the index.
+
+        Args:
+            coins (list[dict]): Coins with "id", "symbol" and "name" keys
+                                (as returned by `/coins/list`).
+            ranks (dict[str, int] | None): Market cap rank by coin id; unranked
+                                           coins are ordered after ranked ones.
+        """
+        ranks = ranks or {}
+        unique = {coin["id"]: coin for coin in coins if coin.get("id")}
+        ordered = sorted(unique.values(), key=lambda coin: (ranks.get(coin["id"], UNRANKED), coin["id"]))
+
+        self.ids = [coin["id"] for coin in ordered]
+        self.names = [coin.get("name") or coin["id"] for coin in ordered]
+        self.symbols = [(coin.get("symbol") or "").lower() for coin in ordered]
+        self.ranks = np.array([ranks.get(coin_id, UNRANKED) for coin_id in self.ids], dtype=np.int64)
+
+        self._exact: dict[str, list[int]] = {}
+        self._trie = _TrieNode()
+        term_pairs = []
+        trigram_lists: dict[str, list[int]] = {}
+        for position, (coin_id, name, symbol) in enumerate(zip(self.ids, self.names, self.symbols)):
+            terms = {coin_id, symbol, name.lower()}
+            terms.update(name.lower().split())
+            terms.discard("")
+            for term in terms:
+                term_pairs.append((term, position))
+                self._insert_prefixes(term, position)
+            for term in (coin_id, symbol, name.lower()):
+                self._exact.setdefault(term, [])
+                if position not in self._exact[term]:
+                    self._exact[term].append(position)
+            for trigram in _trigrams(f"{name.lower()} {symbol}"):
+                trigram_lists.setdefault(trigram, []).append(position)
+
+        term_pairs.sort()
+        self._terms = [term for term, _ in term_pairs]
+        self._term_positions = np.array([position for _, position in term_pairs], dtype=np.int64)
+        self._trigrams = {trigram: np.array(positions, dtype=np.int64) for trigram, positions in trigram_lists.items()}
+        self._trigram_counts = np.array(
+            [len(_trigrams(f"{name.lower()} {symbol}")) for name, symbol in zip(self.names, self.symbols)],
+            dtype=np.int64,
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _insert_prefixes(self, term: str, position: int):
+        # Coins are inserted in rank order, so the first TRIE_NODE_TOP_K
+        # arrivals at a node are its best-ranked coins.
+        node = self._trie
+        for char in term[:PREFIX_TRIE_DEPTH]:
+            node = node.children.setdefault(char, _TrieNode())
+            if len(node.top) < TRIE_NODE_TOP_K and (not node.top or node.top[-1] != position):
+                node.top.append(position)
+
+    def _prefix_positions(self, prefix: str, limit: int) -> list[int]:
+        if len(prefix) <= PREFIX_TRIE_DEPTH:
+            node = self._trie
+            for char in prefix:
+                node = node.children.get(char)
+                if node is None:
+                    return []
+            return node.top[:limit]
+
+        start = bisect.bisect_left(self._terms, prefix)
+        end = bisect.bisect_left(self._terms, prefix + "\uffff", lo=start)
+        positions = np.unique(self._term_positions[start:end])
+        return positions[:limit].tolist()
+
+    def _fuzzy_positions(self, query: str, limit: int) -> list[int]:
+        query_trigrams = [trigram for trigram in _trigrams(query) if trigram in self._trigrams]
+        if not query_trigrams:
+            return []
+        hits = np.bincount(
+            np.concatenate([self._trigrams[trigram] for trigram in query_trigrams]),
+            minlength=len(self.ids),
+        )
+        candidates = np.flatnonzero(hits)
+        scores = hits[candidates] / np.maximum(len(_trigrams(query)), self._trigram_counts[candidates])
+        keep = scores >= MIN_TRIGRAM_SCORE
+        candidates, scores = candidates[keep], scores[keep]
+        # Best similarity first; ties (and near-ties) go to the better-ranked coin.
+        order = np.lexsort((candidates, -np.round(scores, 1)))
+        return candidates[order[:limit]].tolist()
+
+    def exact_matches(self, query: str) -> list[int]:
+        """
+        Positions of coins whose id, symbol or name equals the query, best
+        ranked first. Several entries mean the query is ambiguous (e.g. a
+        symbol shared by many coins).
+        """
+        return self._exact.get(query.strip().lower(), [])
+
+    def describe(self, position: int) -> dict:
+        rank = int(self.ranks[position])
+        return {
+            "id": self.ids[position],
+            "name": self.names[position],
+            "symbol": self.symbols[position],
+            "market_cap_rank": rank if rank != UNRANKED else "N/A",
+        }
+
+    def suggest(self, query: str, limit: int = DEFAULT_SUGGESTIONS) -> list[dict]:
+        """
+        Suggests coins for a partial or misspelled query.
+
+        Exact matches come first, then prefix matches (both ordered by market
+        cap), then trigram (fuzzy) matches ordered by similarity.
+
+        Args:
+            query (str): The text typed so far.
+            limit (int): The maximum number of suggestions.
+
+        Returns:
+            list[dict]: Suggestions with "id", "name", "symbol" and "market_cap_rank".
+        """
+        key = query.strip().lower()
+        if not key:
+            return []
+        positions = list(self.exact_matches(key))
+        for group in (self._prefix_positions(key, limit), self._fuzzy_positions(key, limit)):
+            if len(positions) >= limit:
+                break
+            seen = set(positions)
+            positions.extend(p for p in group if p not in seen)
+        return [self.describe(position) for position in positions[:limit]]
+
+    def resolve(self, query: str) -> dict | None:
+        """
+        Resolves a query to a single coin without any upstream call.
+
+        An exact id always resolves. A symbol or name resolves to its best
+        ranked match only when that coin is in the markets snapshot, which is
+        the coin `/search` would rank first.
+
+        Args:
+            query (str): The coin id, symbol or name.
+
+        Returns:
+            dict | None: The coin (as returned by `suggest`), or None if the
+                         query should go to `/search` instead.
+        """
+        key = query.strip().lower()
+        matches = self.exact_matches(key)
+        if not matches:
+            return None
+        best = matches[0]
+        if self.ids[best] == key or self.ranks[best] != UNRANKED:
+            return self.describe(best)
+        return None
+
+class SearchIndexLoader:
+    """
+    Keeps a `CoinSearchIndex` current in the background.
+
+    Until the full coin list has been fetched (or restored from the boot
+    snapshot) the index is built from the markets snapshot, so suggestions
+    for the top coins work right after boot. The coin list is fetched with
+    platform data and also feeds the contract address index.
+    """
+
+    def __init__(self):
+        self.index = CoinSearchIndex([])
+        self._coins: list[dict] = []
+        self._coins_fetched_at = 0.0
+        self._ranked = False
+        self._ranks_updated_at = 0.0  # markets snapshot time of the current ranks
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="search-index", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        try:
+            self.restore()
+        except Exception as e:
+            print(f"Coin list restore failed: {e}")
+        while True:
+            try:
+                self.rebuild()
+            except Exception as e:
+                print(f"Search index rebuild failed: {e}")
+            self._wait()
+
+    def _wait(self):
+        # Sleeps until the next rebuild is due, cutting the wait short when
+        # the index has no ranks and the markets snapshot has (re)loaded.
+        # Without ranks every symbol match is unranked, so suggestions would
+        # come in arbitrary order.
+        ready = self._coins and self._ranked
+        due = time.time() + (RANK_REFRESH_SECONDS if ready else RETRY_SECONDS)
+        while time.time() < due:
+            if not self._ranked and market_snapshot.get_snapshot().updated_at > self._ranks_updated_at:
+                return
+            time.sleep(SNAPSHOT_POLL_SECONDS)
+
+    def restore(self) -> bool:
+        """
+        Loads the coin list from the boot snapshot, keeping its age, so the
+        next rebuild only refetches it once it is due.
+
+        Returns:
+            bool: Whether a coin list was restored.
+        """
+        restored = persistence.restore("search_index", "coins")
+        if restored is None or self._coins:
+            return False
+        coins, meta = restored
+        self._coins = coins
+        self._coins_fetched_at = meta["fetched_at"]
+        address_index.get_index().update_from_coin_list(coins)
+        return True
+
+    def dump(self):
+        """
+        Yields the snapshot entry of the coin list.
+        """
+        if self._coins:
+            meta, payload = persistence.encode_json(self._coins, {"fetched_at": self._coins_fetched_at})
+            yield "coins", meta, payload
+
+    def rebuild(self):
+        """
+        Rebuilds the index with fresh market cap ranks, refetching the coin
+        list when it is older than COIN_LIST_REFRESH_SECONDS.
+        """
+        if time.time() - self._coins_fetched_at > COIN_LIST_REFRESH_SECONDS:
+            coins, error = api_client.fetch_coin_list(include_platform=True)
+            if error:
+                print(f"Coin list refresh failed: {error}")
+            else:
+                self._coins = coins
+                self._coins_fetched_at = time.time()
+                address_index.get_index().update_from_coin_list(coins)
+
+        snapshot = market_snapshot.get_snapshot()
+        updated_at = snapshot.updated_at
+        table = snapshot.table
+        ranks = {
+            coin_id: int(rank)
+            for coin_id, rank in zip(table.index, table["market_cap_rank"])
+            if rank == rank and rank is not None
+        }
+        coins = self._coins or [
+            {"id": coin_id, "symbol": symbol, "name": name}
+            for coin_id, symbol, name in zip(table.index, table["symbol"], table["name"])
+        ]
+        self.index = CoinSearchIndex(coins, ranks)
+        self._ranked = bool(ranks)
+        self._ranks_updated_at = updated_at
+
+_loader = SearchIndexLoader()
+persistence.register("search_index", _loader.dump)
+
+def get_index() -> CoinSearchIndex:
+    """
+    Returns the current process-wide index, starting its loader on first use.
+    """
+    _loader.start()
+    return _loader.index
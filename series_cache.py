@@ -0,0 +1,200 @@
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+import metrics
+import persistence
+
+# Series kept (one per coin and granularity); the least recently used go first.
+SERIES_CACHE_MAX_SERIES = 256
+# Windows kept per series. A new window replaces every window it covers, so
+# this only bounds series fetched over staggered ranges.
+SERIES_CACHE_MAX_WINDOWS = 4
+
+class Window:
+    """
+    One fetched stretch of a series: points timestamped in milliseconds,
+    fetched for the range `start`..`end` (unix seconds).
+    """
+
+    __slots__ = ("start", "end", "timestamps", "values", "fetched_at")
+
+    def __init__(self, start: float, end: float, timestamps: np.ndarray, values: np.ndarray, fetched_at: float):
+        self.start = start
+        self.end = end
+        self.timestamps = timestamps
+        self.values = values
+        self.fetched_at = fetched_at
+
+    def covers(self, start: float, end: float) -> bool:
+        return self.start <= start and end <= self.end
+
+    def slice(self, start_ms: float, end_ms: float) -> tuple[np.ndarray, np.ndarray]:
+        lo = np.searchsorted(self.timestamps, start_ms, "left")
+        hi = np.searchsorted(self.timestamps, end_ms, "right")
+        return self.timestamps[lo:hi], self.values[lo:hi]
+
+    def latest(self, span_seconds: float) -> tuple[np.ndarray, np.ndarray]:
+        # Measured back from the last point rather than the fetch time, so
+        # "the last N days" matches what upstream returns for N days.
+        if not len(self.timestamps):
+            return self.timestamps, self.values
+        last = self.timestamps[-1]
+        return self.slice(last - span_seconds * 1000, last)
+
+class SeriesCache:
+    """
+    Caches fetched time series per (coin, granularity) key and answers any
+    range that a fresh cached window covers by slicing it, so a 7-day request
+    after a 14-day one needs no upstream call.
+
+    Returned arrays are read-only views into the cached window.
+    """
+
+    def __init__(self, max_series: int = SERIES_CACHE_MAX_SERIES, max_windows: int = SERIES_CACHE_MAX_WINDOWS):
+        self.max_series = max_series
+        self.max_windows = max_windows
+        self.hits = 0
+        self.misses = 0
+        self._series = OrderedDict()  # key -> [Window], newest first
+        self._lock = threading.Lock()
+
+    def _fresh(self, key, max_age: float, now: float) -> list[Window]:
+        windows = self._series.get(key)
+        if windows is None:
+            windows = self._restore(key)
+        if not windows:
+            return []
+        self._series.move_to_end(key)
+        return [window for window in windows if now - window.fetched_at < max_age]
+
+    def _count(self, found: bool):
+        if found:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def get(self, key, start: float, end: float, max_age: float) -> tuple[np.ndarray, np.ndarray] | None:
+        """
+        Returns the points from `start` to `end` (unix seconds, inclusive) if
+        a window younger than `max_age` seconds covers that range.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray] | None: The timestamps (ms) and
+                                                  values, or None on a miss.
+        """
+        window = self.get_window(key, start, end, max_age)
+        return window.slice(start * 1000, end * 1000) if window is not None else None
+
+    def get_window(self, key, start: float, end: float, max_age: float) -> Window | None:
+        """
+        Returns the window younger than `max_age` seconds that covers `start`
+        to `end` (unix seconds), or None on a miss.
+        """
+        with self._lock:
+            for window in self._fresh(key, max_age, time.time()):
+                if window.covers(start, end):
+                    self._count(True)
+                    return window
+            self._count(False)
+        return None
+
+    def get_latest(self, key, span_seconds: float, max_age: float) -> tuple[np.ndarray, np.ndarray] | None:
+        """
+        Returns the last `span_seconds` of the newest window younger than
+        `max_age` seconds that spans at least that long.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray] | None: The timestamps (ms) and
+                                                  values, or None on a miss.
+        """
+        with self._lock:
+            for window in self._fresh(key, max_age, time.time()):
+                if window.end - window.start >= span_seconds and len(window.timestamps):
+                    self._count(True)
+                    return window.latest(span_seconds)
+            self._count(False)
+        return None
+
+    def put(self, key, start: float, end: float, timestamps, values, fetched_at: float | None = None) -> Window:
+        """
+        Stores the points fetched for `start`..`end` (unix seconds).
+
+        Windows the new one covers are dropped. `timestamps` (ms, ascending)
+        and `values` (one row per timestamp) are kept as read-only arrays.
+        """
+        timestamps = np.asarray(timestamps)
+        values = np.asarray(values)
+        timestamps.flags.writeable = False
+        values.flags.writeable = False
+        window = Window(start, end, timestamps, values, time.time() if fetched_at is None else fetched_at)
+        with self._lock:
+            windows = self._series.pop(key, [])
+            windows = [window] + [old for old in windows if not window.covers(old.start, old.end)]
+            self._series[key] = windows[:self.max_windows]
+            while len(self._series) > self.max_series:
+                self._series.popitem(last=False)
+        return window
+
+    def _restore(self, key) -> list[Window] | None:
+        # Windows from the boot snapshot, with their original fetch times;
+        # callers hold the lock.
+        restored = persistence.restore("series", _snapshot_key(key))
+        if restored is None:
+            return None
+        arrays, meta = restored
+        windows = [
+            Window(start, end, timestamps, values, fetched_at)
+            for (start, end, fetched_at), timestamps, values in zip(meta["windows"], arrays[::2], arrays[1::2])
+        ]
+        for window in windows:
+            window.timestamps.flags.writeable = False
+            window.values.flags.writeable = False
+        self._series[key] = windows
+        while len(self._series) > self.max_series:
+            self._series.popitem(last=False)
+        return windows
+
+    def dump(self):
+        """
+        Yields snapshot entries, one per series (see `persistence.register`).
+        """
+        with self._lock:
+            series = [(key, list(windows)) for key, windows in self._series.items()]
+        for key, windows in series:
+            bounds = [[window.start, window.end, window.fetched_at] for window in windows]
+            arrays = [array for window in windows for array in (window.timestamps, window.values)]
+            meta, payload = persistence.encode_arrays(arrays, {"windows": bounds})
+            yield _snapshot_key(key), meta, payload
+
+    def stats(self) -> dict:
+        with self._lock:
+            windows = [window for windows in self._series.values() for window in windows]
+        return {
+            "series": len(self._series),
+            "windows": len(windows),
+            "points": sum(len(window.timestamps) for window in windows),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+def _snapshot_key(key: tuple) -> str:
+    return "|".join(str(part) for part in key)
+
+_cache = SeriesCache()
+persistence.register("series", _cache.dump)
+
+def get_cache() -> SeriesCache:
+    """
+    Returns the process-wide series cache.
+    """
+    return _cache
+
+metrics.callback("series_cache_lookups_total", "Series cache lookups, by result.", "counter", ("result",),
+                 lambda: {("hit",): _cache.hits, ("miss",): _cache.misses})
@@ -0,0 +1,128 @@
+import pickle
+import threading
+import weakref
+from collections import OrderedDict
+
+import streamlit as st
+
+# Byte budget for one session's stored results, and for all sessions together.
+SESSION_MAX_BYTES = 2 * 1024 * 1024
+GLOBAL_MAX_BYTES = 256 * 1024 * 1024
+
+class SessionResults:
+    """
+    The results of one session, most recently used last. Lives in
+    `st.session_state`, so it is dropped together with the session.
+    """
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.bytes = 0
+
+class ResultRegistry:
+    """
+    Process-wide LRU over every session's stored results.
+
+    Each session's entries live in its own `SessionResults`; the registry only
+    tracks sizes and recency, and holds weak references so that a closed
+    session's memory is released even if none of its entries were evicted.
+    """
+
+    def __init__(self, session_max_bytes: int = SESSION_MAX_BYTES, global_max_bytes: int = GLOBAL_MAX_BYTES):
+        self.session_max_bytes = session_max_bytes
+        self.global_max_bytes = global_max_bytes
+        self.total_bytes = 0
+        self._lru = OrderedDict()  # (store id, key) -> (weakref to store, size)
+        self._closed_stores = []
+        self._lock = threading.Lock()
+
+    def _forget_closed_stores(self):
+        # Finalizers can run during garbage collection inside a locked section,
+        # so they only queue the store id and the cleanup happens here.
+        while self._closed_stores:
+            store_id = self._closed_stores.pop()
+            for lru_key in [lru_key for lru_key in self._lru if lru_key[0] == store_id]:
+                _, size = self._lru.pop(lru_key)
+                self.total_bytes -= size
+
+    def _evict(self, lru_key):
+        store_ref, size = self._lru.pop(lru_key)
+        self.total_bytes -= size
+        store = store_ref()
+        if store is not None and lru_key[1] in store.entries:
+            del store.entries[lru_key[1]]
+            store.bytes -= size
+
+    def register(self, store: SessionResults):
+        weakref.finalize(store, self._closed_stores.append, id(store))
+
+    def put(self, store: SessionResults, key, value) -> bool:
+        """
+        Stores a value, evicting least recently used entries from this session
+        first and then from any session until both budgets hold.
+
+        Returns:
+            bool: False if the value alone exceeds the per-session budget.
+        """
+        size = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        if size > self.session_max_bytes:
+            return False
+        with self._lock:
+            self._forget_closed_stores()
+            lru_key = (id(store), key)
+            if lru_key in self._lru:
+                self._evict(lru_key)
+            while store.bytes + size > self.session_max_bytes and store.entries:
+                self._evict((id(store), next(iter(store.entries))))
+            while self.total_bytes + size > self.global_max_bytes and self._lru:
+                self._evict(next(iter(self._lru)))
+            store.entries[key] = value
+            store.bytes += size
+            self._lru[lru_key] = (weakref.ref(store), size)
+            self.total_bytes += size
+        return True
+
+    def get(self, store: SessionResults, key):
+        with self._lock:
+            if key not in store.entries:
+                return None
+            store.entries.move_to_end(key)
+            self._lru.move_to_end((id(store), key))
+            return store.entries[key]
+
+_registry = ResultRegistry()
+
+def _session_store() -> SessionResults:
+    store = st.session_state.get("_command_results")
+    if store is None:
+        store = SessionResults()
+        _registry.register(store)
+        st.session_state["_command_results"] = store
+    return store
+
+def get_result(command: str, params: tuple):
+    """
+    Returns this session's last stored result for a command and parameters.
+
+    Args:
+        command (str): The command name (e.g. "/bop").
+        params (tuple): The parameters the result was computed for.
+
+    Returns:
+        The stored result, or None.
+    """
+    return _registry.get(_session_store(), (command, params))
+
+def store_result(command: str, params: tuple, value) -> bool:
+    """
+    Stores a result for this session under its command and parameters.
+
+    Args:
+        command (str): The command name (e.g. "/bop").
+        params (tuple): The parameters the result was computed for.
+        value: The result; it must be picklable (used to measure its size).
+
+    Returns:
+        bool: False if the result is too large to keep.
+    """
+    return _registry.put(_session_store(), (command, params), value)
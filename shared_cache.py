@@ -0,0 +1,258 @@
+import hashlib
+import json
+import mmap
+import os
+import stat
+import struct
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Not POSIX: every process keeps only its own caches.
+    fcntl = None
+
+# A memory-mapped file shared by every Streamlit process on the host. Set
+# SHARED_CACHE_PATH to "" to disable the tier.
+_DEFAULT_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+SHARED_CACHE_PATH = os.getenv("SHARED_CACHE_PATH", os.path.join(_DEFAULT_DIR, "pumpies-shared-cache"))
+SHARED_CACHE_SLOTS = 4096
+SHARED_CACHE_ARENA_BYTES = 64 * 1024 * 1024
+# Slots probed per key (open addressing); a full window evicts its oldest entry.
+PROBE_WINDOW = 8
+# Larger values are not shared, so one body cannot cycle the whole arena.
+MAX_RECORD_FRACTION = 1 / 16
+
+MAGIC = b"PUMPSHM1"
+# magic, slot count, arena size, head (total bytes ever reserved in the arena)
+HEADER = struct.Struct("<8sIxxxxQQ")
+HEAD_OFFSET = 24
+# seq (seqlock: odd while being written), key hash, arena position, value
+# length, stored_at (unix time)
+SLOT = struct.Struct("<QQQQd")
+# arena position (for validation), key length, meta length, value offset
+RECORD = struct.Struct("<QIII")
+
+KIND_ARRAY = "array"
+
+def _copy(buffer: memoryview, meta: dict) -> bytes:
+    return bytes(buffer)
+
+def _key_hash(key: str) -> int:
+    # 0 marks an empty slot.
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") or 1
+
+class SharedCache:
+    """
+    Cross-process cache in a memory-mapped file: a fixed slot table indexing
+    records in a ring-buffer arena.
+
+    Writers serialize on an fcntl lock (plus a thread lock) and publish slots
+    with a seqlock. Readers take no lock: they read a slot between two equal,
+    even sequence numbers, decode the record straight out of the mapping and
+    then check that the arena has not lapped the record meanwhile.
+    """
+
+    def __init__(self, path: str, n_slots: int = SHARED_CACHE_SLOTS, arena_bytes: int = SHARED_CACHE_ARENA_BYTES):
+        self.path = path
+        self.n_slots = n_slots
+        self.arena_bytes = arena_bytes
+        self.slots_offset = HEADER.size
+        self.arena_offset = self.slots_offset + n_slots * SLOT.size
+        self.hits = 0
+        self.misses = 0
+        self._thread_lock = threading.Lock()
+
+        size = self.arena_offset + arena_bytes
+        # The path is predictable and /dev/shm is world-writable: never follow
+        # a planted symlink, and only use a file this user owns and alone can
+        # access before truncating or mapping it.
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, "O_NOFOLLOW", 0), 0o600)
+        info = os.fstat(self._fd)
+        if not stat.S_ISREG(info.st_mode) or info.st_uid != os.getuid() or stat.S_IMODE(info.st_mode) != 0o600:
+            os.close(self._fd)
+            raise PermissionError(f"{path} is not a regular file owned by this user with mode 0600")
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size != size or os.pread(self._fd, len(MAGIC), 0) != MAGIC:
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, size)
+                os.pwrite(self._fd, HEADER.pack(MAGIC, n_slots, arena_bytes, 0), 0)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._map = mmap.mmap(self._fd, size)
+        self._view = memoryview(self._map)
+
+    def _head(self) -> int:
+        return struct.unpack_from("<Q", self._map, HEAD_OFFSET)[0]
+
+    def _read_slot(self, index: int) -> tuple | None:
+        offset = self.slots_offset + index * SLOT.size
+        for _ in range(4):
+            fields = SLOT.unpack_from(self._map, offset)
+            if fields[0] % 2 == 0 and SLOT.unpack_from(self._map, offset)[0] == fields[0]:
+                return fields
+        return None
+
+    def _write_slot(self, index: int, key_hash: int, position: int, length: int, stored_at: float):
+        offset = self.slots_offset + index * SLOT.size
+        seq = SLOT.unpack_from(self._map, offset)[0]
+        struct.pack_into("<Q", self._map, offset, seq + 1)
+        SLOT.pack_into(self._map, offset, seq + 1, key_hash, position, length, stored_at)
+        struct.pack_into("<Q", self._map, offset, seq + 2)
+
+    def _probe(self, key_hash: int):
+        start = key_hash % self.n_slots
+        return ((start + step) % self.n_slots for step in range(PROBE_WINDOW))
+
+    # --- Writes ---
+
+    def put(self, key: str, value: bytes, meta: dict | None = None, stored_at: float | None = None) -> bool:
+        """
+        Stores a value (replacing any previous value of the key).
+
+        Args:
+            key (str): The cache key.
+            value (bytes): The value bytes (any buffer).
+            meta (dict | None): Small JSON-serializable metadata stored alongside.
+            stored_at (float | None): The entry's age reference; defaults to now.
+
+        Returns:
+            bool: False if the value is too large to share.
+        """
+        key_bytes = key.encode()
+        meta_bytes = json.dumps(meta or {}).encode()
+        value = memoryview(value).cast("B")
+        # Values start 8-byte aligned so arrays can be viewed in place.
+        value_offset = -(-(RECORD.size + len(key_bytes) + len(meta_bytes)) // 8) * 8
+        length = -(-(value_offset + len(value)) // 8) * 8
+        if length > self.arena_bytes * MAX_RECORD_FRACTION:
+            return False
+        key_hash = _key_hash(key)
+        stored_at = time.time() if stored_at is None else stored_at
+
+        with self._thread_lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                position = self._head()
+                if position % self.arena_bytes + length > self.arena_bytes:
+                    position += self.arena_bytes - position % self.arena_bytes
+                # Reserve before writing: a reader validates its record against the head.
+                struct.pack_into("<Q", self._map, HEAD_OFFSET, position + length)
+                start = self.arena_offset + position % self.arena_bytes
+                RECORD.pack_into(self._map, start, position, len(key_bytes), len(meta_bytes), value_offset)
+                cursor = start + RECORD.size
+                self._map[cursor:cursor + len(key_bytes)] = key_bytes
+                cursor += len(key_bytes)
+                self._map[cursor:cursor + len(meta_bytes)] = meta_bytes
+                self._map[start + value_offset:start + value_offset + len(value)] = value
+
+                target, oldest = None, None
+                for index in self._probe(key_hash):
+                    fields = SLOT.unpack_from(self._map, self.slots_offset + index * SLOT.size)
+                    if fields[1] in (0, key_hash):
+                        target = index
+                        break
+                    if oldest is None or fields[4] < oldest[1]:
+                        oldest = (index, fields[4])
+                if target is None:
+                    target = oldest[0]
+                self._write_slot(target, key_hash, position, len(value), stored_at)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        return True
+
+    def put_array(self, key: str, array: np.ndarray, stored_at: float | None = None) -> bool:
+        array = np.ascontiguousarray(array)
+        meta = {"kind": KIND_ARRAY, "dtype": array.dtype.str, "shape": list(array.shape)}
+        return self.put(key, array, meta, stored_at)
+
+    # --- Reads ---
+
+    def get(self, key: str, max_age: float | None = None, decode=_copy):
+        """
+        Reads a value without locking, decoding it in place.
+
+        Args:
+            key (str): The cache key.
+            max_age (float | None): Entries older than this many seconds are misses.
+            decode: Called with (memoryview of the value, meta dict); the view
+                    points into the shared mapping, so `decode` must copy or
+                    parse what it keeps. Defaults to copying the bytes.
+
+        Returns:
+            tuple | None: (decoded value, meta, stored_at), or None on a miss.
+        """
+        key_hash = _key_hash(key)
+        key_bytes = key.encode()
+        for index in self._probe(key_hash):
+            fields = self._read_slot(index)
+            if fields is None or fields[1] == 0:
+                break
+            _, slot_hash, position, length, stored_at = fields
+            if slot_hash != key_hash:
+                continue
+            if max_age is not None and time.time() - stored_at >= max_age:
+                break
+            start = self.arena_offset + position % self.arena_bytes
+            record_position, key_length, meta_length, value_offset = RECORD.unpack_from(self._map, start)
+            cursor = start + RECORD.size
+            if record_position != position or self._view[cursor:cursor + key_length] != key_bytes:
+                break
+            cursor += key_length
+            try:
+                meta = json.loads(bytes(self._view[cursor:cursor + meta_length]))
+                value = decode(self._view[start + value_offset:start + value_offset + length], meta)
+            except (ValueError, TypeError, KeyError):
+                # Torn by a concurrent overwrite; the check below would reject it anyway.
+                break
+            # A writer that reserved past `position + arena_bytes` may have
+            # overwritten the record while it was being read.
+            if self._head() > position + self.arena_bytes:
+                break
+            self.hits += 1
+            return value, meta, stored_at
+        self.misses += 1
+        return None
+
+    def get_array(self, key: str, max_age: float | None = None) -> tuple[np.ndarray, float] | None:
+        """
+        Returns a stored array as a read-only view into shared memory (no copy),
+        with its stored_at time.
+
+        The view stays valid until the arena wraps around it (one full arena of
+        newer writes); copy it to keep it longer.
+        """
+        def view(buffer: memoryview, meta: dict) -> np.ndarray:
+            array = np.frombuffer(buffer, dtype=np.dtype(meta["dtype"])).reshape(meta["shape"])
+            array.flags.writeable = False
+            return array
+
+        hit = self.get(key, max_age, view)
+        return (hit[0], hit[2]) if hit else None
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "arena_laps": self._head() // self.arena_bytes}
+
+_cache = None
+_cache_lock = threading.Lock()
+_disabled = fcntl is None or not SHARED_CACHE_PATH
+
+def get_cache() -> SharedCache | None:
+    """
+    Returns this process's handle on the host-wide cache, or None when the
+    tier is disabled or unavailable.
+    """
+    global _cache, _disabled
+    if _cache is None and not _disabled:
+        with _cache_lock:
+            if _cache is None and not _disabled:
+                try:
+                    _cache = SharedCache(SHARED_CACHE_PATH)
+                except OSError as e:
+                    print(f"Shared cache unavailable, using per-process caches only: {e}")
+                    _disabled = True
+    return _cache
@@ -0,0 +1,100 @@
+from datetime import datetime
+
+import streamlit as st
+
+class SnapshotDiff:
+    """
+    Changes between two snapshots of a ranked list.
+
+    Ranks are 1-based list positions. `moved` holds (key, old rank, new rank),
+    `entered` holds (key, rank), `dropped` holds (key, old rank) and `updated`
+    holds the keys whose fields changed without a rank change.
+    """
+
+    __slots__ = ("moved", "entered", "dropped", "updated", "is_first", "detected_at")
+
+    def __init__(self, is_first: bool = False):
+        self.moved = []
+        self.entered = []
+        self.dropped = []
+        self.updated = []
+        self.is_first = is_first
+        self.detected_at = datetime.now()
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.moved or self.entered or self.dropped or self.updated)
+
+def diff_snapshots(previous: list[dict] | None, current: list[dict], key: str) -> SnapshotDiff:
+    """
+    Compares two snapshots of a ranked list in one linear pass.
+
+    Args:
+        previous (list[dict] | None): The previous snapshot, or None if there is none.
+        current (list[dict]): The new snapshot.
+        key (str): The item field identifying an item across snapshots.
+
+    Returns:
+        SnapshotDiff: Rank movements, new entrants, dropped items and updated items.
+    """
+    if previous is None:
+        return SnapshotDiff(is_first=True)
+    diff = SnapshotDiff()
+    if previous is current:
+        return diff
+
+    # key -> (rank, item) for the previous snapshot; every key found in the
+    # current snapshot is popped, so what remains was dropped.
+    remaining = {item.get(key): (rank, item) for rank, item in enumerate(previous, start=1)}
+    for rank, item in enumerate(current, start=1):
+        item_key = item.get(key)
+        seen = remaining.pop(item_key, None)
+        if seen is None:
+            diff.entered.append((item_key, rank))
+        elif seen[0] != rank:
+            diff.moved.append((item_key, seen[0], rank))
+        elif seen[1] != item:
+            diff.updated.append(item_key)
+    diff.dropped = [(item_key, rank) for item_key, (rank, _) in remaining.items()]
+    return diff
+
+class SnapshotTracker:
+    """
+    The last snapshot of each list view seen by one session, with its diff
+    against the snapshot before it.
+
+    Snapshots are compared by identity first: api_client hands out the same
+    list while the upstream body is unchanged, so rerunning a view that did
+    not move costs a single comparison.
+    """
+
+    def __init__(self):
+        self._views = {}  # view -> (snapshot, diff)
+
+    def update(self, view: str, items: list[dict], key: str) -> SnapshotDiff:
+        """
+        Records a snapshot of a view and returns what changed since the last one.
+
+        Args:
+            view (str): The view name (e.g. "/trending").
+            items (list[dict]): The current snapshot.
+            key (str): The item field identifying an item across snapshots.
+
+        Returns:
+            SnapshotDiff: The changes; the same diff is returned until the snapshot changes.
+        """
+        state = self._views.get(view)
+        if state is not None and state[0] is items:
+            return state[1]
+        diff = diff_snapshots(state[0] if state else None, items, key)
+        self._views[view] = (items, diff)
+        return diff
+
+def get_tracker() -> SnapshotTracker:
+    """
+    Returns this session's tracker (kept in `st.session_state`).
+    """
+    tracker = st.session_state.get("_snapshot_tracker")
+    if tracker is None:
+        tracker = st.session_state["_snapshot_tracker"] = SnapshotTracker()
+    return tracker
@@ -0,0 +1,92 @@
+import os
+import sys
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import api_client
+import indicators
+import utils
+
+
+def _loop_daily_bop(ohlc_rows: list) -> dict:
+    # The per-candle loop fetch_ohlc_data used before the vectorized version.
+    daily_bop = defaultdict(list)
+    for entry in ohlc_rows:
+        timestamp, open_price, high_price, low_price, close_price = entry
+        date = datetime.fromtimestamp(timestamp / 1000, timezone.utc).strftime('%Y-%m-%d')
+        if high_price != low_price:
+            bop = (close_price - open_price) / (high_price - low_price)
+            daily_bop[date].append(bop)
+    return {date: sum(values) / len(values) for date, values in daily_bop.items()}
+
+
+def _random_ohlc(rng, count: int) -> list:
+    rows, price = [], 100.0
+    start = 1_700_000_000_000
+    for i in range(count):
+        open_price = price
+        close_price = price * (1 + rng.normal(0, 0.02))
+        high_price = max(open_price, close_price) * (1 + abs(rng.normal(0, 0.01)))
+        low_price = min(open_price, close_price) * (1 - abs(rng.normal(0, 0.01)))
+        if i % 7 == 3:
+            # A flat candle carries no pressure and is skipped.
+            open_price = high_price = low_price = close_price = price
+        rows.append([start + i * 4 * 3600 * 1000, open_price, high_price, low_price, close_price])
+        price = close_price
+    return rows
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_daily_bop_matches_the_loop(seed):
+    rows = _random_ohlc(np.random.default_rng(seed), 6 * 40 + seed)
+    expected = _loop_daily_bop(rows)
+    result = api_client._aggregate_daily_bop(indicators.ohlc_to_arrays(rows))
+    assert result.keys() == expected.keys()
+    for day, value in expected.items():
+        assert result[day] == pytest.approx(value, rel=1e-12, abs=1e-12)
+
+
+def test_daily_bop_skips_days_with_only_flat_candles():
+    day = 1_700_006_400_000  # midnight UTC
+    rows = [[day, 1, 1, 1, 1], [day + 3_600_000, 1, 1, 1, 1], [day + 86_400_000, 1, 2, 0.5, 1.5]]
+    assert api_client._aggregate_daily_bop(indicators.ohlc_to_arrays(rows)) == _loop_daily_bop(rows)
+
+
+@pytest.mark.parametrize("period", [2, 5, 14])
+@pytest.mark.parametrize("seed", range(5))
+def test_rsi_matches_the_loop(seed, period):
+    rng = np.random.default_rng(seed)
+    prices = (100 * np.cumprod(1 + rng.normal(0, 0.03, 200))).tolist()
+    for length in (period + 1, period + 2, 50, 200):
+        closes = prices[:length]
+        assert indicators.rsi(closes, period)[-1] == pytest.approx(utils.calculate_rsi(closes, period), rel=1e-9)
+
+
+@pytest.mark.parametrize("closes,expected", [([5.0] * 20, 50.0), (list(range(1, 21)), 100.0), (list(range(20, 0, -1)), 0.0)])
+def test_rsi_edge_cases_match_the_loop(closes, expected):
+    assert utils.calculate_rsi(closes, 14) == expected
+    assert indicators.rsi(closes, 14)[-1] == pytest.approx(expected)
+
+
+def test_rsi_batch_rows_match_single_series():
+    batch = 100 * np.cumprod(1 + np.random.default_rng(7).normal(0, 0.03, (3, 60)), axis=1)
+    for row, values in zip(batch, indicators.rsi(batch, 14)):
+        np.testing.assert_allclose(values, indicators.rsi(row, 14))
+
+
+@pytest.mark.parametrize("how,reduce", [
+    ("mean", np.mean), ("sum", np.sum), ("std", np.std), ("max", np.max), ("min", np.min),
+])
+def test_rolling_window_matches_explicit_windows(how, reduce):
+    values = np.random.default_rng(3).normal(0, 1, 40)
+    values[25] = np.nan
+    window = 5
+    expected = np.full(len(values), np.nan)
+    for end in range(window, len(values) + 1):
+        expected[end - 1] = reduce(values[end - window:end])
+    np.testing.assert_allclose(indicators.rolling_window(values, window, how), expected, rtol=1e-9)
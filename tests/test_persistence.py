@@ -0,0 +1,88 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import persistence
+
+
+def _boot(monkeypatch, path):
+    # A fresh process: no reader opened yet and nothing registered.
+    monkeypatch.setattr(persistence, "SNAPSHOT_PATH", str(path))
+    monkeypatch.setattr(persistence, "_reader", None)
+    monkeypatch.setattr(persistence, "_reader_loaded", False)
+    monkeypatch.setattr(persistence, "_sections", {})
+
+
+def test_entries_not_restored_survive_the_next_save(monkeypatch, tmp_path):
+    path = tmp_path / "snapshot.bin"
+    live = {"a": {"body": 1}, "b": {"body": 2}}
+
+    _boot(monkeypatch, path)
+    persistence.register("responses", lambda: (
+        (key, *persistence.encode_json(value, {"stored_at": 1.0})) for key, value in live.items()
+    ))
+    assert persistence.save()
+
+    # Second process: restores only "a", then saves with nothing else live.
+    _boot(monkeypatch, path)
+    restored = {}
+    persistence.register("responses", lambda: (
+        (key, *persistence.encode_json(value, {"stored_at": 2.0})) for key, value in restored.items()
+    ))
+    value, meta = persistence.restore("responses", "a")
+    restored["a"] = dict(value, body=10)
+    assert persistence.save()
+
+    # Third process: "a" comes from the live dump, "b" was carried over.
+    _boot(monkeypatch, path)
+    value, meta = persistence.restore("responses", "a")
+    assert value == {"body": 10} and meta["stored_at"] == 2.0
+    value, meta = persistence.restore("responses", "b")
+    assert value == {"body": 2} and meta["stored_at"] == 1.0
+
+
+def test_carried_entries_still_expire(monkeypatch, tmp_path):
+    path = tmp_path / "snapshot.bin"
+    _boot(monkeypatch, path)
+    persistence.register("responses", lambda: [("a", *persistence.encode_json(1))])
+    assert persistence.save()
+
+    _boot(monkeypatch, path)
+    reader = persistence.get_reader()
+    entries = reader.remaining("responses")
+    assert entries[0][1]["snapshot_saved_at"] == reader.saved_at
+    monkeypatch.setattr(persistence, "SNAPSHOT_MAX_AGE_SECONDS", 0)
+    assert reader.remaining("responses") == []
+    assert persistence.restore("responses", "a") is None
+
+
+def test_snapshot_files_others_could_write_are_refused(monkeypatch, tmp_path):
+    path = tmp_path / "snapshot.bin"
+    _boot(monkeypatch, path)
+    persistence.register("responses", lambda: [("a", *persistence.encode_json(1))])
+    assert persistence.save()
+    assert os.stat(path).st_mode & 0o777 == 0o600
+
+    os.chmod(path, 0o644)
+    _boot(monkeypatch, path)
+    assert persistence.get_reader() is None
+
+    link = tmp_path / "link.bin"
+    os.chmod(path, 0o600)
+    os.symlink(path, link)
+    _boot(monkeypatch, link)
+    assert persistence.get_reader() is None
+
+
+def test_planted_temporary_files_are_not_written_through(monkeypatch, tmp_path):
+    target = tmp_path / "victim"
+    target.write_bytes(b"keep")
+    path = tmp_path / "snapshot.bin"
+    os.symlink(target, f"{path}.{os.getpid()}.tmp")
+
+    _boot(monkeypatch, path)
+    persistence.register("responses", lambda: [("a", *persistence.encode_json(1))])
+    assert persistence.save()
+    assert target.read_bytes() == b"keep"
+    assert persistence.SnapshotReader(str(path)).take("responses", "a")[0] == 1
@@ -0,0 +1,74 @@
+import codecs
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import transport
+
+
+def _stream(body: bytes, key, cuts: list[int]) -> list:
+    # Feeds the body the way stream_json_items does: byte chunks through an
+    # incremental UTF-8 decoder, then a final empty chunk.
+    parser = transport._ArrayItemParser(key)
+    text = codecs.getincrementaldecoder("utf-8")()
+    items = []
+    for start, end in zip([0] + cuts, cuts + [len(body)]):
+        items += parser.feed(text.decode(body[start:end]))
+    items += parser.feed(text.decode(b"", final=True), final=not parser.done)
+    return items
+
+
+def _splits(body: bytes):
+    yield []
+    for offset in range(1, len(body)):
+        yield [offset]
+    # Every byte on its own.
+    yield list(range(1, len(body)))
+
+
+PAYLOADS = [
+    # (body, key)
+    ([{"a": 1, "b": [1, 2, {"c": "]"}]}, 12.5, -3e-7, True, None, "x", [], {}], None),
+    ({"pairs": [{"url": "https://x/y", "price": "1.0"}, 12.5, False, "ü€"], "schemaVersion": "1.0.0"}, "pairs"),
+    # Escaped quotes, brackets and the key itself inside strings.
+    ({"note": "say \"pairs\": [1] \\", "pairs": [{"s": "a\\\"]b"}, "\"[\""]}, "pairs"),
+    # The key as a string value, and nested under another key, before the real one.
+    ({"label": "pairs", "inner": {"pairs": [0]}, "list": ["pairs", [9]], "pairs": [1, 2]}, "pairs"),
+    ({"pairs": None, "schemaVersion": "1.0.0"}, "pairs"),
+    ({"pairs": []}, "pairs"),
+    ([], None),
+    ({"schemaVersion": "1.0.0"}, "pairs"),
+]
+
+
+@pytest.mark.parametrize("payload,key", PAYLOADS)
+def test_streamed_items_match_json_loads_at_every_split(payload, key):
+    body = json.dumps(payload, ensure_ascii=False).encode()
+    data = json.loads(body)
+    expected = (data if key is None else data.get(key)) or []
+    for cuts in _splits(body):
+        assert _stream(body, key, cuts) == expected, cuts
+
+
+@pytest.mark.parametrize("payload,key", PAYLOADS[:2])
+def test_truncated_bodies_never_yield_wrong_items(payload, key):
+    body = json.dumps(payload, ensure_ascii=False).encode()
+    data = json.loads(body)
+    expected = (data if key is None else data.get(key)) or []
+    array_start = body.index(b"[", 0 if key is None else body.index(f'"{key}"'.encode()))
+    array_end = len(body) if key is None else body.index(b', "schemaVersion"')
+    for length in range(len(body)):
+        truncated = body[:length]
+        for cuts in ([], [length // 2] if length > 1 else []):
+            if array_start < length < array_end:
+                # Cut inside the array: streaming fails, at the latest on the last chunk.
+                with pytest.raises(ValueError):
+                    _stream(truncated, key, cuts)
+            else:
+                # Cut before or after it: no items, or all of them (stream_json_items
+                # then rejects the body when it decodes it for the cache).
+                assert _stream(truncated, key, cuts) == (expected if length >= array_end else [])
@@ -0,0 +1,116 @@
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import worker_pool
+from worker_pool import BACKGROUND, INTERACTIVE, LIVE, Overloaded, WorkerPool
+
+
+def test_lower_priorities_are_shed_first():
+    # Not started: everything submitted stays queued.
+    pool = WorkerPool(size=1)
+    for _ in range(worker_pool.SHED_QUEUE_DEPTH[BACKGROUND]):
+        pool.submit(lambda: None, priority=INTERACTIVE)
+
+    with pytest.raises(Overloaded):
+        pool.submit(lambda: None, priority=BACKGROUND)
+    pool.submit(lambda: None, priority=LIVE)
+    pool.submit(lambda: None, priority=INTERACTIVE)
+
+    assert pool.shed[BACKGROUND] == 1 and pool.shed[LIVE] == 0 and pool.shed[INTERACTIVE] == 0
+    assert pool.stats()["queued"] == {"interactive": 5, "live": 1, "background": 0}
+
+
+def test_session_queue_cap_sheds_only_that_session():
+    pool = WorkerPool(size=1)
+    for _ in range(worker_pool.SESSION_MAX_QUEUED):
+        pool.submit(lambda: None, session="a")
+    with pytest.raises(Overloaded):
+        pool.submit(lambda: None, session="a")
+    pool.submit(lambda: None, session="b")
+
+
+def test_session_running_cap_is_enforced_and_released():
+    pool = WorkerPool(size=4)
+    pool.start()
+    release = threading.Event()
+    lock = threading.Lock()
+    running, peak = [0], [0]
+
+    def task():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        release.wait(5)
+        with lock:
+            running[0] -= 1
+
+    futures = [pool.submit(task, session="a") for _ in range(worker_pool.SESSION_MAX_RUNNING + 1)]
+    # Another session still gets a worker while "a" waits for a slot.
+    assert pool.run(lambda: "b ran", session="b") == "b ran"
+    assert not futures[-1].running() and not futures[-1].done()
+
+    release.set()
+    for future in futures:
+        future.result(5)
+    assert peak[0] == worker_pool.SESSION_MAX_RUNNING
+    assert pool.stats()["running"] == 0
+
+
+def test_withdrawn_subtask_runs_exactly_once():
+    pool = WorkerPool(size=1)  # no workers: the subtask stays queued
+    calls = []
+    subtask = pool.spawn(lambda value: calls.append(value) or value * 2, 21)
+    assert pool.stats()["queued"]["interactive"] == 1
+
+    assert subtask.result() == 42
+    assert subtask.result() == 42
+    assert calls == [21]
+    assert pool.stats()["queued"]["interactive"] == 0
+    assert pool.shed[INTERACTIVE] == 0
+
+
+def test_subtasks_run_once_whether_a_worker_or_the_caller_takes_them():
+    pool = WorkerPool(size=2)
+    pool.start()
+    lock = threading.Lock()
+    calls = []
+
+    def call(index):
+        with lock:
+            calls.append(index)
+        return index
+
+    subtasks = [pool.spawn(call, index) for index in range(50)]
+    assert [subtask.result() for subtask in subtasks] == list(range(50))
+    assert sorted(calls) == list(range(50))
+
+
+def test_subtask_exceptions_reach_the_caller():
+    def fail():
+        raise ValueError("boom")
+
+    queued = WorkerPool(size=1).spawn(fail)
+    with pytest.raises(ValueError, match="boom"):
+        queued.result()
+    with pytest.raises(ValueError, match="boom"):
+        queued.result()
+
+    pool = WorkerPool(size=1)
+    pool.start()
+    started, release = threading.Event(), threading.Event()
+
+    def fail_on_worker():
+        started.set()
+        release.wait(5)
+        raise ValueError("boom")
+
+    taken = pool.spawn(fail_on_worker)
+    assert started.wait(5)
+    release.set()
+    with pytest.raises(ValueError, match="boom"):
+        taken.result()
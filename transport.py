@@ -0,0 +1,753 @@
+import codecs
+import json
+import math
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import requests
+
+import metrics
+import persistence
+import profiling
+import shared_cache
+
+# Seconds a cached body is served without contacting upstream. After that the
+# entry is revalidated with a conditional request; a 304 renews it for free.
+DEFAULT_TTL_SECONDS = 60
+RESPONSE_CACHE_MAX_ENTRIES = 1024
+REQUEST_TIMEOUT_SECONDS = 30
+# Under a deadline, a request is not started with less time than this left;
+# the stale cached body (if any) is served instead.
+DEADLINE_MIN_REQUEST_SECONDS = 0.25
+# Bytes read from the socket at a time by `stream_json_items`.
+STREAM_CHUNK_BYTES = 16 * 1024
+# Request budgets per upstream host as (requests per second, burst). Only
+# requests that reach the network spend tokens; cache hits are free.
+RATE_LIMITS = {
+    "api.coingecko.com": (0.5, 10),
+    "api.dexscreener.com": (5.0, 20),
+}
+
+def _accept_encoding() -> str:
+    # urllib3 only decodes brotli when one of these packages is installed, so
+    # advertise "br" only when we can actually read it.
+    encodings = ["gzip", "deflate"]
+    for module in ("brotli", "brotlicffi"):
+        try:
+            __import__(module)
+        except ImportError:
+            continue
+        encodings.append("br")
+        break
+    return ", ".join(encodings)
+
+ACCEPT_ENCODING = _accept_encoding()
+
+class CachedResponse:
+    __slots__ = ("data", "etag", "last_modified", "stored_at")
+
+    def __init__(self, data, etag: str | None, last_modified: str | None, stored_at: float):
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at
+
+class EndpointStats:
+    __slots__ = ("requests", "cache_hits", "shared_hits", "restored", "not_modified", "stale", "wire_bytes", "decoded_bytes")
+
+    def __init__(self):
+        self.requests = 0
+        self.cache_hits = 0
+        self.shared_hits = 0
+        self.restored = 0
+        self.not_modified = 0
+        self.stale = 0
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+class RateLimiter:
+    """
+    Token bucket shared by every thread calling one host.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def available(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+    def acquire(self, max_wait: float = math.inf) -> float | None:
+        """
+        Takes one token, sleeping until one is available.
+
+        Args:
+            max_wait (float): The longest the caller can wait.
+
+        Returns:
+            float | None: The seconds slept, or None (and no token taken) if
+                          the wait would have been longer than `max_wait`.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            wait = (1 - self._tokens) / self.rate if self._tokens < 1 else 0.0
+            if wait > max_wait:
+                return None
+            self._tokens -= 1
+        if wait:
+            time.sleep(wait)
+        return wait
+
+_rate_limiters = {host: RateLimiter(rate, burst) for host, (rate, burst) in RATE_LIMITS.items()}
+
+def get_rate_limiter(url: str) -> RateLimiter | None:
+    """
+    Returns the rate limiter for a URL's host, or None if the host is unlimited.
+    """
+    return _rate_limiters.get(urllib.parse.urlsplit(url).hostname)
+
+def _acquire(url: str, budget: "Deadline | None" = None) -> float:
+    # Waits for the host's rate limiter; returns when the request may be sent.
+    # Under a deadline, raises DeadlineExceeded rather than wait past it.
+    max_wait = math.inf
+    if budget is not None:
+        max_wait = budget.remaining() - DEADLINE_MIN_REQUEST_SECONDS
+        if max_wait < 0:
+            raise DeadlineExceeded("Deadline reached before the request could be sent")
+    limiter = get_rate_limiter(url)
+    if limiter is not None:
+        wait = limiter.acquire(max_wait)
+        if wait is None:
+            raise DeadlineExceeded("Rate limit wait would run past the deadline")
+        if wait:
+            host = urllib.parse.urlsplit(url).hostname
+            metrics.RATE_LIMIT_WAITS.inc(host)
+            metrics.RATE_LIMIT_WAIT_SECONDS.inc(host, amount=wait)
+    return time.perf_counter()
+
+def _observe(endpoint: str, status, sent: float):
+    metrics.UPSTREAM_REQUESTS.inc(endpoint, str(status))
+    metrics.UPSTREAM_LATENCY.observe(time.perf_counter() - sent, endpoint, str(status))
+
+_cache = OrderedDict()
+_stats: dict[str, EndpointStats] = {}
+_lock = threading.Lock()
+_local = threading.local()
+
+def _session() -> requests.Session:
+    # One keep-alive session per thread; requests.Session is not thread-safe.
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        _local.session = session
+    return session
+
+class NotCached(requests.exceptions.RequestException):
+    """
+    Raised in cached-only mode for a URL without a cached body.
+    """
+
+@contextmanager
+def cached_only():
+    """
+    Within the block, this thread is served cached bodies however old they
+    are, and `NotCached` is raised instead of contacting upstream (used to
+    answer from cache when upstream work is shed).
+    """
+    previous = getattr(_local, "cached_only", False)
+    _local.cached_only = True
+    try:
+        yield
+    finally:
+        _local.cached_only = previous
+
+# --- Deadlines ---
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """
+    Raised under a deadline when a request cannot finish in the time left and
+    there is no cached body to fall back on.
+    """
+
+class Deadline:
+    """
+    An end-to-end time budget for one command, shared by every upstream call
+    made under it (see `deadline`).
+
+    Attributes:
+        stale (set): Endpoints (or cached series) answered with expired data
+                     because the deadline was near.
+        partial (bool): Set by fetches that returned without one of their steps.
+        steps (list): (step, seconds) for each `step` run under the deadline.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+        self.stale = set()
+        self.partial = False
+        self.steps = []
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def degraded(self) -> bool:
+        return bool(self.stale) or self.partial
+
+@contextmanager
+def deadline(seconds: float):
+    """
+    Within the block, this thread's upstream calls share a budget of
+    `seconds`: request timeouts and rate limiter waits are capped by the time
+    left, and once too little is left an expired cached body is served (and
+    noted in `Deadline.stale`) or `DeadlineExceeded` raised. An enclosing
+    deadline that expires sooner stays in force.
+
+    Yields:
+        Deadline: The deadline in force.
+    """
+    previous = getattr(_local, "deadline", None)
+    if previous is not None and previous.remaining() <= seconds:
+        yield previous
+        return
+    budget = Deadline(seconds)
+    _local.deadline = budget
+    try:
+        yield budget
+    finally:
+        _local.deadline = previous
+        if budget.stale:
+            outcome = "stale"
+        elif budget.partial:
+            outcome = "partial"
+        elif not budget.remaining():
+            outcome = "expired"
+        else:
+            outcome = "met"
+        metrics.DEADLINE_OUTCOMES.inc(outcome)
+
+def current_deadline() -> Deadline | None:
+    """
+    Returns the deadline in force on this thread, or None.
+    """
+    return getattr(_local, "deadline", None)
+
+@contextmanager
+def step(name: str):
+    """
+    Times one step of a multi-step fetch (e.g. "resolve", then "price"), for
+    the step latency histogram and the deadline in force.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        metrics.FETCH_STEP_LATENCY.observe(elapsed, name)
+        budget = getattr(_local, "deadline", None)
+        if budget is not None:
+            budget.steps.append((name, elapsed))
+
+def _timeout(budget: Deadline | None) -> float:
+    if budget is None:
+        return REQUEST_TIMEOUT_SECONDS
+    return min(REQUEST_TIMEOUT_SECONDS, max(budget.remaining(), DEADLINE_MIN_REQUEST_SECONDS))
+
+def _serve_stale(entry: CachedResponse | None, budget: Deadline, endpoint: str, stats: EndpointStats, error: Exception):
+    # Out of time: the last known body, however old, beats nothing.
+    if entry is None:
+        raise error
+    budget.stale.add(endpoint)
+    with _lock:
+        stats.stale += 1
+    return entry.data
+
+def propagate(fn):
+    """
+    Wraps a callable submitted to a thread pool so it inherits this thread's
+    cached-only mode and deadline.
+    """
+    offline = getattr(_local, "cached_only", False)
+    budget = getattr(_local, "deadline", None)
+    if not offline and budget is None:
+        return fn
+
+    def wrapper(*args, **kwargs):
+        previous = getattr(_local, "cached_only", False), getattr(_local, "deadline", None)
+        _local.cached_only, _local.deadline = offline or previous[0], budget
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _local.cached_only, _local.deadline = previous
+
+    return wrapper
+
+def _endpoint_stats(endpoint: str) -> EndpointStats:
+    stats = _stats.get(endpoint)
+    if stats is None:
+        stats = _stats.setdefault(endpoint, EndpointStats())
+    return stats
+
+def get_json(url: str, headers: dict | None = None, ttl: float = DEFAULT_TTL_SECONDS, endpoint: str = "other"):
+    """
+    Fetches and decodes a JSON body through the shared response cache.
+
+    Fresh entries are returned without a request. Stale entries are
+    revalidated with If-None-Match / If-Modified-Since, and a 304 counts as a
+    cache hit. Raises `requests` exceptions on network and HTTP errors, like
+    `requests.get(...).raise_for_status()` would. Under `cached_only`, any
+    cached body is returned and `NotCached` raised otherwise. Under a
+    `deadline`, an expired body is returned once the request cannot finish in
+    time, and `DeadlineExceeded` raised if there is none.
+
+    Args:
+        url (str): The full request URL (also the cache key).
+        headers (dict | None): Extra request headers.
+        ttl (float): Seconds a stored body is served without revalidation;
+                     0 always revalidates.
+        endpoint (str): A low-cardinality endpoint label for the byte and
+                        request accounting (e.g. "/coins/{id}").
+
+    Returns:
+        The decoded JSON body. It is shared with the cache, so treat it as read-only.
+    """
+    now = time.time()
+    run = profiling.active()
+    offline = getattr(_local, "cached_only", False)
+    if offline:
+        ttl = math.inf
+    with _lock:
+        stats = _endpoint_stats(endpoint)
+        entry = _cache.get(url)
+        if entry is not None:
+            _cache.move_to_end(url)
+            if now - entry.stored_at < ttl:
+                stats.cache_hits += 1
+                if run is not None:
+                    run.record_call(endpoint, "hit", 0.0, 0)
+                return entry.data
+    if entry is None:
+        entry = _from_snapshot(url, stats)
+        if entry is not None and now - entry.stored_at < ttl:
+            with _lock:
+                stats.cache_hits += 1
+            if run is not None:
+                run.record_call(endpoint, "hit", 0.0, 0)
+            return entry.data
+
+    shared = shared_cache.get_cache()
+    shared_entry = _from_shared(shared, url, ttl, stats, run, endpoint)
+    if shared_entry is not None:
+        return shared_entry.data
+    if offline:
+        raise NotCached(f"No cached copy of {endpoint}")
+
+    request_headers = dict(headers or {})
+    if entry is not None:
+        if entry.etag:
+            request_headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            request_headers["If-Modified-Since"] = entry.last_modified
+
+    budget = getattr(_local, "deadline", None)
+    started = time.perf_counter()
+    with profiling.phase("fetch"):
+        try:
+            sent = _acquire(url, budget)
+        except DeadlineExceeded as e:
+            return _serve_stale(entry, budget, endpoint, stats, e)
+        try:
+            response = _session().get(url, headers=request_headers, timeout=_timeout(budget))
+            body = response.content
+        except requests.exceptions.RequestException as e:
+            _observe(endpoint, "error", sent)
+            if budget is not None and isinstance(e, requests.exceptions.Timeout):
+                return _serve_stale(entry, budget, endpoint, stats, e)
+            raise
+    _observe(endpoint, response.status_code, sent)
+    wire_bytes = response.raw.tell() if response.raw is not None else len(body)
+    if run is not None:
+        outcome = "304" if response.status_code == 304 and entry is not None else "miss"
+        run.record_call(endpoint, outcome, time.perf_counter() - started, wire_bytes)
+
+    with _lock:
+        stats.requests += 1
+        stats.wire_bytes += wire_bytes
+        if response.status_code == 304 and entry is not None:
+            stats.not_modified += 1
+            stats.cache_hits += 1
+            entry.stored_at = now
+            return entry.data
+
+    response.raise_for_status()
+    with profiling.phase("decode"):
+        data = response.json()
+
+    etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+    with _lock:
+        stats.decoded_bytes += len(body)
+        _store(url, CachedResponse(data, etag, last_modified, now))
+    if shared is not None:
+        shared.put(url, body, {"etag": etag, "last_modified": last_modified}, now)
+    return data
+
+# --- Streaming ---
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+
+class _ArrayItemParser:
+    """
+    Incremental parser yielding the items of one JSON array as text arrives:
+    the top-level array, or the array under `key` in the top-level object.
+    """
+
+    def __init__(self, key: str | None):
+        self.key = key
+        self.done = False
+        self._text = ""
+        self._pos = 0
+        self._in_array = False
+        # Scanner state while looking for the array.
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._last_string = None
+
+    def feed(self, text: str, final: bool = False) -> list:
+        self._text += text
+        items = [] if self._in_array or self._find_array() else None
+        while items is not None and not self.done:
+            while self._pos < len(self._text) and self._text[self._pos] in _WHITESPACE + ",":
+                self._pos += 1
+            if self._pos == len(self._text):
+                if final:
+                    raise json.JSONDecodeError("Unterminated array", self._text, self._pos)
+                break
+            if self._text[self._pos] == "]":
+                self.done = True
+                break
+            try:
+                item, end = _decoder.raw_decode(self._text, self._pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                break
+            # A number or literal cut at the chunk boundary ("12" of "12.5")
+            # decodes too early; wait until a delimiter follows it. At the end
+            # of the body it was cut off, not complete.
+            if not isinstance(item, (dict, list, str)) and (
+                end == len(self._text) or self._text[end] not in _WHITESPACE + ",]"
+            ):
+                if final:
+                    raise json.JSONDecodeError("Unterminated array", self._text, end)
+                break
+            items.append(item)
+            self._pos = end
+        if items is None:
+            return []
+        # Drop consumed text so the buffer stays about one item long.
+        self._text = self._text[self._pos:]
+        self._pos = 0
+        return items
+
+    def _find_array(self) -> bool:
+        # Scans to the opening bracket of the wanted array, tracking strings and nesting.
+        text = self._text
+        while self._pos < len(text):
+            char = text[self._pos]
+            self._pos += 1
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    self._last_string = text[self._string_start:self._pos - 1]
+                continue
+            if char == '"':
+                self._in_string = True
+                self._string_start = self._pos
+            elif char in "[{":
+                wanted = self._depth == 0 if self.key is None else self._depth == 1 and self._last_string == self.key
+                self._depth += 1
+                if char == "[" and wanted:
+                    self._in_array = True
+                    return True
+            elif char in "]}":
+                self._depth -= 1
+            elif char == ",":
+                self._last_string = None
+        return False
+
+def stream_json_items(
+    url: str,
+    headers: dict | None = None,
+    ttl: float = DEFAULT_TTL_SECONDS,
+    endpoint: str = "other",
+    key: str | None = None,
+):
+    """
+    Yields the items of a JSON array as they are decoded, so callers can show
+    the first items before the whole body has arrived.
+
+    Cached bodies are served like `get_json` serves them. Otherwise the body
+    is read in chunks and each complete array item is yielded as soon as its
+    closing bracket arrives; once the body is complete it is cached like a
+    `get_json` response. Raises `requests` exceptions on network and HTTP
+    errors. A consumer that stops early leaves the body uncached. Honors
+    `cached_only` and `deadline` like `get_json` (up to the first byte).
+
+    Args:
+        url (str): The full request URL (also the cache key).
+        headers (dict | None): Extra request headers.
+        ttl (float): Seconds a stored body is served without revalidation.
+        endpoint (str): The endpoint label for the request accounting.
+        key (str | None): Stream the array under this top-level key instead
+                          of a top-level array.
+
+    Yields:
+        The decoded array items (shared with the cache; treat as read-only).
+    """
+    now = time.time()
+    run = profiling.active()
+    offline = getattr(_local, "cached_only", False)
+    if offline:
+        ttl = math.inf
+    with _lock:
+        stats = _endpoint_stats(endpoint)
+        entry = _cache.get(url)
+        fresh = entry is not None and now - entry.stored_at < ttl
+        if fresh:
+            _cache.move_to_end(url)
+            stats.cache_hits += 1
+    if entry is None:
+        entry = _from_snapshot(url, stats)
+        fresh = entry is not None and now - entry.stored_at < ttl
+        if fresh:
+            with _lock:
+                stats.cache_hits += 1
+    if fresh:
+        if run is not None:
+            run.record_call(endpoint, "hit", 0.0, 0)
+        yield from _select(entry.data, key)
+        return
+    shared = shared_cache.get_cache()
+    shared_entry = _from_shared(shared, url, ttl, stats, run, endpoint)
+    if shared_entry is not None:
+        yield from _select(shared_entry.data, key)
+        return
+    if offline:
+        raise NotCached(f"No cached copy of {endpoint}")
+
+    request_headers = dict(headers or {})
+    if entry is not None:
+        if entry.etag:
+            request_headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            request_headers["If-Modified-Since"] = entry.last_modified
+
+    budget = getattr(_local, "deadline", None)
+    started = time.perf_counter()
+    with profiling.phase("fetch"):
+        try:
+            sent = _acquire(url, budget)
+            try:
+                response = _session().get(url, headers=request_headers, timeout=_timeout(budget), stream=True)
+            except requests.exceptions.RequestException as e:
+                _observe(endpoint, "error", sent)
+                if budget is None or not isinstance(e, requests.exceptions.Timeout):
+                    raise
+                raise DeadlineExceeded(str(e)) from e
+        except DeadlineExceeded as e:
+            stale = _serve_stale(entry, budget, endpoint, stats, e)
+        else:
+            stale = None
+    if stale is not None:
+        yield from _select(stale, key)
+        return
+    with response:
+        if response.status_code == 304 and entry is not None:
+            _observe(endpoint, response.status_code, sent)
+            with _lock:
+                stats.requests += 1
+                stats.not_modified += 1
+                stats.cache_hits += 1
+                entry.stored_at = now
+            if run is not None:
+                run.record_call(endpoint, "304", time.perf_counter() - started, 0)
+            yield from _select(entry.data, key)
+            return
+        if not response.ok:
+            _observe(endpoint, response.status_code, sent)
+        response.raise_for_status()
+
+        parser = _ArrayItemParser(key)
+        text = codecs.getincrementaldecoder(response.encoding or "utf-8")()
+        body = bytearray()
+        streamed = []
+        chunks = response.iter_content(STREAM_CHUNK_BYTES)
+        try:
+            while True:
+                with profiling.phase("fetch"):
+                    chunk = next(chunks, None)
+                final = chunk is None
+                body += chunk or b""
+                with profiling.phase("decode"):
+                    items = parser.feed(text.decode(chunk or b"", final=final), final=final and not parser.done)
+                streamed += items
+                yield from items
+                if final:
+                    break
+            # A complete top-level array is exactly the streamed items;
+            # otherwise the cache needs the whole body decoded.
+            with profiling.phase("decode"):
+                data = streamed if key is None and parser.done else json.loads(bytes(body))
+        except requests.exceptions.RequestException:
+            _observe(endpoint, "error", sent)
+            raise
+        except ValueError as e:
+            _observe(endpoint, "error", sent)
+            raise requests.exceptions.InvalidJSONError(f"Invalid JSON body: {e}", response=response) from e
+        # Streamed bodies are timed until their last byte, like get_json's.
+        _observe(endpoint, response.status_code, sent)
+
+    wire_bytes = response.raw.tell() if response.raw is not None else len(body)
+    if run is not None:
+        run.record_call(endpoint, "miss", time.perf_counter() - started, wire_bytes)
+    etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+    with _lock:
+        stats.requests += 1
+        stats.wire_bytes += wire_bytes
+        stats.decoded_bytes += len(body)
+        _store(url, CachedResponse(data, etag, last_modified, now))
+    if shared is not None:
+        shared.put(url, body, {"etag": etag, "last_modified": last_modified}, now)
+
+def _select(data, key: str | None) -> list:
+    if key is None:
+        return data or []
+    return (data or {}).get(key) or []
+
+def _from_shared(shared, url: str, ttl: float, stats: EndpointStats, run, endpoint: str) -> CachedResponse | None:
+    # Another process on this host may have fetched the body already.
+    if shared is None:
+        return None
+    hit = shared.get(url, ttl, _decode_shared)
+    if hit is None:
+        return None
+    data, meta, stored_at = hit
+    entry = CachedResponse(data, meta.get("etag"), meta.get("last_modified"), stored_at)
+    with _lock:
+        stats.cache_hits += 1
+        stats.shared_hits += 1
+        _store(url, entry)
+    if run is not None:
+        run.record_call(endpoint, "hit", 0.0, 0)
+    return entry
+
+def _from_snapshot(url: str, stats: EndpointStats) -> CachedResponse | None:
+    # The snapshot this process booted with may hold the body from before the
+    # restart; it comes back with its original age (and validators, so even a
+    # stale one can be renewed by a 304).
+    restored = persistence.restore("responses", url)
+    if restored is None:
+        return None
+    data, meta = restored
+    entry = CachedResponse(data, meta.get("etag"), meta.get("last_modified"), meta["stored_at"])
+    with _lock:
+        stats.restored += 1
+        # A concurrent request may have stored a newer body meanwhile.
+        current = _cache.get(url)
+        if current is not None:
+            return current
+        _store(url, entry)
+    return entry
+
+def _dump_responses():
+    # Snapshot entries for the response cache, oldest first.
+    with _lock:
+        entries = list(_cache.items())
+    for url, entry in entries:
+        meta, payload = persistence.encode_json(
+            entry.data, {"etag": entry.etag, "last_modified": entry.last_modified, "stored_at": entry.stored_at}
+        )
+        yield url, meta, payload
+
+persistence.register("responses", _dump_responses)
+
+def _decode_shared(buffer: memoryview, meta: dict):
+    return json.loads(bytes(buffer))
+
+def _store(url: str, entry: CachedResponse):
+    # Callers hold _lock.
+    _cache[url] = entry
+    _cache.move_to_end(url)
+    while len(_cache) > RESPONSE_CACHE_MAX_ENTRIES:
+        _cache.popitem(last=False)
+
+def get_stats() -> dict[str, dict]:
+    """
+    Returns request, cache and byte counters per endpoint label.
+
+    Returns:
+        dict[str, dict]: Counters keyed by endpoint: "requests", "cache_hits"
+                         (of which "shared_hits" came from another process
+                         via the shared cache), "restored" (bodies taken from
+                         the boot snapshot), "not_modified", "stale" (expired
+                         bodies served under a deadline), "wire_bytes"
+                         (as transferred, i.e. compressed) and "decoded_bytes".
+    """
+    with _lock:
+        return {endpoint: stats.as_dict() for endpoint, stats in _stats.items()}
+
+def _stat_values(field: str) -> dict[tuple, float]:
+    return {(endpoint,): values[field] for endpoint, values in get_stats().items()}
+
+def _cache_hit_ratios() -> dict[tuple, float]:
+    ratios = {}
+    for endpoint, values in get_stats().items():
+        # 304s are counted both as requests and as cache hits.
+        lookups = values["cache_hits"] + values["requests"] - values["not_modified"]
+        if lookups:
+            ratios[(endpoint,)] = values["cache_hits"] / lookups
+    return ratios
+
+# Cache counters are read from the existing per-endpoint stats at scrape time.
+metrics.callback("cache_hits_total", "Response cache hits (fresh entries and 304s), by endpoint.", "counter",
+                 ("endpoint",), lambda: _stat_values("cache_hits"))
+metrics.callback("shared_cache_hits_total", "Response cache hits served from the host-wide shared cache, by endpoint.",
+                 "counter", ("endpoint",), lambda: _stat_values("shared_hits"))
+metrics.callback("snapshot_restored_total", "Response bodies restored from the boot snapshot, by endpoint.", "counter",
+                 ("endpoint",), lambda: _stat_values("restored"))
+metrics.callback("not_modified_total", "Revalidations answered with 304 Not Modified, by endpoint.", "counter",
+                 ("endpoint",), lambda: _stat_values("not_modified"))
+metrics.callback("stale_served_total", "Expired cached bodies served because a deadline was near, by endpoint.",
+                 "counter", ("endpoint",), lambda: _stat_values("stale"))
+metrics.callback("upstream_wire_bytes_total", "Response bytes as transferred (compressed), by endpoint.", "counter",
+                 ("endpoint",), lambda: _stat_values("wire_bytes"))
+metrics.callback("cache_hit_ratio", "Share of lookups answered without a full upstream response, by endpoint.",
+                 "gauge", ("endpoint",), _cache_hit_ratios)
+
+def clear_cache():
+    with _lock:
+        _cache.clear()
@@ -11,14 +11,27 @@ def get_session_id():
         st.session_state.session_id = str(uuid.uuid4())
     return st.session_state.session_id
 
+# Callables notified with (command, query) for every logged command, e.g. the
+# cache warmer's popularity table.
+_usage_listeners = []
+
+def add_usage_listener(listener):
+    """
+    Registers a callable to be called with (command, query) on every logged command.
+    """
+    _usage_listeners.append(listener)
+
 def log_command_usage(command: str, query: str):
     """
-    Logs the usage of a command to the Streamlit console/logs.
+    Logs the usage of a command to the Streamlit console/logs and notifies
+    the usage listeners.
     """
     session_id = get_session_id()
     timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     log_entry = f"Session ID: {session_id}, Command: {command}, Query: {query}, Timestamp: {timestamp}"
     print(log_entry)
+    for listener in _usage_listeners:
+        listener(command, query)
 
 def calculate_rsi(prices: list[float], period: int = 14) -> float:
     """
@@ -0,0 +1,329 @@
+import functools
+import heapq
+import itertools
+import os
+import queue
+import threading
+from collections import Counter
+from collections.abc import Iterator
+from concurrent.futures import Future, TimeoutError
+
+import metrics
+import profiling
+import transport
+
+# Threads running upstream-bound work for every session in this process.
+WORKER_POOL_SIZE = int(os.getenv("WORKER_POOL_SIZE", "8"))
+
+# Task priorities, most urgent first: commands a user just asked for, live
+# views refreshing on a timer, and background warming.
+INTERACTIVE, LIVE, BACKGROUND = 0, 1, 2
+PRIORITY_NAMES = {INTERACTIVE: "interactive", LIVE: "live", BACKGROUND: "background"}
+
+# A task is shed when this many tasks of its priority or a more urgent one are
+# already queued, so lower priorities are shed first as the queue grows.
+SHED_QUEUE_DEPTH = {INTERACTIVE: 48, LIVE: 16, BACKGROUND: 4}
+# Tasks one session may have running at once (the rest wait their turn in the
+# queue) and queued at once (the rest are shed).
+SESSION_MAX_RUNNING = 2
+SESSION_MAX_QUEUED = 4
+# How long a caller waits for its task to start before giving up on it.
+QUEUE_WAIT_SECONDS = {INTERACTIVE: 3.0, LIVE: 1.0, BACKGROUND: 30.0}
+
+class Overloaded(Exception):
+    """
+    Raised when the pool sheds a task instead of queueing or running it.
+    """
+
+class _Task:
+    __slots__ = ("fn", "session", "priority", "future")
+
+    def __init__(self, fn, session, priority: int):
+        self.fn = fn
+        self.session = session
+        self.priority = priority
+        self.future = Future()
+
+_DONE = object()
+_local = threading.local()  # .task: the task running on this worker thread
+
+class Subtask:
+    """
+    A call queued by `WorkerPool.spawn`. `result` runs it on the calling
+    thread if no worker has started it yet, so a task waiting on its own
+    subtasks never waits for a free worker.
+    """
+
+    def __init__(self, pool: "WorkerPool", task: "_Task | None", call):
+        self._pool = pool
+        self._task = task
+        self._call = call
+        self._outcome = None  # (result, exception) once run inline
+
+    def result(self):
+        if self._outcome is None and (self._task is None or self._pool._withdraw(self._task, shed=False)):
+            try:
+                self._outcome = (self._call(), None)
+            except Exception as e:
+                self._outcome = (None, e)
+        if self._outcome is None:
+            return self._task.future.result()
+        result, error = self._outcome
+        if error is not None:
+            raise error
+        return result
+
+def _handed_off(first: tuple, handoff: queue.Queue) -> Iterator:
+    item, error = first
+    while item is not _DONE:
+        yield item
+        item, error = handoff.get()
+    if error is not None:
+        raise error
+
+class WorkerPool:
+    """
+    A fixed set of worker threads fed from one priority queue.
+
+    Tasks from the same session run at most `SESSION_MAX_RUNNING` at a time,
+    so one session cannot take every worker, and tasks are shed (`Overloaded`)
+    rather than queued once the queue ahead of them is too deep.
+    """
+
+    def __init__(self, size: int = WORKER_POOL_SIZE):
+        self.size = size
+        self.shed = Counter()  # priority -> tasks shed
+        self._heap = []  # (priority, sequence, task)
+        self._sequence = itertools.count()
+        self._queued = Counter()  # priority -> queued tasks
+        self._session_queued = Counter()
+        self._session_running = Counter()
+        self._running = 0
+        self._condition = threading.Condition()
+        self._threads = []
+
+    def start(self):
+        """
+        Starts the worker threads (idempotent).
+        """
+        with self._condition:
+            if self._threads:
+                return
+            for index in range(self.size):
+                thread = threading.Thread(target=self._run, name=f"upstream-worker-{index}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+
+    # --- Submitting ---
+
+    def submit(self, fn, session=None, priority: int = INTERACTIVE) -> Future:
+        """
+        Queues a callable.
+
+        Args:
+            fn: The callable, run without arguments on a worker thread.
+            session: A hashable id of the session it runs for, or None.
+            priority (int): INTERACTIVE, LIVE or BACKGROUND.
+
+        Returns:
+            Future: Resolves to the callable's result. Raises `Overloaded` if
+                    the task is shed.
+        """
+        return self._enqueue(fn, session, priority).future
+
+    def spawn(self, fn, *args) -> Subtask:
+        """
+        Queues `fn(*args)` as a subtask of the task running on this thread:
+        at its priority and under its cached-only mode and deadline. Outside
+        the pool, subtasks are queued at INTERACTIVE priority.
+
+        Subtasks do not count against the session's caps: they only run while
+        their parent holds one of the session's slots, so a fan-out (a few
+        range chunks or DexScreener batches) is bounded by its parent and runs
+        in parallel instead of queueing behind it.
+
+        A subtask the pool would shed is not refused; it runs on the calling
+        thread when its result is asked for, so under load a fan-out degrades
+        to running serially in the parent's own slot.
+
+        Returns:
+            Subtask: Call `result()` for the value (or the exception raised).
+        """
+        parent = getattr(_local, "task", None)
+        priority = parent.priority if parent is not None else INTERACTIVE
+        call = functools.partial(fn, *args)
+        task = self._enqueue(transport.propagate(call), None, priority, phases=False, subtask=True)
+        return Subtask(self, task, call)
+
+    def _enqueue(self, fn, session, priority: int, phases: bool = True, subtask: bool = False) -> _Task | None:
+        # Subtasks that would be shed return None instead (see `spawn`).
+        task = _Task(profiling.propagate(fn, phases=phases), session, priority)
+        with self._condition:
+            ahead = sum(count for level, count in self._queued.items() if level <= priority)
+            if ahead >= SHED_QUEUE_DEPTH[priority]:
+                reason = f"{PRIORITY_NAMES[priority]} queue is full"
+            elif session is not None and self._session_queued[session] >= SESSION_MAX_QUEUED:
+                reason = "too many queued tasks for this session"
+            else:
+                reason = None
+            if reason and subtask:
+                return None
+            if reason:
+                self.shed[priority] += 1
+                metrics.WORKER_POOL_SHED.inc(PRIORITY_NAMES[priority])
+                raise Overloaded(reason)
+            heapq.heappush(self._heap, (priority, next(self._sequence), task))
+            self._queued[priority] += 1
+            if session is not None:
+                self._session_queued[session] += 1
+            self._condition.notify()
+        return task
+
+    def _withdraw(self, task: _Task, shed: bool = True) -> bool:
+        # Takes back a task that has not started yet (counted as shed unless
+        # `shed` is False); False once a worker took it.
+        with self._condition:
+            for index, entry in enumerate(self._heap):
+                if entry[2] is task:
+                    self._heap[index] = self._heap[-1]
+                    self._heap.pop()
+                    heapq.heapify(self._heap)
+                    self._dequeue(task)
+                    task.future.cancel()
+                    if shed:
+                        self.shed[task.priority] += 1
+                    break
+            else:
+                return False
+        if shed:
+            metrics.WORKER_POOL_SHED.inc(PRIORITY_NAMES[task.priority])
+        return True
+
+    def run(self, fn, session=None, priority: int = INTERACTIVE, wait: float | None = None):
+        """
+        Runs a callable on the pool and returns its result, blocking the caller.
+
+        Args:
+            fn: The callable, run without arguments on a worker thread.
+            session: A hashable id of the session it runs for, or None.
+            priority (int): INTERACTIVE, LIVE or BACKGROUND.
+            wait (float | None): Seconds to wait for the task to start;
+                                 defaults to the priority's `QUEUE_WAIT_SECONDS`.
+
+        Returns:
+            The callable's result. Raises `Overloaded` if the task is shed or
+            does not start in time, and whatever the callable raises.
+        """
+        task = self._enqueue(fn, session, priority)
+        try:
+            return task.future.result(QUEUE_WAIT_SECONDS[priority] if wait is None else wait)
+        except TimeoutError:
+            if self._withdraw(task):
+                raise Overloaded(f"{PRIORITY_NAMES[priority]} task did not start in time") from None
+        # Already running: wait for it however long it takes.
+        return task.future.result()
+
+    def iterate(self, items, session=None, priority: int = INTERACTIVE, wait: float | None = None) -> Iterator:
+        """
+        Drains an iterable on the pool, so streamed responses are read by a
+        worker too, and returns an iterator over its items as they arrive.
+
+        Raises `Overloaded` like `run` before returning; the iterator re-raises
+        whatever the iterable raised, at the point it raised.
+        """
+        handoff = queue.Queue()
+
+        def drain():
+            try:
+                for item in items:
+                    handoff.put((item, None))
+            except Exception as e:
+                handoff.put((_DONE, e))
+            else:
+                handoff.put((_DONE, None))
+
+        task = self._enqueue(drain, session, priority)
+        try:
+            first = handoff.get(timeout=QUEUE_WAIT_SECONDS[priority] if wait is None else wait)
+        except queue.Empty:
+            if self._withdraw(task):
+                raise Overloaded(f"{PRIORITY_NAMES[priority]} task did not start in time") from None
+            # Already running: wait for its first item however long it takes.
+            first = handoff.get()
+        return _handed_off(first, handoff)
+
+    # --- Workers ---
+
+    def _next(self) -> _Task | None:
+        # The most urgent queued task whose session has a free slot; callers
+        # hold the condition.
+        skipped, found = [], None
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            task = entry[2]
+            if task.session is not None and self._session_running[task.session] >= SESSION_MAX_RUNNING:
+                skipped.append(entry)
+                continue
+            self._dequeue(task)
+            if task.future.set_running_or_notify_cancel():
+                found = task
+                break
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
+        return found
+
+    def _dequeue(self, task: _Task):
+        self._queued[task.priority] -= 1
+        if task.session is not None:
+            self._session_queued[task.session] -= 1
+            if not self._session_queued[task.session]:
+                del self._session_queued[task.session]
+
+    def _run(self):
+        while True:
+            with self._condition:
+                task = self._next()
+                while task is None:
+                    self._condition.wait()
+                    task = self._next()
+                self._running += 1
+                if task.session is not None:
+                    self._session_running[task.session] += 1
+            _local.task = task
+            try:
+                task.future.set_result(task.fn())
+            except BaseException as e:
+                task.future.set_exception(e)
+            finally:
+                _local.task = None
+                with self._condition:
+                    self._running -= 1
+                    if task.session is not None:
+                        self._session_running[task.session] -= 1
+                        if not self._session_running[task.session]:
+                            del self._session_running[task.session]
+                    # A finished task may unblock one skipped for its session.
+                    self._condition.notify_all()
+
+    def stats(self) -> dict:
+        with self._condition:
+            return {
+                "workers": self.size,
+                "running": self._running,
+                "queued": {PRIORITY_NAMES[level]: self._queued[level] for level in PRIORITY_NAMES},
+                "shed": {PRIORITY_NAMES[level]: self.shed[level] for level in PRIORITY_NAMES},
+            }
+
+_pool = WorkerPool()
+
+def get_pool() -> WorkerPool:
+    """
+    Returns the process-wide pool, starting its workers on first use.
+    """
+    _pool.start()
+    return _pool
+
+metrics.callback("worker_pool_queued", "Tasks waiting in the upstream worker pool, by priority.", "gauge",
+                 ("priority",), lambda: {(name,): count for name, count in _pool.stats()["queued"].items()})
+metrics.callback("worker_pool_running", "Tasks running on the upstream worker pool.", "gauge", (),
+                 lambda: {(): _pool.stats()["running"]})